@@ -0,0 +1,4 @@
+# __main__.py - Allows 'python -m scrubpy'
+from scrubpy.cli import main
+
+main()
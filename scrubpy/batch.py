@@ -0,0 +1,181 @@
+# batch.py - Headless batch cleaning driven by a JSON/YAML recipe
+import os
+import glob
+import json
+import time
+import collections
+from concurrent.futures import ProcessPoolExecutor
+from scrubpy.core import load_dataset
+from scrubpy.dtypes import optimize_dtypes
+from scrubpy.formats import write_frame, EXTENSIONS
+from scrubpy.pipeline import CleaningPipeline
+from scrubpy.streaming import stream_clean
+from scrubpy.instrument import profile_session
+from scrubpy import parallel
+
+# Recipe operation -> name of the same operation in scrubpy.streaming
+STREAMING_NAMES = {
+    "drop_missing": "drop_missing_values",
+    "fill_missing": "fill_missing_values",
+    "remove_duplicates": "remove_duplicates",
+    "standardize_text": "standardize_text",
+    "convert_column_types": "convert_column_types",
+    "remove_outliers": "remove_outliers",
+    "fix_column_names": "fix_column_names",
+    "drop_columns": "drop_columns",
+}
+
+
+def load_recipe(path):
+    """Read a recipe file.
+
+    A recipe is either a list of steps or a mapping with ``steps`` and optional
+    ``output_format``, ``optimize_dtypes`` and ``parse_dates`` keys. Each step
+    is a mapping with an ``op`` (a CleaningPipeline method name) and that
+    method's parameters::
+
+        steps:
+          - op: fix_column_names
+          - op: fill_missing
+            value: 0
+          - op: standardize_text
+            column: city
+    """
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML recipes need PyYAML (pip install pyyaml)")
+            try:
+                recipe = yaml.safe_load(handle)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML recipe: {e}")
+        else:
+            recipe = json.load(handle)
+    if isinstance(recipe, list):
+        recipe = {"steps": recipe}
+    if not isinstance(recipe, dict) or not isinstance(recipe.get("steps", []), list):
+        raise ValueError("A recipe must be a list of steps or a mapping with a 'steps' list")
+    for step in recipe.get("steps", []):
+        op = step.get("op") if isinstance(step, dict) else step
+        if not isinstance(step, dict) or op not in STREAMING_NAMES:
+            raise ValueError(f"Unknown recipe operation: {op!r}")
+    return recipe
+
+
+def expand_inputs(patterns):
+    """Expand glob patterns (and directories) into a sorted list of data files."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        files.extend(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(dict.fromkeys(files))
+
+
+def build_pipeline(df, steps):
+    pipeline = CleaningPipeline(df)
+    for step in steps:
+        params = {key: value for key, value in step.items() if key != "op"}
+        getattr(pipeline, step["op"])(**params)
+    return pipeline
+
+
+def output_path(filepath, output_dir, output_format):
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(output_dir, f"cleaned_{stem}{EXTENSIONS[output_format]}")
+
+
+def output_paths(files, output_dir, output_format):
+    """Destination of every input file, with no two inputs written to the same place.
+
+    Inputs are written as ``cleaned_<name>`` directly in ``output_dir``. Inputs
+    that share a name keep their directories (relative to the inputs' common
+    parent) under ``output_dir``, and ones that differ only by extension keep it
+    in the name, e.g. ``cleaned_sales_parquet.csv``.
+    """
+    stems = collections.Counter(os.path.splitext(os.path.basename(path))[0] for path in files)
+    parents = [os.path.dirname(os.path.abspath(path)) for path in files]
+    root = os.path.commonpath(parents) if parents else ""
+    destinations = {path: output_path(path, output_dir, output_format) for path in files}
+    for path, parent in zip(files, parents):
+        if stems[os.path.splitext(os.path.basename(path))[0]] > 1:
+            directory = os.path.normpath(os.path.join(output_dir, os.path.relpath(parent, root)))
+            destinations[path] = output_path(path, directory, output_format)
+    taken = collections.Counter(destinations.values())
+    for path in files:
+        source_extension = os.path.splitext(path)[1].lstrip(".")
+        if taken[destinations[path]] > 1 and source_extension:
+            stem, extension = os.path.splitext(destinations[path])
+            destinations[path] = f"{stem}_{source_extension}{extension}"
+    seen = {}
+    for path, destination in destinations.items():
+        if destination in seen:
+            raise ValueError(f"{seen[destination]} and {path} would both be written to {destination}")
+        seen[destination] = path
+    return destinations
+
+
+# 🧽 Clean One File
+def clean_file(filepath, recipe, output_dir, output_format="csv", chunksize=None, profile=False, destination=None):
+    """Apply ``recipe`` to one file and return its metrics (never raises).
+
+    The result goes to ``destination``, by default ``cleaned_<name>`` in ``output_dir``.
+    With ``profile`` the metrics also hold the per-operation events under "profile".
+    """
+    if profile:
+        with profile_session() as recorder:
+            metrics = clean_file(filepath, recipe, output_dir, output_format, chunksize, destination=destination)
+        metrics["profile"] = recorder.events
+        return metrics
+    started = time.perf_counter()
+    metrics = {"file": filepath, "output": None, "rows_in": None, "rows_out": None,
+               "columns": None, "seconds": None, "error": None}
+    try:
+        destination = destination or output_path(filepath, output_dir, output_format)
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        steps = recipe.get("steps", [])
+        if chunksize:
+            if output_format != "csv":
+                raise ValueError("Chunked runs write CSV output")
+            streamed = [(STREAMING_NAMES[step["op"]], {k: v for k, v in step.items() if k != "op"})
+                        for step in steps]
+            counts = stream_clean(filepath, destination, streamed, chunksize=chunksize)
+            metrics.update(rows_in=counts["rows_in"], rows_out=counts["rows_out"])
+        else:
+            df = load_dataset(filepath)
+            if df is None:
+                raise ValueError("could not load dataset")
+            metrics["rows_in"] = len(df)
+            if recipe.get("optimize_dtypes"):
+                df, _ = optimize_dtypes(df, dates=recipe.get("parse_dates", False))
+            df = build_pipeline(df, steps).collect()
+            write_frame(df, destination, fmt=output_format)
+            metrics.update(rows_out=len(df), columns=df.shape[1])
+        metrics["output"] = destination
+    except Exception as e:
+        metrics["error"] = f"{type(e).__name__}: {e}"
+    metrics["seconds"] = round(time.perf_counter() - started, 4)
+    return metrics
+
+
+# 🏭 Clean Many Files
+def run_batch(inputs, recipe, output_dir="cleaned", output_format=None, workers=None, chunksize=None,
+              profile=False):
+    """Clean every file matched by ``inputs`` with ``recipe``, one process per file at a time.
+
+    Returns a list of per-file metrics in input order. Raises ValueError before
+    cleaning anything if two inputs would be written to the same output file.
+    """
+    files = expand_inputs(inputs)
+    output_format = output_format or recipe.get("output_format", "csv")
+    destinations = output_paths(files, output_dir, output_format)
+    workers = workers or os.cpu_count() or 1
+    args = [(path, recipe, output_dir, output_format, chunksize, profile, destinations[path]) for path in files]
+    if workers == 1 or len(files) <= 1:
+        return [clean_file(*arg) for arg in args]
+    # Files are the unit of parallelism, so each worker keeps column work on one core
+    with ProcessPoolExecutor(max_workers=min(workers, len(files)), initializer=parallel.set_workers,
+                             initargs=(1,)) as pool:
+        return list(pool.map(clean_file, *zip(*args)))
@@ -0,0 +1,229 @@
+# benchmark.py - Timing and memory benchmarks for core, profiling, preview and undo hot paths
+import os
+import json
+import time
+import platform
+import tempfile
+import subprocess
+import sys
+import tracemalloc
+import contextlib
+import numpy as np
+import pandas as pd
+from scrubpy import core
+from scrubpy.profiling import DataProfiler
+from scrubpy.preview import preview_changes, preview_summary
+from scrubpy.undo import UndoHistory
+from scrubpy.row_hash import index_for, forget
+
+DEFAULT_THRESHOLD = 0.25  # flag a regression when a benchmark gets 25% slower
+STARTUP_BUDGET = 0.5      # seconds for `scrubpy --help`, interpreter start included
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "matplotlib", "seaborn", "InquirerPy", "pyarrow")
+
+
+# 🧪 Synthetic Data
+def make_dataset(rows=100_000, cols=10, null_ratio=0.05, duplicate_ratio=0.05,
+                 cardinality=1_000, outlier_rate=0.001, seed=0):
+    """Build a frame with alternating numeric and text columns of the requested shape."""
+    rng = np.random.default_rng(seed)
+    unique_rows = max(int(rows * (1 - duplicate_ratio)), 1)
+    labels = np.array([f" Value {i} " if i % 2 else f"value {i}" for i in range(cardinality)], dtype=object)
+    data = {}
+    for i in range(cols):
+        if i % 2 == 0:
+            values = rng.normal(100, 15, unique_rows)
+            spikes = rng.random(unique_rows) < outlier_rate
+            values[spikes] *= 50
+            data[f"Num Col {i}"] = values
+        else:
+            data[f"Text Col {i}"] = labels[rng.integers(0, cardinality, unique_rows)]
+    df = pd.DataFrame(data)
+    if rows > unique_rows:
+        df = pd.concat([df, df.sample(rows - unique_rows, replace=True, random_state=seed)], ignore_index=True)
+    mask = rng.random(df.shape) < null_ratio
+    return df.mask(mask)
+
+
+@contextlib.contextmanager
+def _in_tempdir():
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+def _benchmarks(df):
+    """(name, setup, func) triples; only ``func(*setup())`` is measured."""
+    numeric = next(col for col in df.columns if col.startswith("Num"))
+    text = next((col for col in df.columns if col.startswith("Text")), numeric)
+    copy = lambda: (df.copy(),)  # noqa: E731
+
+    def cold():
+        # Operations would otherwise reuse the row-hash index the previous run built for ``df``
+        forget(df)
+        return (df,)
+
+    csv_path = os.path.abspath("bench_input.csv")
+
+    def undo_cycle(kind):
+        def run(frame):
+            history = UndoHistory()
+            if kind == "rows":
+                dropped = frame.isnull().any(axis=1)
+                history.save_state(frame, rows=dropped)
+                after = frame[~dropped.to_numpy()].reset_index(drop=True)
+            elif kind == "columns":
+                history.save_state(frame, columns=[text])
+                after = core.standardize_text(frame, text)
+            else:
+                history.save_state(frame)
+                after = frame
+            return history.undo(after)
+        return run
+
+    marks = [
+        ("core.load_dataset", lambda: (csv_path,), core.load_dataset),
+        ("core.get_dataset_summary", cold, core.get_dataset_summary),
+        ("core.drop_missing_values", cold, lambda frame: core.drop_missing_values(frame, confirm=False)),
+        ("core.fill_missing_values", cold, lambda frame: core.fill_missing_values(frame, 0)),
+        ("core.remove_duplicates", cold, core.remove_duplicates),
+        ("core.standardize_text", copy, lambda frame: core.standardize_text(frame, text)),
+        ("core.fix_column_names", copy, core.fix_column_names),
+        ("core.convert_column_types", copy, lambda frame: core.convert_column_types(frame, numeric, "Integer")),
+        ("core.remove_outliers", copy, lambda frame: core.remove_outliers(frame, numeric)),
+        ("core.save_dataset", cold, lambda frame: core.save_dataset(frame, "bench.csv")),
+        ("preview.preview_changes", cold, lambda frame: preview_changes(frame, "drop_missing")),
+        ("preview.preview_summary", cold, lambda frame: preview_summary(frame, "drop_missing")),
+        ("undo.rows", cold, undo_cycle("rows")),
+        ("undo.columns", copy, undo_cycle("columns")),
+        ("undo.snapshot", cold, undo_cycle("snapshot")),
+    ]
+    for method in ("dataset_overview", "data_types_summary", "summary_statistics", "missing_values_report",
+                   "duplicate_report", "categorical_summary", "correlation_matrix", "suggest_cleaning_actions",
+                   "generate_profile_report"):
+        # A fresh profiler and row-hash index per run, so caches don't hide the cost
+        marks.append((f"profiling.{method}", lambda: (DataProfiler(cold()[0]),),
+                      lambda profiler, method=method: getattr(profiler, method)()))
+    marks.append(("profiling.correlation_pairs[wide]", lambda: (DataProfiler(cold()[0], wide=True),),
+                  lambda profiler: profiler.correlation_pairs()))
+    warm = DataProfiler(df)
+    warm.stats()
+    marks.append(("profiling.generate_profile_report[cached]", lambda: (warm,),
+                  lambda profiler: profiler.generate_profile_report()))
+
+    def advanced(change):
+        # A profiled frame and the result of one step; only the statistics update is timed
+        def setup():
+            profiler = DataProfiler(df)
+            profiler.stats()
+            if change == "rows":
+                dropped = index_for(df).duplicated(frame=df)
+                return profiler, core.remove_duplicates(df), {"rows": dropped}
+            return profiler, core.standardize_text(df, text), {"columns": [text]}
+        return setup
+    for change in ("rows", "columns"):
+        marks.append((f"profiling.advance[{change}]", advanced(change),
+                      lambda profiler, after, delta: profiler.advance(after, **delta).stats()))
+    return marks
+
+
+def _measure(setup, func, repeat):
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    # Separate run for memory: tracemalloc slows everything it watches
+    args = setup()
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": float(np.median(timings)), "min_seconds": float(min(timings)),
+            "peak_mb": round(peak / 2 ** 20, 3)}
+
+
+# 🚀 Startup
+_STARTUP_PROBE = ("import sys, time; started = time.perf_counter(); import scrubpy.cli; "
+                  "print(time.perf_counter() - started); print(','.join(m for m in {heavy!r} if m in sys.modules))")
+
+
+def measure_startup(repeat=3, budget=STARTUP_BUDGET):
+    """Time `scrubpy --help` and the import of the CLI in fresh interpreters.
+
+    Also lists the heavy modules the CLI import pulled in; there should be none,
+    they belong inside the commands that use them.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "scrubpy", "--help"], env=env, check=True, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    probe = subprocess.run([sys.executable, "-c", _STARTUP_PROBE.format(heavy=HEAVY_MODULES)],
+                           env=env, check=True, capture_output=True, text=True).stdout.split("\n")
+    seconds = float(np.median(timings))
+    return {"seconds": seconds, "min_seconds": float(min(timings)), "peak_mb": None,
+            "import_seconds": float(probe[0]), "heavy_modules": [m for m in probe[1].split(",") if m],
+            "budget": budget, "over_budget": seconds > budget}
+
+
+# ⏱️ Run
+def run_benchmarks(repeat=3, only=None, startup_budget=STARTUP_BUDGET, **shape):
+    """Time and memory-profile every hot path; returns a JSON-serializable report."""
+    df = make_dataset(**shape)
+    results = {}
+    if not only or only in "startup.cli_help":
+        try:
+            results["startup.cli_help"] = measure_startup(repeat, startup_budget)
+        except (subprocess.CalledProcessError, OSError, ValueError, IndexError) as e:
+            results["startup.cli_help"] = {"seconds": None, "min_seconds": None, "peak_mb": None,
+                                           "error": f"{type(e).__name__}: {e}"}
+    with _in_tempdir(), open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        df.to_csv("bench_input.csv", index=False)
+        for name, setup, func in _benchmarks(df):
+            if only and only not in name:
+                continue
+            try:
+                results[name] = _measure(setup, func, repeat)
+            except Exception as e:
+                # Record broken paths instead of losing the whole run
+                results[name] = {"seconds": None, "min_seconds": None, "peak_mb": None,
+                                 "error": f"{type(e).__name__}: {e}"}
+    return {
+        "meta": {"shape": shape or "default", "rows": len(df), "columns": df.shape[1], "repeat": repeat,
+                 "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+                 "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Return {name: (baseline_s, current_s, ratio)} for benchmarks slower than ``1 + threshold``."""
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+    regressions = {}
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or not before["seconds"] or result["seconds"] is None:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        if ratio > 1 + threshold:
+            regressions[name] = (before["seconds"], result["seconds"], round(ratio, 3))
+    return regressions
+
+
+def save_report(report, path):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
@@ -0,0 +1,202 @@
+# cache.py - On-disk cache of loaded datasets and profile statistics, keyed by file fingerprint
+import os
+import json
+import time
+import pickle
+import contextlib
+import shutil
+import hashlib
+import tempfile
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 10 * 2 ** 30  # 10 GB
+SAMPLE_BYTES = 1 << 20           # bytes hashed at the start, middle and end of a file
+
+
+def default_directory():
+    """$SCRUBPY_CACHE_DIR, else ~/.cache/scrubpy."""
+    return os.environ.get("SCRUBPY_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "scrubpy"))
+
+
+def fingerprint(filepath):
+    """Path, size, modification time and a hash of sampled content.
+
+    Hashing three 1 MB samples instead of the whole file keeps this instant for
+    multi-gigabyte inputs; together with size and mtime it catches rewrites.
+    """
+    stat = os.stat(filepath)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as handle:
+        for offset in (0, max(stat.st_size // 2 - SAMPLE_BYTES // 2, 0), max(stat.st_size - SAMPLE_BYTES, 0)):
+            handle.seek(offset)
+            digest.update(handle.read(SAMPLE_BYTES))
+    return {"path": os.path.abspath(filepath), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "content": digest.hexdigest()}
+
+
+def _write_atomic(path, write):
+    """Call ``write`` on a temporary file next to ``path``, then move it into place.
+
+    Readers see either the old file or the complete new one, never a partial
+    write from a crashed or concurrent session.
+    """
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+    os.close(handle)
+    try:
+        write(temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _pickle_to(obj):
+    def write(path):
+        with open(path, "wb") as handle:
+            pickle.dump(obj, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    return write
+
+
+def _directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class DatasetCache:
+    """Loaded frames (Feather, pickle as a fallback) and profiler statistics, one directory per entry.
+
+    Entries are keyed by the file's fingerprint plus the load options, so a
+    changed file or different options never hit a stale entry. When the cache
+    grows past ``max_bytes`` the least recently used entries are removed.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+
+    def key(self, filepath, **options):
+        payload = json.dumps({"file": fingerprint(filepath), "options": options}, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def _discard(self, key):
+        shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def _touch(self, key):
+        os.utime(self._entry(key))  # the directory mtime orders entries for LRU eviction
+
+    # 📦 Frames
+    def load_frame(self, filepath, **options):
+        """The cached frame for ``filepath`` loaded with ``options``, or None.
+
+        An entry that can't be read (truncated, corrupt, written by another
+        pandas or pyarrow version) is deleted and counts as a miss.
+        """
+        key = self.key(filepath, **options)
+        entry = self._entry(key)
+        try:
+            if os.path.exists(os.path.join(entry, "frame.feather")):
+                df = pd.read_feather(os.path.join(entry, "frame.feather"))
+            else:
+                with open(os.path.join(entry, "frame.pkl"), "rb") as handle:
+                    df = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._discard(key)
+            return None
+        self._touch(key)
+        return df
+
+    def store_frame(self, filepath, df, **options):
+        key = self.key(filepath, **options)
+        current = fingerprint(filepath)
+        # Entries of older versions of this file can never be hit again
+        self._remove(lambda meta: meta["file"]["path"] == current["path"] and meta["file"] != current)
+        entry = self._entry(key)
+        os.makedirs(entry, exist_ok=True)
+        # Files are written beside their final name and moved into place, so a crash leaves no half entry
+        try:
+            _write_atomic(os.path.join(entry, "frame.feather"), df.reset_index(drop=True).to_feather)
+        except Exception:
+            # No pyarrow, or columns Arrow can't type (mixed objects)
+            if os.path.exists(os.path.join(entry, "frame.feather")):
+                os.remove(os.path.join(entry, "frame.feather"))
+            _write_atomic(os.path.join(entry, "frame.pkl"), _pickle_to(df))
+        meta = json.dumps({"file": current, "options": options, "created": time.time()}, default=str)
+
+        def write_meta(path):
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(meta)
+        _write_atomic(os.path.join(entry, "meta.json"), write_meta)
+        self._evict(keep=key)
+        return key
+
+    # 📋 Profiles
+    def load_profile(self, filepath, approximate=False, **options):
+        """Cached DataProfiler statistics for the frame stored with the same options, or None."""
+        key = self.key(filepath, **options)
+        path = os.path.join(self._entry(key), f"profile_{'approx' if approximate else 'exact'}.pkl")
+        try:
+            with open(path, "rb") as handle:
+                stats = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            with contextlib.suppress(OSError):
+                os.remove(path)  # unreadable; the frame next to it may still be fine
+            return None
+        self._touch(key)
+        return stats
+
+    def store_profile(self, filepath, stats, approximate=False, **options):
+        key = self.key(filepath, **options)
+        entry = self._entry(key)
+        if not os.path.isdir(entry):
+            return None  # profiles are only kept next to their frame
+        _write_atomic(os.path.join(entry, f"profile_{'approx' if approximate else 'exact'}.pkl"), _pickle_to(stats))
+        self._evict(keep=key)
+        return key
+
+    # 🧹 Housekeeping
+    def entries(self):
+        """(key, bytes, last used) of every entry, least recently used first."""
+        if not os.path.isdir(self.directory):
+            return []
+        found = [(entry.name, _directory_size(entry.path), entry.stat().st_mtime)
+                 for entry in os.scandir(self.directory) if entry.is_dir()]
+        return sorted(found, key=lambda item: item[2])
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def invalidate(self, filepath=None):
+        """Remove the entries of ``filepath`` (every version and option set), or everything."""
+        if filepath is None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            return
+        path = os.path.abspath(filepath)
+        self._remove(lambda meta: meta["file"]["path"] == path)
+
+    def _remove(self, stale):
+        """Delete entries whose metadata satisfies ``stale`` (and unreadable ones)."""
+        for key, _, _ in self.entries():
+            try:
+                with open(os.path.join(self._entry(key), "meta.json"), encoding="utf-8") as handle:
+                    remove = stale(json.load(handle))
+            except (OSError, ValueError, KeyError):
+                remove = True
+            if remove:
+                self._discard(key)
+
+    def _evict(self, keep=None):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        # Oldest first, and the entry just written only if it alone is over budget
+        for key, size, _ in sorted(entries, key=lambda item: item[0] == keep):
+            if total <= self.max_bytes:
+                break
+            self._discard(key)
+            total -= size
@@ -1,177 +1,192 @@
+# cli.py - Command-line entry point; heavy modules load inside the command that needs them
 import typer
+from typing import List
+import json
+import contextlib
 from rich.console import Console
-from InquirerPy import inquirer
-import os
-import pandas as pd
-from scrubpy.core import (
-    load_dataset, get_dataset_summary, drop_missing_values, fill_missing_values,
-    remove_duplicates, standardize_text, fix_column_names, convert_column_types,
-    remove_outliers, save_dataset
-)
-from scrubpy.preview import preview_changes
-from scrubpy.profiling import DataProfiler
-from scrubpy.export_profiling_report import export_profiling_report
 
 app = typer.Typer()
 console = Console()
-previous_states = []  # 🔄 Stores previous versions for undo feature
-
-# 🎨 Banner
-def show_banner():
-    console.print("\n[bold cyan]🔥 ScrubPy - The Smartest Data Cleaner 🔥[/bold cyan]")
-    console.print("[italic dim]Make your data shine in seconds![/italic dim]\n")
-
-# 📂 Choose Dataset
-def choose_dataset():
-    files = [f for f in os.listdir() if f.endswith(".csv")]
-    if not files:
-        console.print("[bold red]❌ No CSV files found in the current directory![/bold red]")
-        raise typer.Exit()
-
-    dataset = inquirer.select(
-        message="📂 Choose a dataset to clean:",
-        choices=files,
-        default=files[0]
-    ).execute()
-
-    return dataset
-
-# 🔄 Store Previous State (for Undo)
-def save_previous_state(df):
-    """Save a copy of the current state before making changes."""
-    previous_states.append(df.copy())
-
-# 🧹 Cleaning Menu
-def clean_data(df, dataset):
-    while True:
-        action = inquirer.select(
-            message="🛠️ Choose a cleaning operation:",
-            choices=[
-                "📊 View Data Summary",
-                "📋 Profile My Dataset",
-                "🚮 Handle Missing Values",
-                "🗑️ Remove Duplicates",
-                "🔡 Standardize Text",
-                "🔠 Fix Column Names",
-                "🔢 Convert Column Types",
-                "📉 Remove Outliers",
-                "↩️ Undo Last Change",
-                "💾 Save & Exit"
-            ],
-        ).execute()
-
-        if action == "📊 View Data Summary":
-            console.clear()
-            console.print(get_dataset_summary(df))
-
-        elif action == "📋 Profile My Dataset":
-            profiler = DataProfiler(df)
-            profiler.display_rich_summary()
-            recommend = inquirer.confirm("Would you like ScrubPy to suggest cleaning actions?").execute()
-            if recommend:
-                issues = profiler.suggest_cleaning_actions()
-                console.print("\n[bold cyan]🔎 Cleaning Recommendations:[/bold cyan]")
-                for issue in issues:
-                    console.print(f"- {issue}")
-
-            export = inquirer.confirm("📝 Export this profiling report to .txt?").execute()
-            if export:
-                export_profiling_report(df, dataset_name=dataset)
-                console.print("[bold green]✅ Profiling report exported successfully![/bold green]")
-
-        elif action == "🚮 Handle Missing Values":
-            missing_percentage = (df.isnull().sum().sum() / df.size) * 100
-            console.print(f"⚠️ [bold yellow]Warning:[/bold yellow] {missing_percentage:.2f}% of data is missing.")
-
-            missing_choice = inquirer.select(
-                message="How do you want to handle missing values?",
-                choices=[
-                    "❌ Drop Rows with Missing Values",
-                    "📏 Drop Columns with > X% Missing Values",
-                    "📝 Fill Missing Values (Recommended)",
-                    "⬅️ Cancel"
-                ],
-            ).execute()
-
-            if missing_choice == "❌ Drop Rows with Missing Values":
-                preview = preview_changes(df, "drop_missing")
-                console.print("[bold cyan]🔍 Preview:[/bold cyan]")
-                console.print(get_dataset_summary(preview))
-                confirm = inquirer.confirm("Do you want to proceed?").execute()
-                if confirm:
-                    save_previous_state(df)
-                    df = drop_missing_values(df)
-                    console.print("[bold yellow]🧹 Missing values removed![/bold yellow]")
-
-            elif missing_choice == "📏 Drop Columns with > X% Missing Values":
-                threshold = float(inquirer.text("Enter threshold percentage (e.g., 50 for 50%)").execute())
-                cols_to_drop = df.columns[df.isnull().mean() * 100 > threshold]
-                if cols_to_drop.empty:
-                    console.print("[bold red]No columns have that much missing data![/bold red]")
-                else:
-                    preview = df.drop(columns=cols_to_drop)
-                    console.print(f"[bold cyan]🔍 Preview: Dropping columns {list(cols_to_drop)}[/bold cyan]")
-                    confirm = inquirer.confirm("Do you want to proceed?").execute()
-                    if confirm:
-                        save_previous_state(df)
-                        df = df.drop(columns=cols_to_drop)
-                        console.print(f"[bold yellow]📏 Dropped columns {list(cols_to_drop)}![/bold yellow]")
-
-            elif missing_choice == "📝 Fill Missing Values (Recommended)":
-                fill_value = inquirer.text(message="Enter a value to fill missing cells:").execute()
-                preview = preview_changes(df, "fill_missing", fill_value=fill_value)
-                console.print("[bold cyan]🔍 Preview:[/bold cyan]")
-                console.print(get_dataset_summary(preview))
-                confirm = inquirer.confirm("Do you want to proceed?").execute()
-                if confirm:
-                    save_previous_state(df)
-                    df = fill_missing_values(df, fill_value)
-                    console.print(f"[bold yellow]🖊️ Filled missing values with '{fill_value}'![/bold yellow]")
-
-        elif action == "🗑️ Remove Duplicates":
-            preview = preview_changes(df, "remove_duplicates")
-            console.print("[bold cyan]🔍 Preview:[/bold cyan]")
-            console.print(get_dataset_summary(preview))
-            confirm = inquirer.confirm("Do you want to proceed?").execute()
-            if confirm:
-                save_previous_state(df)
-                df = remove_duplicates(df)
-                console.print("[bold yellow]♻️ Duplicates removed![/bold yellow]")
-
-        elif action == "🔡 Standardize Text":
-            col = inquirer.select(message="📌 Choose a column:", choices=list(df.columns)).execute()
-            preview = preview_changes(df, "standardize_text", column=col)
-            console.print("[bold cyan]🔍 Preview:[/bold cyan]")
-            console.print(get_dataset_summary(preview))
-            confirm = inquirer.confirm("Do you want to proceed?").execute()
-            if confirm:
-                save_previous_state(df)
-                df = standardize_text(df, col)
-                console.print(f"[bold yellow]🔤 Standardized text in '{col}'![/bold yellow]")
-
-        elif action == "↩️ Undo Last Change":
-            if previous_states:
-                df = previous_states.pop()
-                console.print("[bold green]↩️ Reverted to the last state![/bold green]")
-            else:
-                console.print("[bold red]❌ No previous state found![/bold red]")
-
-        elif action == "💾 Save & Exit":
-            output_file = "cleaned_" + dataset
-            save_dataset(df, output_file)
-            console.print(f"[bold green]✅ Cleaned data saved as {output_file}![/bold green]")
-            break
-
-    return df
+
+
+@contextlib.contextmanager
+def profiling(enabled, output=None):
+    """Record instrumented operations inside the block, then print them and save them to ``output``."""
+    if not enabled:
+        yield None
+        return
+    from scrubpy.instrument import profile_session
+    with profile_session() as recorder:
+        try:
+            yield recorder
+        finally:
+            show_profile(recorder, output)
+
+
+def show_profile(recorder, output=None):
+    console.print(recorder.table())
+    if output:
+        recorder.save(output)
+        console.print(f"[bold green]⏱️ Profile saved to {output}[/bold green]")
+
 
 # 🚀 Main CLI Entry Point
 @app.command()
-def clean():
-    show_banner()
-    dataset = choose_dataset()
-    df = load_dataset(dataset)
-    console.print(get_dataset_summary(df))
-    df = clean_data(df, dataset)
+def clean(
+    approximate: bool = typer.Option(False, help="Profile with mergeable sketches (fast, with error bounds) for very large datasets."),
+    lazy: bool = typer.Option(False, help="Queue cleaning steps and run them as one optimized plan when results are needed."),
+    exact_preview: bool = typer.Option(False, help="Run each operation on a full copy for previews instead of estimating."),
+    output_format: str = typer.Option("csv", help="Format of the cleaned file: csv, parquet or feather (zstd-compressed)."),
+    columns: str = typer.Option(None, help="Comma-separated columns to load (others are never read)."),
+    optimize: bool = typer.Option(True, help="Shrink dtypes after loading (categories, downcast numbers)."),
+    parse_dates: bool = typer.Option(False, help="Also parse ISO date text when optimizing (CSV output rewrites its format)."),
+    cache: bool = typer.Option(True, help="Reuse the parsed dataset and its profile from the on-disk cache."),
+    profile: bool = typer.Option(False, help="Time every operation and show wall/CPU time, memory and shapes at exit."),
+    profile_output: str = typer.Option(None, help="Also save the profile: *.trace.json as a Chrome trace, else JSON."),
+):
+    """Clean a dataset from the current directory interactively."""
+    if output_format not in ("csv", "parquet", "feather"):
+        raise typer.BadParameter("output format must be csv, parquet or feather")
+    from scrubpy.interactive import start_session
+    with profiling(profile or bool(profile_output), profile_output):
+        start_session(approximate=approximate, lazy=lazy, exact_preview=exact_preview, output_format=output_format,
+                      columns=columns, optimize=optimize, parse_dates=parse_dates, cache=cache)
+
+# 🏭 Headless Batch Cleaning
+@app.command()
+def run(
+    recipe: str = typer.Argument(..., help="JSON or YAML recipe of cleaning steps."),
+    inputs: List[str] = typer.Argument(..., help="Files, directories or glob patterns to clean."),
+    output_dir: str = typer.Option("cleaned", help="Directory for cleaned files."),
+    output_format: str = typer.Option(None, help="csv, parquet or feather (defaults to the recipe's, else csv)."),
+    workers: int = typer.Option(None, help="Files cleaned in parallel (default: CPU count)."),
+    chunksize: int = typer.Option(None, help="Stream each file in chunks of this many rows (CSV output)."),
+    metrics: str = typer.Option(None, help="Write per-file metrics to this JSON file."),
+    profile: bool = typer.Option(False, help="Time every operation in every file and show the breakdown."),
+    profile_output: str = typer.Option(None, help="Also save the profile: *.trace.json as a Chrome trace, else JSON."),
+):
+    """Apply a cleaning recipe to many files without prompts."""
+    from rich.table import Table
+    from rich.markup import escape
+    from scrubpy.batch import load_recipe, run_batch
+    results = run_batch(inputs, load_recipe(recipe), output_dir=output_dir, output_format=output_format,
+                        workers=workers, chunksize=chunksize, profile=profile or bool(profile_output))
+    if not results:
+        console.print("[bold red]❌ No input files matched![/bold red]")
+        raise typer.Exit(code=1)
+
+    table = Table(title="Batch Results")
+    for column in ("File", "Rows In", "Rows Out", "Seconds", "Status"):
+        table.add_column(column)
+    for result in results:
+        status = "[red]" + escape(result["error"]) + "[/red]" if result["error"] else "[green]ok[/green]"
+        table.add_row(escape(result["file"]), str(result["rows_in"]), str(result["rows_out"]), f"{result['seconds']:.2f}", status)
+    console.print(table)
+    if profile or profile_output:
+        from scrubpy.instrument import Recorder
+        events = [event for result in results for event in result.pop("profile", [])]
+        show_profile(Recorder.from_events(events), profile_output)
+
+    if metrics:
+        with open(metrics, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if any(result["error"] for result in results):
+        raise typer.Exit(code=1)
+
+# 🛰️ Service Mode
+@app.command()
+def serve(
+    recipe: str = typer.Argument(..., help="JSON or YAML recipe applied to every submitted file."),
+    host: str = typer.Option("127.0.0.1", help="Interface to listen on."),
+    port: int = typer.Option(8765, help="Port to listen on."),
+    output_dir: str = typer.Option("cleaned", help="Directory for cleaned files."),
+    output_format: str = typer.Option(None, help="csv, parquet or feather (defaults to the recipe's, else csv)."),
+    workers: int = typer.Option(None, help="Warm worker processes (default: CPU count)."),
+    max_queue: int = typer.Option(100, help="Files waiting at most; larger submissions get HTTP 429."),
+    chunksize: int = typer.Option(None, help="Stream each file in chunks of this many rows (CSV output)."),
+):
+    """Run a local HTTP service that queues files and cleans them with warm workers."""
+    import asyncio
+    from scrubpy.batch import load_recipe
+    from scrubpy.server import CleaningServer
+    server = CleaningServer(load_recipe(recipe), output_dir=output_dir, output_format=output_format,
+                            workers=workers, max_queue=max_queue, chunksize=chunksize)
+    ready = lambda address: console.print(  # noqa: E731
+        f"[bold green]🛰️ Listening on http://{address[0]}:{address[1]} with {server.workers} workers[/bold green]")
+    try:
+        asyncio.run(server.serve(host, port, ready=ready))
+    except KeyboardInterrupt:
+        console.print("[bold yellow]👋 Stopped.[/bold yellow]")
+
+# 🗄️ Cache
+@app.command("clear-cache")
+def clear_cache(
+    dataset: str = typer.Argument(None, help="Only forget this file (default: everything)."),
+):
+    """Remove cached datasets and profiles."""
+    from scrubpy.cache import DatasetCache
+    dataset_cache = DatasetCache()
+    before = dataset_cache.size()
+    dataset_cache.invalidate(dataset)
+    console.print(f"[bold green]🧹 Freed {(before - dataset_cache.size()) / 2 ** 20:.1f} MB from "
+                  f"{dataset_cache.directory}[/bold green]")
+
+# ⏱️ Benchmarks
+@app.command()
+def bench(
+    rows: int = typer.Option(100_000, help="Rows in the synthetic dataset."),
+    cols: int = typer.Option(10, help="Columns (alternating numeric and text)."),
+    null_ratio: float = typer.Option(0.05, help="Share of cells set to missing."),
+    duplicate_ratio: float = typer.Option(0.05, help="Share of rows that duplicate another row."),
+    cardinality: int = typer.Option(1_000, help="Distinct values per text column."),
+    outlier_rate: float = typer.Option(0.001, help="Share of numeric values turned into outliers."),
+    repeat: int = typer.Option(3, help="Timed runs per benchmark (the median is reported)."),
+    only: str = typer.Option(None, help="Only run benchmarks whose name contains this text."),
+    output: str = typer.Option(None, help="Write the JSON report to this file."),
+    baseline: str = typer.Option(None, help="Compare against a previous JSON report."),
+    threshold: float = typer.Option(None, help="Allowed slowdown versus the baseline (default 0.25 = 25%)."),
+    startup_budget: float = typer.Option(0.5, help="Seconds `scrubpy --help` may take, interpreter start included."),
+):
+    """Time and memory-profile the cleaning, profiling, preview and undo hot paths."""
+    from rich.table import Table
+    from rich.markup import escape
+    from scrubpy.benchmark import run_benchmarks, compare, save_report, load_report
+    report = run_benchmarks(repeat=repeat, only=only, startup_budget=startup_budget, rows=rows, cols=cols, null_ratio=null_ratio,
+                            duplicate_ratio=duplicate_ratio, cardinality=cardinality, outlier_rate=outlier_rate)
+    previous = load_report(baseline)["results"] if baseline else {}
+
+    table = Table(title=f"Benchmarks ({report['meta']['rows']:,} rows x {report['meta']['columns']} columns)")
+    for column in ("Benchmark", "Seconds", "Peak MB", "Baseline"):
+        table.add_column(column)
+    for name, result in report["results"].items():
+        if result.get("error"):
+            table.add_row(escape(name), "-", "-", f"[red]{escape(result['error'])}[/red]")
+            continue
+        before = previous.get(name)
+        change = f"{result['seconds'] / before['seconds']:.2f}x" if before and before["seconds"] else "-"
+        peak = "-" if result["peak_mb"] is None else f"{result['peak_mb']:.1f}"
+        table.add_row(escape(name), f"{result['seconds']:.4f}", peak, change)
+    console.print(table)
+
+    # Save and compare first, so a failing run still leaves its report behind
+    if output:
+        save_report(report, output)
+    regressions = compare(load_report(baseline), report, threshold=threshold) if baseline else {}
+    for name, (before, after, ratio) in regressions.items():
+        console.print(f"[bold red]❌ {name}: {before:.4f}s -> {after:.4f}s ({ratio:.2f}x)[/bold red]")
+    if baseline and not regressions:
+        console.print("[bold green]✅ No regressions![/bold green]")
+
+    startup = report["results"].get("startup.cli_help", {})
+    if startup.get("heavy_modules"):
+        console.print(f"[bold red]❌ 'import scrubpy.cli' loads {', '.join(startup['heavy_modules'])}[/bold red]")
+    if startup.get("over_budget"):
+        console.print(f"[bold red]❌ Startup took {startup['seconds']:.2f}s (budget {startup['budget']:.2f}s)[/bold red]")
+    if regressions or startup.get("heavy_modules") or startup.get("over_budget"):
+        raise typer.Exit(code=1)
+
+def main():
+    app()
 
 if __name__ == "__main__":
-    app()
+    main()
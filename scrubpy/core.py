@@ -1,111 +1,267 @@
 import pandas as pd
+import numpy as np
 import os
-from scipy.stats import zscore
+import functools
+import unicodedata
+from scrubpy.parallel import map_series
+from scrubpy.formats import read_frame, write_frame, mixed_columns, EXTENSIONS
+from scrubpy.row_hash import index_for, carry, near_duplicate_groups
+from scrubpy.outliers import numeric_columns, outlier_rows
+from scrubpy.instrument import instrumented
 
 # 📂 Load Dataset
-def load_dataset(filepath):
-    """Load dataset safely with error handling."""
+@instrumented()
+def load_dataset(filepath, chunksize=None, columns=None, filters=None, memory_map=False, dtype=None):
+    """Load dataset safely with error handling.
+
+    CSV, Parquet and Arrow IPC/Feather are detected automatically. ``columns``
+    reads only those columns and ``filters`` (pyarrow DNF, e.g.
+    ``[("year", ">=", 2020)]``) keeps matching rows, skipping Parquet row groups
+    that can't match. With ``chunksize`` set, return an iterator of DataFrames of
+    at most that many rows instead of reading the whole file (see ``scrubpy.streaming``).
+    ``dtype`` maps CSV columns to the types to parse them as.
+    """
     try:
-        df = pd.read_csv(filepath)
+        df = read_frame(filepath, columns=columns, filters=filters, memory_map=memory_map, chunksize=chunksize,
+                        dtype=dtype)
         return df
     except Exception as e:
         print(f"❌ Error loading dataset: {e}")
         return None
 
 # 📊 Dataset Summary
+@instrumented()
 def get_dataset_summary(df):
     """Generate a summary of the dataset."""
     missing_count = df.isnull().sum().sum()
-    duplicate_count = df.duplicated().sum()
+    duplicate_count = index_for(df).count()
+    return format_summary(df.shape[0], df.shape[1], missing_count, duplicate_count,
+                          df.memory_usage(deep=True).sum())
 
+def format_summary(rows, columns, missing_count, duplicate_count, memory_bytes, estimated=()):
+    """Render summary numbers; fields named in ``estimated`` are marked with '~'."""
+    mark = {field: "~" if field in estimated else "" for field in ("missing", "duplicates", "memory")}
+    size = rows * columns
     summary = f"""
     📊 [bold cyan]Data Summary:[/bold cyan]
-    Total Rows: {df.shape[0]}
-    Total Columns: {df.shape[1]}
-    Missing Values: {missing_count} ({(missing_count / df.size) * 100:.2f}%)
-    Duplicate Rows: {duplicate_count}
-    Memory Usage: {df.memory_usage(deep=True).sum() / 1024:.2f} KB
+    Total Rows: {rows}
+    Total Columns: {columns}
+    Missing Values: {mark['missing']}{missing_count} ({(missing_count / size if size else 0) * 100:.2f}%)
+    Duplicate Rows: {mark['duplicates']}{duplicate_count}
+    Memory Usage: {mark['memory']}{memory_bytes / 1024:.2f} KB
     """
     return summary
 
 # 🚮 Drop Missing Values (with Confirmation)
-def drop_missing_values(df):
-    """Drop rows with missing values after user confirmation."""
+@instrumented()
+def drop_missing_values(df, confirm=True):
+    """Drop rows with missing values after user confirmation (``confirm=False`` never prompts)."""
     missing_before = df.isnull().sum().sum()
-    percent_missing = (missing_before / df.size) * 100
+    percent_missing = (missing_before / df.size) * 100 if df.size else 0
 
-    if percent_missing > 20:
+    if confirm and percent_missing > 20:
         print(f"⚠️ Warning: {percent_missing:.2f}% of data is missing. Consider filling values instead.")
         confirm = input("Are you sure you want to drop missing values? (yes/no): ").strip().lower()
         if confirm != "yes":
             return df
 
-    return df.dropna().reset_index(drop=True)
+    dropped = df.isnull().any(axis=1).to_numpy()
+    cleaned = df[~dropped].reset_index(drop=True)
+    carry(df, cleaned, rows=dropped)
+    return cleaned
 
 # 📝 Fill Missing Values
-def fill_missing_values(df, value):
-    """Fill missing values with user-specified input."""
-    return df.fillna(value)
+@instrumented()
+def fill_missing_values(df, value, columns=None):
+    """Fill missing values with user-specified input (in ``columns`` only, if given)."""
+    targets = df.columns if columns is None else pd.Index(columns)
+    changed = targets[df[targets].isnull().any().to_numpy()]
+    try:
+        filled = df.fillna({col: value for col in changed})
+    except (TypeError, ValueError):
+        # Compact dtypes (categories, nullable ints/booleans) reject values they can't hold
+        filled = df.copy(deep=False)
+        for col in changed:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+                series = series.cat.add_categories([value])
+            try:
+                filled[col] = series.fillna(value)
+            except (TypeError, ValueError):
+                filled[col] = series.astype(object).fillna(value)
+    carry(df, filled, columns=changed)
+    return filled
 
 # 🗑️ Remove Duplicates
-def remove_duplicates(df):
-    """Remove duplicate rows."""
-    return df.drop_duplicates().reset_index(drop=True)
+@instrumented()
+def remove_duplicates(df, subset=None, keep="first"):
+    """Remove duplicate rows (judged on ``subset`` columns), keeping the "first", "last" or "none" of each."""
+    duplicated = index_for(df, subset).duplicated(keep, frame=df)
+    cleaned = df[~duplicated].reset_index(drop=True)
+    carry(df, cleaned, rows=duplicated)
+    return cleaned
 
 # 🔡 Standardize Text
-def standardize_text(df, column):
-    """Standardize text in a column (lowercase, trimmed)."""
-    df[column] = df[column].astype(str).str.lower().str.strip()
-    return df
+def _normalize_text(values, lowercase=True, unicode_form=None, collapse_whitespace=False, strip_accents=False):
+    """Normalize a Series of distinct non-null values."""
+    text = values.astype(str)
+    if unicode_form:
+        text = text.str.normalize(unicode_form)
+    if strip_accents:
+        text = text.str.normalize("NFKD").map(lambda value: "".join(c for c in value if not unicodedata.combining(c)))
+        text = text.str.normalize(unicode_form or "NFC")
+    if lowercase:
+        text = text.str.lower()
+    if collapse_whitespace:
+        return text.str.split().str.join(" ")
+    return text.str.strip()
+
+def _standardize_column(series, normalize):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Normalize the categories and merge the ones that become equal
+        normalized = map_series(normalize, pd.Series(series.cat.categories.astype(object)))
+        new_codes, categories = pd.factorize(normalized)
+        codes = series.cat.codes.to_numpy()
+        return pd.Series(pd.Categorical.from_codes(np.where(codes >= 0, new_codes[codes], -1), categories=categories),
+                         index=series.index, name=series.name)
+
+    # Each distinct value is normalized once and mapped back through its code
+    codes, uniques = pd.factorize(series)
+    normalized = map_series(normalize, pd.Series(np.asarray(uniques, dtype=object))).to_numpy(dtype=object)
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        # String arrays take by code natively; code -1 becomes the dtype's missing value
+        values = pd.array(normalized, dtype=series.dtype).take(codes, allow_fill=True)
+    else:
+        values = np.append(normalized, None)[codes]
+        missing = codes < 0
+        if missing.any():
+            values[missing] = series.to_numpy()[missing]  # nulls keep their original value
+    return pd.Series(values, index=series.index, name=series.name, dtype=object if series.dtype == object else None)
+
+@instrumented()
+def standardize_text(df, column, lowercase=True, unicode_form=None, collapse_whitespace=False, strip_accents=False):
+    """Standardize text in a column or list of columns (lowercase, trimmed).
+
+    Opt in to more: ``unicode_form`` ("NFC", "NFKC", ...) unifies equivalent
+    characters, ``collapse_whitespace`` turns inner runs of whitespace into one
+    space and ``strip_accents`` folds "café" to "cafe". Work happens once per
+    distinct value; missing values stay missing and categoricals stay categorical.
+    """
+    columns = list(column) if pd.api.types.is_list_like(column) else [column]
+    normalize = functools.partial(_normalize_text, lowercase=lowercase, unicode_form=unicode_form,
+                                  collapse_whitespace=collapse_whitespace, strip_accents=strip_accents)
+    cleaned = df.copy(deep=False)
+    for col in columns:
+        cleaned[col] = _standardize_column(df[col], normalize)
+    carry(df, cleaned, columns=columns)
+    return cleaned
+
+# 🧬 Merge Near-Duplicate Text
+@instrumented()
+def merge_near_duplicates(df, column, threshold=0.8):
+    """Replace near-identical spellings in a text column with the most common spelling of their group.
+
+    Groups come from ``near_duplicate_groups`` (MinHash similarity of character
+    trigrams >= ``threshold``); missing values stay missing.
+    """
+    series = df[column]
+    groups = near_duplicate_groups(series, threshold=threshold)
+    present = groups.to_numpy() >= 0
+    counts = pd.DataFrame({"group": groups[present], "value": series[present]}).value_counts()
+    canonical = counts.reset_index().drop_duplicates("group").set_index("group")["value"]
+    merged = df.copy(deep=False)
+    values = series.copy()
+    values[present] = canonical.reindex(groups[present]).to_numpy()
+    merged[column] = values
+    carry(df, merged, columns=[column])
+    return merged
 
 # 🔠 Fix Column Names
+@instrumented()
 def fix_column_names(df):
     """Fix column names (lowercase, underscores)."""
-    df.columns = df.columns.str.lower().str.replace(' ', '_')
-    return df
+    fixed = df.copy(deep=False)
+    fixed.columns = df.columns.str.lower().str.replace(' ', '_')
+    carry(df, fixed, rename=dict(zip(df.columns, fixed.columns)))
+    return fixed
 
 # 🔢 Convert Column Types (Safe Conversion)
+def _to_numeric(series):
+    return pd.to_numeric(series, errors='coerce')
+
+def _parse_numbers(series):
+    """Parse text to numbers, across worker processes for large text columns."""
+    if pd.api.types.is_numeric_dtype(series):
+        return _to_numeric(series)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    return map_series(_to_numeric, series)
+
+@instrumented()
 def convert_column_types(df, column, dtype):
     """Convert a column to a specific data type safely."""
     try:
+        converted = df.copy(deep=False)
         if dtype == "Integer":
-            df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+            converted[column] = _parse_numbers(df[column]).astype('Int64')
         elif dtype == "Float":
-            df[column] = pd.to_numeric(df[column], errors='coerce').astype(float)
+            converted[column] = _parse_numbers(df[column]).astype(float)
         elif dtype == "String":
-            df[column] = df[column].astype(str)
-        return df
+            converted[column] = df[column].astype(str)
+        carry(df, converted, columns=[column])
+        return converted
     except Exception as e:
         print(f"❌ Error converting '{column}' to {dtype}: {e}")
         return df
 
-# 📉 Remove Outliers (Z-Score)
-def remove_outliers(df, column):
-    """Remove outliers from a numeric column using Z-score method."""
-    if column not in df.columns:
-        print(f"❌ Column '{column}' not found!")
+# 📉 Remove Outliers (Z-Score, MAD or IQR)
+@instrumented()
+def remove_outliers(df, column, method="zscore", threshold=None, rows=None):
+    """Remove rows with outliers in a numeric column (or a list of columns).
+
+    ``method`` is "zscore" (default, |z| >= 3), "mad" or "iqr" (see
+    ``scrubpy.outliers``); missing values are never outliers. ``rows`` is a
+    precomputed outlier row mask, e.g. from the profiler.
+    """
+    columns = list(column) if pd.api.types.is_list_like(column) else [column]
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        print(f"❌ Column '{missing[0]}' not found!")
         return df
 
-    if df[column].dtype not in ["int64", "float64"]:
-        print(f"⚠️ Column '{column}' is not numeric! Skipping outlier removal.")
+    numeric = numeric_columns(df, columns)
+    for col in columns:
+        if col not in numeric:
+            print(f"⚠️ Column '{col}' is not numeric! Skipping outlier removal.")
+    if not numeric:
         return df
 
-    df["z_score"] = zscore(df[column].dropna())  # Compute Z-scores
-    df = df[df["z_score"].abs() < 3]  # Keep only data within 3 standard deviations
-    df.drop(columns=["z_score"], inplace=True)  # Remove temp column
-    return df
+    if rows is None:
+        rows = outlier_rows(df, numeric, method=method, threshold=threshold)
+    cleaned = df[~rows].reset_index(drop=True)
+    carry(df, cleaned, rows=rows)
+    return cleaned
 
 # 💾 Save Dataset (Smart Versioning)
-def save_dataset(df, dataset):
-    """Save the cleaned dataset with a versioned filename."""
-    base_name = f"cleaned_{dataset}"
+@instrumented()
+def save_dataset(df, dataset, fmt="csv", compression=None):
+    """Save the cleaned dataset with a versioned filename.
+
+    ``fmt`` is "csv", "parquet" or "feather"; columnar formats are zstd-compressed by default.
+    """
+    extension = EXTENSIONS[fmt]
+    stem = os.path.splitext(os.path.basename(dataset))[0]
+    base_name = f"cleaned_{stem}"
     counter = 1
-    file_name = base_name
+    file_name = base_name + extension
 
     while os.path.exists(file_name):
-        file_name = f"{base_name.split('.')[0]}_{counter}.csv"
+        file_name = f"{base_name}_{counter}{extension}"
         counter += 1
 
-    df.to_csv(file_name, index=False)
+    mixed = mixed_columns(df) if fmt != "csv" else []
+    if mixed:
+        print(f"ℹ️ Columns {mixed} mix numbers and text; saving them as text.")
+    write_frame(df, file_name, fmt=fmt, compression=compression)
     print(f"✅ Cleaned data saved as {file_name}!")
     return df
@@ -0,0 +1,95 @@
+# dtypes.py - Lossless dtype optimization to shrink frames right after loading
+import re
+import numpy as np
+import pandas as pd
+
+CATEGORY_MAX_RATIO = 0.5   # use a categorical when unique values are at most this share of rows
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _optimize_numeric(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            values = series.dropna()
+            if values.empty:
+                return series
+            for dtype in ("Int8", "Int16", "Int32"):
+                info = np.iinfo(dtype.lower())
+                if info.min <= values.min() and values.max() <= info.max:
+                    return series.astype(dtype)
+            return series
+        return pd.to_numeric(series, downcast="integer")
+    if series.dtype == np.float64:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        # Only keep float32 if every value survives the round trip exactly
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            return series.astype(np.float32)
+    return series
+
+
+def _optimize_text(series, arrow_strings, dates=False):
+    values = series.dropna()
+    if values.empty:
+        return series
+    kinds = set(map(type, values.head(1000))) | set(map(type, values.sample(min(len(values), 1000), random_state=0)))
+    if kinds <= {bool, np.bool_}:
+        if values.map(type).isin([bool, np.bool_]).all():
+            return series.astype("boolean")
+        return series
+    if kinds != {str}:
+        return series
+    uniques = values.unique()
+    if dates and all(isinstance(value, str) and _ISO_DATE.match(value) for value in uniques[:1000]):
+        parsed = pd.to_datetime(series, errors="coerce", format="ISO8601")
+        if parsed.notna().sum() == len(values):
+            return parsed
+    if len(uniques) <= CATEGORY_MAX_RATIO * len(series):
+        return series.astype("category")
+    if arrow_strings and series.dtype == object and values.map(type).eq(str).all():
+        return series.astype("string[pyarrow]")
+    return series
+
+
+# 🗜️ Optimize DataFrame dtypes
+def optimize_dtypes(df, categories=True, arrow_strings=None, dates=False):
+    """Return ``(optimized_df, report)`` with compact, lossless dtypes.
+
+    Integers are downcast, float64 becomes float32 only where every value is
+    exactly representable, text becomes categorical (low cardinality), nullable
+    booleans or Arrow-backed strings. ``dates=True`` also parses ISO date text;
+    that keeps every instant but not the original spelling, so CSV output
+    writes e.g. "2020-01-01T10:00" back as "2020-01-01 10:00:00". ``report``
+    holds the memory before/after and each column's dtype change.
+    """
+    if arrow_strings is None:
+        arrow_strings = _has_pyarrow()
+    before = int(df.memory_usage(deep=True).sum())
+    optimized = df.copy(deep=False)
+    changes = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series):
+            new = _optimize_numeric(series)
+        elif series.dtype == object or pd.api.types.is_string_dtype(series):
+            new = _optimize_text(series, arrow_strings, dates)
+            if not categories and isinstance(new.dtype, pd.CategoricalDtype):
+                new = series
+        else:
+            new = series
+        if new.dtype != series.dtype:
+            optimized[col] = new
+            changes[col] = (str(series.dtype), str(new.dtype))
+    after = int(optimized.memory_usage(deep=True).sum())
+    report = {"memory_before": before, "memory_after": after, "saved": before - after, "changes": changes}
+    return optimized, report
@@ -0,0 +1,76 @@
+# export_profiling_report.py - Write the profiling report as a plain-text file
+import os
+from datetime import datetime
+from scrubpy.profiling import DataProfiler, suggest_wide
+from scrubpy.outliers import outlier_mask
+
+
+def export_profiling_report(df, dataset_name="dataset", profiler=None, output_dir="."):
+    """Write a text profiling report for ``df`` and return its path.
+
+    Pass the session's ``profiler`` to reuse statistics it already computed.
+    """
+    profiler = profiler if profiler is not None and profiler.df is df else DataProfiler(df, wide=suggest_wide(df))
+    stats = profiler.stats()
+    overview = profiler.dataset_overview()
+    stem = os.path.splitext(os.path.basename(str(dataset_name)))[0]
+    filename = os.path.join(output_dir, f"{stem}_profiling_report.txt")
+
+    lines = [
+        "=" * 30,
+        "🧼 SCRUBPY PROFILING REPORT",
+        f"📁 Dataset: {dataset_name}",
+        f"🕒 Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "=" * 30,
+        "",
+        "📊 Dataset Overview",
+        "-" * 40,
+        f"- Total Rows              : {overview['Total Rows']}",
+        f"- Total Columns           : {overview['Total Columns']}",
+        f"- Memory Usage (KB)       : {overview['Memory Usage (KB)']:.2f}",
+        "- Column Types:",
+    ]
+    lines += [f"    {col}: {dtype}" for col, dtype in profiler.data_types_summary().items()]
+
+    missing = stats["missing"]
+    lines += ["", "🚨 Missing Value Analysis", "-" * 40,
+              f"- Total Missing Cells     : {int(missing.sum())}"]
+    rows = max(len(df), 1)
+    lines += [f"    {col}: {int(count)} missing ({count / rows * 100:.2f}%)" for col, count in missing.items() if count]
+
+    lines += ["", "♻️ Duplicate Rows", "-" * 40, f"- Total Duplicates Found  : {profiler.duplicate_report()['Duplicate Rows']}"]
+
+    numeric = stats["numeric"]
+    if len(numeric):
+        z_outliers = (stats["outlier_mask"].sum() if "outlier_mask" in stats
+                      else outlier_mask(df, list(numeric.index)).sum())
+        iqr_outliers = outlier_mask(df, list(numeric.index), method="iqr").sum()
+        skew = df[list(numeric.index)].skew()
+        lines += ["", "📈 Statistical Summary (Numeric Columns)", "-" * 40]
+        for col, row in numeric.iterrows():
+            lines.append(f"- {col} => Mean: {row['mean']:.2f}, Median: {row['50%']:.2f}, Std: {row['std']:.2f}, "
+                         f"Skewness: {skew[col]:.2f}, Z-Outliers: {int(z_outliers[col])}, "
+                         f"IQR-Outliers: {int(iqr_outliers[col])}")
+
+        if profiler.is_wide():
+            lines += ["", "🔗 Strongest Correlations", "-" * 40]
+            lines += [f"- {a} ~ {b}: {value:.2f}" for a, b, value in profiler.correlation_pairs().itertuples(index=False)]
+        else:
+            lines += ["", "🔗 Correlation Matrix", "-" * 40]
+            correlation = profiler.correlation_matrix()
+            lines += [f"- {a} ~ {b}: {value:.2f}" for a, row in correlation.items() for b, value in row.items() if a < b]
+
+    categorical = profiler.categorical_summary()
+    if categorical:
+        lines += ["", "🔤 Text Column Summary", "-" * 40]
+        for col, info in categorical.items():
+            top = next(iter(info["Most Common"]), None)
+            lines.append(f"- {col}: Unique={info['Unique Values']}, Most Common='{top}'")
+
+    lines += ["", "🧹 Cleaning Recommendations", "-" * 40]
+    lines += [f"- {suggestion}" for suggestion in profiler.suggest_cleaning_actions()]
+
+    with open(filename, "w", encoding="utf-8") as handle:
+        handle.write("\n".join(lines) + "\n")
+    print(f"✅ Profiling report saved to '{filename}'")
+    return filename
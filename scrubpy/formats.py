@@ -0,0 +1,145 @@
+# formats.py - Format detection and readers/writers for CSV, Parquet and Arrow IPC/Feather
+import os
+import operator
+import pandas as pd
+
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet", ".pq": "parquet",
+    ".feather": "feather", ".arrow": "feather", ".ipc": "feather",
+}
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+DEFAULT_COMPRESSION = {"csv": None, "parquet": "zstd", "feather": "zstd"}
+
+_OPERATORS = {
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "in": lambda column, values: column.isin(values),
+    "not in": lambda column, values: ~column.isin(values),
+}
+
+
+def _require_pyarrow(fmt):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"Reading or writing {fmt} files needs pyarrow (pip install pyarrow)")
+
+
+def detect_format(filepath):
+    """Guess the format from the extension, falling back to the file's magic bytes."""
+    fmt = FORMATS.get(os.path.splitext(str(filepath))[1].lower())
+    if fmt:
+        return fmt
+    with open(filepath, "rb") as handle:
+        magic = handle.read(6)
+    if magic[:4] == b"PAR1":
+        return "parquet"
+    if magic == b"ARROW1":
+        return "feather"
+    return "csv"
+
+
+def apply_filters(df, filters):
+    """Apply pyarrow-style DNF filters (list of (column, op, value), or a list of such lists)."""
+    if not filters:
+        return df
+    groups = filters if isinstance(filters[0], list) else [filters]
+    keep = pd.Series(False, index=df.index)
+    for group in groups:
+        match = pd.Series(True, index=df.index)
+        for column, op, value in group:
+            match &= _OPERATORS[op](df[column], value).fillna(False).astype(bool)
+        keep |= match
+    return df[keep]
+
+
+def read_frame(filepath, columns=None, filters=None, memory_map=False, chunksize=None, dtype=None):
+    """Read any supported format, projecting ``columns`` and pushing ``filters`` down where possible.
+
+    Parquet filters skip whole row groups using their statistics; CSV filters are
+    applied after parsing. With ``chunksize`` an iterator of frames is returned.
+    ``dtype`` (a column -> dtype map) fixes CSV column types; columnar formats
+    carry their own schema and ignore it.
+    """
+    fmt = detect_format(filepath)
+    if fmt == "csv":
+        usecols = columns
+        if columns is not None and filters:
+            # Filter columns must be parsed even when they aren't projected
+            groups = filters if isinstance(filters[0], list) else [filters]
+            usecols = list(dict.fromkeys(list(columns) + [column for group in groups for column, _, _ in group]))
+
+        def finish(frame):
+            frame = apply_filters(frame, filters)
+            return frame if columns is None else frame[list(columns)]
+
+        if chunksize:
+            chunks = pd.read_csv(filepath, usecols=usecols, dtype=dtype, chunksize=chunksize)
+            return (finish(chunk) for chunk in chunks)
+        return finish(pd.read_csv(filepath, usecols=usecols, dtype=dtype))
+
+    _require_pyarrow(fmt)
+    if chunksize:
+        return _iter_arrow(filepath, fmt, columns, filters, chunksize)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(filepath, columns=columns, filters=filters, memory_map=memory_map)
+    elif filters:
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        table = ds.dataset(filepath, format="ipc").to_table(columns=columns, filter=pq.filters_to_expression(filters))
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(filepath, columns=columns, memory_map=memory_map)
+    return table.to_pandas()
+
+
+def _iter_arrow(filepath, fmt, columns, filters, chunksize):
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    dataset = ds.dataset(filepath, format="parquet" if fmt == "parquet" else "ipc")
+    expression = pq.filters_to_expression(filters) if filters else None
+    for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=chunksize):
+        yield batch.to_pandas()
+
+
+def mixed_columns(df):
+    """Object columns holding values of more than one type (e.g. numbers and text), which Arrow can't type."""
+    mixed = []
+    for col in df.columns:
+        # Ints mixed with floats are fine: Arrow stores them as float64
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) in ("mixed", "mixed-integer"):
+            mixed.append(col)
+    return mixed
+
+
+def stringify_mixed(df):
+    """Copy of ``df`` with its mixed-type object columns stored as text (missing values stay missing)."""
+    mixed = mixed_columns(df)
+    if not mixed:
+        return df
+    converted = df.copy(deep=False)
+    for col in mixed:
+        converted[col] = df[col].astype("str")
+    return converted
+
+
+def write_frame(df, filepath, fmt=None, compression=None):
+    """Write ``df`` as CSV, Parquet or Feather; columnar formats default to zstd compression.
+
+    Columnar formats need one type per column, so mixed-type object columns are written as text.
+    """
+    fmt = fmt or FORMATS.get(os.path.splitext(str(filepath))[1].lower(), "csv")
+    compression = compression or DEFAULT_COMPRESSION[fmt]
+    if fmt != "csv":
+        df = stringify_mixed(df)
+    if fmt == "csv":
+        df.to_csv(filepath, index=False, compression=compression)
+    elif fmt == "parquet":
+        _require_pyarrow(fmt)
+        df.to_parquet(filepath, index=False, compression=compression)
+    else:
+        _require_pyarrow(fmt)
+        df.reset_index(drop=True).to_feather(filepath, compression=compression)
+    return filepath
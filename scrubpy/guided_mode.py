@@ -1,6 +1,7 @@
 from rich.console import Console
 from InquirerPy import inquirer
 from scrubpy.core import drop_missing_values, fill_missing_values, remove_duplicates
+from scrubpy.row_hash import duplicate_count
 
 console = Console()
 
@@ -24,7 +25,7 @@ def run_guided_mode(df):
             console.print("🧹 Dropped rows with missing values.")
 
     # Handling Duplicates
-    if df.duplicated().sum() > 0:
+    if duplicate_count(df) > 0:
         duplicate_option = inquirer.confirm("♻️ Remove duplicate rows?").execute()
         if duplicate_option:
             df = remove_duplicates(df)
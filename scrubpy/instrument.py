@@ -0,0 +1,198 @@
+# instrument.py - Per-operation timing, memory and shape records for cleaning sessions
+import os
+import json
+import time
+import functools
+import threading
+import tracemalloc
+import contextlib
+
+_active = None  # the Recorder of the running profile_session, if any
+
+
+def _shape(value):
+    """(rows, columns) of a frame, or of the first frame in a tuple result; else None."""
+    if isinstance(value, tuple):
+        return next((shape for shape in map(_shape, value) if shape), None)
+    shape = getattr(value, "shape", None)
+    if isinstance(shape, tuple) and len(shape) == 2:
+        return shape
+    return None
+
+
+class Recorder:
+    """Collects one event per instrumented call.
+
+    Each event holds the operation name, wall and CPU seconds, the peak memory
+    it allocated above what was in use when it started (when ``memory`` is on),
+    the rows/columns of its input and output frames and its nesting depth.
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.events = []
+        self._stack = []  # [started memory, highest peak of finished children] per open call
+        self._origin = time.perf_counter()
+
+    def __len__(self):
+        return len(self.events)
+
+    @classmethod
+    def from_events(cls, events):
+        """A recorder holding events gathered elsewhere (e.g. by batch workers)."""
+        recorder = cls(memory=False)
+        recorder.events = list(events)
+        return recorder
+
+    def _enter(self):
+        if not self.memory:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)  # keep the parent's peak before resetting it
+        tracemalloc.reset_peak()
+        self._stack.append([current, 0])
+
+    def _exit(self):
+        if not self.memory:
+            return None
+        started, children = self._stack.pop()
+        peak = max(tracemalloc.get_traced_memory()[1], children)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        return max(peak - started, 0)
+
+    @contextlib.contextmanager
+    def track(self, name, df=None):
+        """Record the block as operation ``name``; ``df`` is its input frame."""
+        shape_in = _shape(df)
+        event = {"name": name, "start": time.perf_counter() - self._origin, "depth": len(self._stack),
+                 "pid": os.getpid(), "tid": threading.get_ident(),
+                 "rows_in": shape_in[0] if shape_in else None, "cols_in": shape_in[1] if shape_in else None,
+                 "rows_out": None, "cols_out": None}
+        self._enter()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield event
+        finally:
+            event["wall_seconds"] = time.perf_counter() - wall
+            event["cpu_seconds"] = time.process_time() - cpu
+            peak = self._exit()
+            event["peak_mb"] = None if peak is None else round(peak / 2 ** 20, 3)
+            self.events.append(event)
+
+    # 📊 Views
+    def summary(self):
+        """Totals per operation name, slowest first: {name: {calls, wall, cpu, peak_mb}}."""
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(event["name"], {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                                                      "peak_mb": None})
+            total["calls"] += 1
+            total["wall_seconds"] += event["wall_seconds"]
+            total["cpu_seconds"] += event["cpu_seconds"]
+            if event["peak_mb"] is not None:
+                total["peak_mb"] = max(total["peak_mb"] or 0.0, event["peak_mb"])
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["wall_seconds"]))
+
+    def table(self, title="⏱️ Operation Profile"):
+        """Rich table of every call in order, indented by nesting."""
+        from rich.table import Table
+        table = Table(title=title)
+        for column in ("Operation", "Wall (s)", "CPU (s)", "Peak MB", "Rows In", "Rows Out", "Cols In", "Cols Out"):
+            table.add_column(column)
+        show = lambda value: "-" if value is None else str(value)  # noqa: E731
+        for event in sorted(self.events, key=lambda event: (event["pid"], event["start"])):
+            table.add_row("  " * event["depth"] + event["name"], f"{event['wall_seconds']:.4f}",
+                          f"{event['cpu_seconds']:.4f}", show(event["peak_mb"]),
+                          show(event["rows_in"]), show(event["rows_out"]),
+                          show(event["cols_in"]), show(event["cols_out"]))
+        return table
+
+    # 💾 Export
+    def to_json(self, path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"events": self.events, "summary": self.summary()}, handle, indent=2)
+        return path
+
+    def to_chrome_trace(self, path):
+        """Write the events in Chrome trace format (open in chrome://tracing or Perfetto)."""
+        trace = [{"name": event["name"], "cat": event["name"].split(".")[0], "ph": "X",
+                  "ts": event["start"] * 1e6, "dur": event["wall_seconds"] * 1e6,
+                  "pid": event["pid"], "tid": event["tid"],
+                  "args": {key: event[key] for key in ("cpu_seconds", "peak_mb", "rows_in", "rows_out",
+                                                       "cols_in", "cols_out")}}
+                 for event in self.events]
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, handle)
+        return path
+
+    def save(self, path):
+        """Chrome trace for ``*.trace.json`` / ``*.trace``, plain JSON otherwise."""
+        if path.endswith((".trace.json", ".trace")):
+            return self.to_chrome_trace(path)
+        return self.to_json(path)
+
+
+# 🎛️ Switching It On
+@contextlib.contextmanager
+def profile_session(memory=True, recorder=None):
+    """Record every instrumented call made inside the block::
+
+        with profile_session() as recorder:
+            df = remove_duplicates(df)
+        console.print(recorder.table())
+
+    Memory tracking runs tracemalloc, which slows Python-level allocation;
+    pass ``memory=False`` for timings only.
+    """
+    global _active
+    previous, recorder = _active, recorder or Recorder(memory=memory)
+    started_tracing = recorder.memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _active = recorder
+    try:
+        yield recorder
+    finally:
+        _active = previous
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def active():
+    """The recorder of the running profile_session, or None."""
+    return _active
+
+
+def track(name, df=None):
+    """Context manager recording a block as ``name`` when a session is active (a no-op otherwise)."""
+    return _active.track(name, df) if _active is not None else contextlib.nullcontext({})
+
+
+def instrumented(name=None):
+    """Decorator recording each call while a profile_session is active.
+
+    The input shape is read from the first argument that is a frame (so methods
+    of objects holding ``.df`` work too) and the output shape from the result.
+    Outside a session the wrapper only checks one global.
+    """
+    def decorate(func):
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _active
+            if recorder is None:
+                return func(*args, **kwargs)
+            source = next((arg for arg in args if _shape(arg)), None)
+            if source is None and args:
+                source = getattr(args[0], "df", None)
+            with recorder.track(label, source) as event:
+                result = func(*args, **kwargs)
+                shape_out = _shape(result)
+                if shape_out:
+                    event["rows_out"], event["cols_out"] = shape_out
+                return result
+        return wrapper
+    return decorate
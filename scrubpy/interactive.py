@@ -0,0 +1,358 @@
+# interactive.py - The interactive cleaning session behind 'scrubpy clean'
+import typer
+from rich.console import Console
+from InquirerPy import inquirer
+from InquirerPy.base.control import Choice
+import os
+from scrubpy.core import (
+    load_dataset, get_dataset_summary, format_summary, drop_missing_values, fill_missing_values,
+    remove_duplicates, standardize_text, fix_column_names, convert_column_types,
+    remove_outliers, save_dataset, merge_near_duplicates
+)
+from scrubpy.preview import preview_summary
+from scrubpy.profiling import DataProfiler, suggest_wide
+from scrubpy.undo import history
+from scrubpy.pipeline import CleaningPipeline
+from scrubpy.formats import FORMATS
+from scrubpy.dtypes import optimize_dtypes
+from scrubpy.row_hash import index_for, carry
+from scrubpy.outliers import numeric_columns, outlier_rows
+from scrubpy.cache import DatasetCache
+from scrubpy.export_profiling_report import export_profiling_report
+
+console = Console()
+profiler = None  # 📋 Kept between menu visits so profile statistics are computed once
+dataset_cache = None  # 🗄️ On-disk cache, unless --no-cache
+source = None  # (frame, dataset, load options) as loaded, before any cleaning
+pending = None  # (frame, change) recorded by save_previous_state, applied to the profiler by follow_change
+
+# 🎨 Banner
+def show_banner():
+    console.print("\n[bold cyan]🔥 ScrubPy - The Smartest Data Cleaner 🔥[/bold cyan]")
+    console.print("[italic dim]Make your data shine in seconds![/italic dim]\n")
+
+# 📂 Choose Dataset
+def choose_dataset():
+    files = sorted(f for f in os.listdir() if os.path.splitext(f)[1].lower() in FORMATS)
+    if not files:
+        console.print("[bold red]❌ No CSV, Parquet or Feather files found in the current directory![/bold red]")
+        raise typer.Exit()
+
+    dataset = inquirer.select(
+        message="📂 Choose a dataset to clean:",
+        choices=files,
+        default=files[0]
+    ).execute()
+
+    return dataset
+
+# 🔄 Store Previous State (for Undo)
+def save_previous_state(df, rows=None, columns=None, rename=False):
+    """Save what the next change will touch (dropped rows, changed columns or names)."""
+    global pending
+    history.save_state(df, rows=rows, columns=columns, rename=rename)
+    pending = (df, {"rows": rows, "columns": columns, "rename": rename})
+
+def follow_change(df):
+    """Patch the shared profiler's statistics with the change saved for the frame ``df`` replaced."""
+    global pending
+    if pending is not None and profiler is not None and profiler.df is pending[0] and df is not pending[0]:
+        profiler.advance(df, **pending[1])
+    pending = None
+
+# 📋 Shared Profiler
+def get_profiler(df, approximate=False):
+    """Return the cached profiler for ``df``, creating one when the frame was replaced."""
+    global profiler
+    if profiler is None or profiler.df is not df or profiler.approximate != approximate:
+        profiler = DataProfiler(df, approximate=approximate, wide=suggest_wide(df))
+        if dataset_cache is not None and source is not None and source[0] is df:
+            stats = dataset_cache.load_profile(source[1], approximate=approximate, **source[2])
+            if stats is not None:
+                profiler.restore(stats)
+    return profiler
+
+def remember_profile(profiler):
+    """Store the profile of the untouched dataset so the next session can skip profiling."""
+    if dataset_cache is not None and source is not None and source[0] is profiler.df:
+        dataset_cache.store_profile(source[1], profiler.stats(), approximate=profiler.approximate, **source[2])
+
+def cached_profile(df):
+    """Statistics already computed for ``df`` by the shared profiler, or None."""
+    return profiler.cached_stats() if profiler is not None and profiler.df is df else None
+
+# 📊 Summary
+def show_summary(df):
+    """Print the dataset summary, from the profiler's statistics when they are up to date."""
+    stats = cached_profile(df)
+    if stats is None:
+        console.print(get_dataset_summary(df))
+        return
+    console.print(format_summary(df.shape[0], df.shape[1], int(stats["missing"].sum()), stats["duplicates"],
+                                 stats["memory"]))
+
+# 🔍 Preview
+def show_preview(df, action, exact=False, **kwargs):
+    """Print the estimated (or, with ``exact``, computed) summary after ``action``."""
+    stats = cached_profile(df)
+    console.print("[bold cyan]🔍 Preview:[/bold cyan]")
+    console.print(preview_summary(df, action, exact=exact, stats=stats, **kwargs))
+
+# 💤 Lazy Mode
+def record_lazy_step(pipeline, action):
+    """Queue a menu action on the pending plan instead of running it. Returns False if it can't be queued."""
+    columns = list(pipeline.columns)
+    if action == "🚮 Handle Missing Values":
+        missing_choice = inquirer.select(
+            message="How do you want to handle missing values?",
+            choices=["❌ Drop Rows with Missing Values", "📝 Fill Missing Values (Recommended)", "⬅️ Cancel"],
+        ).execute()
+        if missing_choice == "❌ Drop Rows with Missing Values":
+            pipeline.drop_missing()
+        elif missing_choice == "📝 Fill Missing Values (Recommended)":
+            pipeline.fill_missing(inquirer.text(message="Enter a value to fill missing cells:").execute())
+        else:
+            return True
+    elif action == "🗑️ Remove Duplicates":
+        pipeline.remove_duplicates()
+    elif action == "🔡 Standardize Text":
+        pipeline.standardize_text(inquirer.select(message="📌 Choose a column:", choices=columns).execute())
+    elif action == "🧬 Merge Near-Duplicate Text":
+        pipeline.merge_near_duplicates(inquirer.select(message="📌 Choose a column:", choices=columns).execute())
+    elif action == "🔠 Fix Column Names":
+        pipeline.fix_column_names()
+    elif action == "🔢 Convert Column Types":
+        col = inquirer.select(message="📌 Choose a column:", choices=columns).execute()
+        dtype = inquirer.select(message="🔢 Convert to:", choices=["Integer", "Float", "String"]).execute()
+        pipeline.convert_column_types(col, dtype)
+    elif action == "📉 Remove Outliers":
+        col = inquirer.select(message="📌 Choose a column:", choices=columns).execute()
+        method = inquirer.select(message="📏 Detect outliers with:", choices=["zscore", "mad", "iqr"]).execute()
+        pipeline.remove_outliers(col, method=method)
+    elif action == "↩️ Undo Last Change" and len(pipeline):
+        console.print(f"[bold green]↩️ Removed pending step {pipeline.undo()!r}[/bold green]")
+        return True
+    else:
+        return False
+    console.print(f"[bold cyan]⏳ Queued. Pending plan (optimized):[/bold cyan]\n{pipeline.explain()}")
+    return True
+
+# 🧹 Cleaning Menu
+def clean_data(df, dataset, approximate=False, lazy=False, exact_preview=False, output_format="csv"):
+    pipeline = CleaningPipeline(df) if lazy else None
+    while True:
+        action = inquirer.select(
+            message="🛠️ Choose a cleaning operation:",
+            choices=[
+                "📊 View Data Summary",
+                "📋 Profile My Dataset",
+                "🚮 Handle Missing Values",
+                "🗑️ Remove Duplicates",
+                "🔡 Standardize Text",
+                "🧬 Merge Near-Duplicate Text",
+                "🔠 Fix Column Names",
+                "🔢 Convert Column Types",
+                "📉 Remove Outliers",
+                "↩️ Undo Last Change",
+                "💾 Save & Exit"
+            ],
+        ).execute()
+
+        if pipeline is not None:
+            if action in ("📊 View Data Summary", "📋 Profile My Dataset", "💾 Save & Exit") and len(pipeline):
+                df = pipeline.collect()  # run the pending plan once, then keep recording on the result
+                pipeline = CleaningPipeline(df)
+            elif record_lazy_step(pipeline, action):
+                continue
+
+        if action == "📊 View Data Summary":
+            console.clear()
+            show_summary(df)
+
+        elif action == "📋 Profile My Dataset":
+            profiler = get_profiler(df, approximate=approximate)
+            profiler.display_rich_summary()
+            remember_profile(profiler)
+            recommend = inquirer.confirm("Would you like ScrubPy to suggest cleaning actions?").execute()
+            if recommend:
+                issues = profiler.suggest_cleaning_actions()
+                console.print("\n[bold cyan]🔎 Cleaning Recommendations:[/bold cyan]")
+                for issue in issues:
+                    console.print(f"- {issue}")
+
+            export = inquirer.confirm("📝 Export this profiling report to .txt?").execute()
+            if export:
+                export_profiling_report(df, dataset_name=dataset, profiler=profiler)
+                console.print("[bold green]✅ Profiling report exported successfully![/bold green]")
+
+        elif action == "🚮 Handle Missing Values":
+            missing_percentage = (df.isnull().sum().sum() / df.size) * 100
+            console.print(f"⚠️ [bold yellow]Warning:[/bold yellow] {missing_percentage:.2f}% of data is missing.")
+
+            missing_choice = inquirer.select(
+                message="How do you want to handle missing values?",
+                choices=[
+                    "❌ Drop Rows with Missing Values",
+                    "📏 Drop Columns with > X% Missing Values",
+                    "📝 Fill Missing Values (Recommended)",
+                    "⬅️ Cancel"
+                ],
+            ).execute()
+
+            if missing_choice == "❌ Drop Rows with Missing Values":
+                show_preview(df, "drop_missing", exact=exact_preview)
+                confirm = inquirer.confirm("Do you want to proceed?").execute()
+                if confirm:
+                    dropped = df.isnull().any(axis=1)
+                    cleaned = drop_missing_values(df)
+                    if len(cleaned) != len(df):  # the user can still back out inside drop_missing_values
+                        save_previous_state(df, rows=dropped)
+                        df = cleaned
+                        follow_change(df)
+                        console.print("[bold yellow]🧹 Missing values removed![/bold yellow]")
+
+            elif missing_choice == "📏 Drop Columns with > X% Missing Values":
+                threshold = float(inquirer.text("Enter threshold percentage (e.g., 50 for 50%)").execute())
+                cols_to_drop = df.columns[df.isnull().mean() * 100 > threshold]
+                if cols_to_drop.empty:
+                    console.print("[bold red]No columns have that much missing data![/bold red]")
+                else:
+                    console.print(f"[bold cyan]🔍 Preview: Dropping columns {list(cols_to_drop)}[/bold cyan]")
+                    confirm = inquirer.confirm("Do you want to proceed?").execute()
+                    if confirm:
+                        save_previous_state(df, columns=cols_to_drop)
+                        remaining = df.drop(columns=cols_to_drop)
+                        carry(df, remaining, dropped=cols_to_drop)
+                        df = remaining
+                        follow_change(df)
+                        console.print(f"[bold yellow]📏 Dropped columns {list(cols_to_drop)}![/bold yellow]")
+
+            elif missing_choice == "📝 Fill Missing Values (Recommended)":
+                fill_value = inquirer.text(message="Enter a value to fill missing cells:").execute()
+                show_preview(df, "fill_missing", exact=exact_preview, fill_value=fill_value)
+                confirm = inquirer.confirm("Do you want to proceed?").execute()
+                if confirm:
+                    save_previous_state(df, columns=df.columns[df.isnull().any()])
+                    df = fill_missing_values(df, fill_value)
+                    follow_change(df)
+                    console.print(f"[bold yellow]🖊️ Filled missing values with '{fill_value}'![/bold yellow]")
+
+        elif action == "🗑️ Remove Duplicates":
+            show_preview(df, "remove_duplicates", exact=exact_preview)
+            confirm = inquirer.confirm("Do you want to proceed?").execute()
+            if confirm:
+                save_previous_state(df, rows=index_for(df).duplicated(frame=df))
+                df = remove_duplicates(df)
+                follow_change(df)
+                console.print("[bold yellow]♻️ Duplicates removed![/bold yellow]")
+
+        elif action == "🔡 Standardize Text":
+            col = inquirer.select(message="📌 Choose a column:", choices=list(df.columns)).execute()
+            show_preview(df, "standardize_text", exact=exact_preview, column=col)
+            confirm = inquirer.confirm("Do you want to proceed?").execute()
+            if confirm:
+                save_previous_state(df, columns=[col])
+                df = standardize_text(df, col)
+                follow_change(df)
+                console.print(f"[bold yellow]🔤 Standardized text in '{col}'![/bold yellow]")
+
+        elif action == "🧬 Merge Near-Duplicate Text":
+            col = inquirer.select(message="📌 Choose a column:", choices=list(df.columns)).execute()
+            merged = merge_near_duplicates(df, col)
+            changed = ~((merged[col] == df[col]) | df[col].isna()).to_numpy()
+            if not changed.any():
+                console.print(f"[bold green]✅ No near-duplicate spellings in '{col}'.[/bold green]")
+                continue
+            examples = df[col][changed].to_frame("from").assign(to=merged[col][changed]).drop_duplicates().head(10)
+            console.print(f"[bold cyan]🔍 Preview: {int(changed.sum())} cells would change, e.g.[/bold cyan]")
+            console.print(examples.to_string(index=False))
+            confirm = inquirer.confirm("Do you want to proceed?").execute()
+            if confirm:
+                save_previous_state(df, columns=[col])
+                df = merged
+                follow_change(df)
+                console.print(f"[bold yellow]🧬 Merged near-duplicate spellings in '{col}'![/bold yellow]")
+
+        elif action == "🔠 Fix Column Names":
+            save_previous_state(df, rename=True)
+            df = fix_column_names(df)
+            follow_change(df)
+            console.print("[bold yellow]🔠 Column names fixed![/bold yellow]")
+
+        elif action == "🔢 Convert Column Types":
+            col = inquirer.select(message="📌 Choose a column:", choices=list(df.columns)).execute()
+            dtype = inquirer.select(message="🔢 Convert to:", choices=["Integer", "Float", "String"]).execute()
+            converted = convert_column_types(df, col, dtype)
+            if converted is not df:  # a failed conversion returns the frame unchanged
+                save_previous_state(df, columns=[col])
+                df = converted
+                follow_change(df)
+                console.print(f"[bold yellow]🔢 Converted '{col}' to {dtype}![/bold yellow]")
+
+        elif action == "📉 Remove Outliers":
+            numeric = numeric_columns(df)
+            if not numeric:
+                console.print("[bold red]❌ No numeric columns to check![/bold red]")
+                continue
+            col = inquirer.select(message="📌 Choose a column:", choices=numeric).execute()
+            method = inquirer.select(
+                message="📏 Detect outliers with:",
+                choices=[Choice("zscore", "Z-Score (|z| >= 3)"), Choice("mad", "Median Absolute Deviation (robust)"),
+                         Choice("iqr", "Interquartile Range (1.5 x IQR)")],
+            ).execute()
+            show_preview(df, "remove_outliers", exact=exact_preview, column=col, method=method)
+            confirm = inquirer.confirm("Do you want to proceed?").execute()
+            if confirm:
+                stats = cached_profile(df)
+                if stats is not None and method == "zscore":
+                    rows = stats["outlier_mask"][col].to_numpy()  # already computed while profiling
+                else:
+                    rows = outlier_rows(df, [col], method=method)
+                save_previous_state(df, rows=rows)
+                df = remove_outliers(df, col, method=method, rows=rows)
+                follow_change(df)
+                console.print(f"[bold yellow]📉 Removed {int(rows.sum())} outlier rows from '{col}'![/bold yellow]")
+
+        elif action == "↩️ Undo Last Change":
+            previous = history.undo(df)
+            if previous is not None:
+                df = previous
+                console.print("[bold green]↩️ Reverted to the last state![/bold green]")
+            else:
+                console.print("[bold red]❌ No previous state found![/bold red]")
+
+        elif action == "💾 Save & Exit":
+            save_dataset(df, dataset, fmt=output_format)
+            break
+
+    return df
+
+# 🚀 Interactive Session
+def start_session(approximate=False, lazy=False, exact_preview=False, output_format="csv", columns=None,
+                  optimize=True, parse_dates=False, cache=True):
+    """Pick a dataset in the current directory, load it and run the cleaning menu."""
+    global dataset_cache, source
+    show_banner()
+    dataset = choose_dataset()
+    options = {"columns": columns, "optimize": optimize, "parse_dates": parse_dates}
+    dataset_cache = DatasetCache() if cache else None
+    df = dataset_cache.load_frame(dataset, **options) if dataset_cache else None
+    if df is not None:
+        console.print("[bold green]⚡ Loaded from cache![/bold green]")
+    else:
+        df = load_dataset(dataset, columns=columns.split(",") if columns else None)
+        if df is None:
+            raise typer.Exit(code=1)
+        if optimize:
+            df, report = optimize_dtypes(df, dates=parse_dates)
+            if report["changes"]:
+                percent = report["saved"] / report["memory_before"] * 100 if report["memory_before"] else 0
+                console.print(f"[bold green]🗜️ Optimized {len(report['changes'])} column types, "
+                              f"saved {report['saved'] / 1024:.2f} KB ({percent:.1f}%)[/bold green]")
+        if dataset_cache:
+            dataset_cache.store_frame(dataset, df, **options)
+    source = (df, dataset, options)
+    show_summary(df)
+    return clean_data(df, dataset, approximate=approximate, lazy=lazy, exact_preview=exact_preview,
+                      output_format=output_format)
+
@@ -0,0 +1,135 @@
+# outliers.py - Vectorized Z-score, MAD and IQR outlier detection
+import warnings
+import numpy as np
+import pandas as pd
+
+DEFAULT_THRESHOLDS = {"zscore": 3.0, "mad": 3.5, "iqr": 1.5}
+MAD_SCALE = 0.6745  # scales the MAD of normal data to its standard deviation
+
+
+def numeric_columns(df, columns=None):
+    """The numeric, non-boolean labels among ``columns`` (every column by default)."""
+    if columns is None:
+        columns = df.columns
+    elif not pd.api.types.is_list_like(columns):
+        columns = [columns]
+    return [col for col in columns
+            if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])]
+
+
+def _values(df, columns):
+    return df[columns].to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _threshold(method, threshold):
+    if method not in DEFAULT_THRESHOLDS:
+        raise ValueError(f"Unknown outlier method: {method}")
+    return DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+
+
+def spread_limits(center, spread):
+    """``center ± spread`` per column; no spread (constant column, MAD of 0) means no outliers."""
+    flat = ~(spread > 0)
+    low = np.where(flat, -np.inf, center - spread)
+    high = np.where(flat, np.inf, center + spread)
+    return low, high
+
+
+def zscore_limits(mean, std, threshold=None):
+    """Limits for |x - mean| / std > threshold, from precomputed moments (ddof=0 std)."""
+    return spread_limits(mean, _threshold("zscore", threshold) * std)
+
+
+def outlier_bounds(values, method="zscore", threshold=None):
+    """Per-column (low, high) limits of a 2-D float array; NaNs are ignored."""
+    threshold = _threshold(method, threshold)
+    if not values.size:
+        return np.full(values.shape[1], -np.inf), np.full(values.shape[1], np.inf)
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        if method == "zscore":
+            return zscore_limits(np.nanmean(values, axis=0), np.nanstd(values, axis=0), threshold)
+        if method == "mad":
+            median = np.nanmedian(values, axis=0)
+            mad = np.nanmedian(np.abs(values - median), axis=0)
+            return spread_limits(median, threshold * mad / MAD_SCALE)
+        q1, q3 = np.nanpercentile(values, [25, 75], axis=0)
+        return q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+
+
+def limits_mask(values, low, high, inclusive=False):
+    """True where a value lies outside its column's limits (NaN never does).
+
+    ``inclusive`` also flags values exactly on a limit, as the Z-score rule |z| >= 3 does.
+    """
+    if inclusive:
+        return (values <= low) | (values >= high)
+    return (values < low) | (values > high)
+
+
+# 🎯 In-Memory Detection
+def outlier_mask(df, columns=None, method="zscore", threshold=None):
+    """Boolean frame over the numeric ``columns``: True where a value is an outlier.
+
+    ``method`` is "zscore" (|x - mean| / std >= 3), "mad" (robust z-score from
+    the median absolute deviation > 3.5) or "iqr" (beyond 1.5 IQRs from the
+    quartiles); ``threshold`` overrides those defaults. All columns are
+    handled in one matrix pass.
+    """
+    columns = numeric_columns(df, columns)
+    values = _values(df, columns)
+    low, high = outlier_bounds(values, method, threshold)
+    return pd.DataFrame(limits_mask(values, low, high, inclusive=method == "zscore"), index=df.index, columns=columns)
+
+
+def outlier_rows(df, columns=None, method="zscore", threshold=None):
+    """Boolean array marking rows with an outlier in any of ``columns``."""
+    return outlier_mask(df, columns, method, threshold).to_numpy().any(axis=1)
+
+
+# 🌊 Running Moments (for chunked data)
+class RunningMoments:
+    """Per-column count, mean and sum of squared deviations, merged chunk by chunk (Chan et al.)."""
+
+    def __init__(self, width=1):
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+
+    def update(self, values):
+        """Add a (rows, width) float block; NaNs are skipped."""
+        count = (~np.isnan(values)).sum(axis=0)
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.where(count > 0, np.nanmean(values, axis=0), 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        return self._merge(count, mean, m2)
+
+    def merge(self, other):
+        return self._merge(other.count, other.mean, other.m2)
+
+    def remove(self, other):
+        """Take out the values summarized by ``other`` (rows that were dropped); the inverse of merge."""
+        total = self.count - other.count
+        with np.errstate(all="ignore"):
+            mean = np.where(total > 0, (self.count * self.mean - other.count * other.mean) / total, 0.0)
+            delta = other.mean - mean
+            m2 = self.m2 - other.m2 - delta ** 2 * total * other.count / self.count
+            self.m2 = np.where(total > 0, np.maximum(m2, 0.0), 0.0)
+        self.mean = mean
+        self.count = np.maximum(total, 0)
+        return self
+
+    def _merge(self, count, mean, m2):
+        total = self.count + count
+        with np.errstate(all="ignore"):
+            delta = mean - self.mean
+            self.mean = np.where(total > 0, self.mean + delta * count / total, 0.0)
+            self.m2 = np.where(total > 0, self.m2 + m2 + delta ** 2 * self.count * count / total, 0.0)
+        self.count = total
+        return self
+
+    def std(self, ddof=0):
+        with np.errstate(all="ignore"):
+            return np.sqrt(self.m2 / (self.count - ddof))
+
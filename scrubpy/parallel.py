@@ -0,0 +1,112 @@
+# parallel.py - Thread and process pools for column-wise and row-partitioned work
+import os
+import atexit
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+import pandas as pd
+
+# Below this many rows the pool overhead costs more than it saves
+PARALLEL_MIN_ROWS = 200_000
+
+_workers = None
+_executors = {}
+
+
+def get_workers():
+    """Worker count: set_workers(), else $SCRUBPY_WORKERS, else the CPU count."""
+    if _workers is not None:
+        return _workers
+    return int(os.environ.get("SCRUBPY_WORKERS", os.cpu_count() or 1))
+
+
+def set_workers(count):
+    """Set the worker count (1 disables parallelism) and restart the pools."""
+    global _workers
+    _workers = max(int(count), 1)
+    shutdown()
+
+
+def _executor(backend):
+    if backend not in _executors:
+        pool = ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+        _executors[backend] = pool(max_workers=get_workers())
+    return _executors[backend]
+
+
+def shutdown():
+    for executor in _executors.values():
+        executor.shutdown(wait=True)
+    _executors.clear()
+
+
+atexit.register(shutdown)
+
+
+def _use_pool(rows, workers):
+    return workers > 1 and rows >= PARALLEL_MIN_ROWS
+
+
+def _bounds(length, parts):
+    edges = np.linspace(0, length, parts + 1).astype(int)
+    return [(start, stop) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+
+# 🔀 Row partitions
+def map_series(func, series, backend="process", workers=None):
+    """Apply ``func`` (Series -> Series, row-wise) to row partitions of ``series`` in parallel.
+
+    ``func`` must be a module-level function for the process backend. Object
+    columns hold the GIL in pandas string methods, so "process" is the default.
+    """
+    workers = workers or get_workers()
+    if not _use_pool(len(series), workers):
+        return func(series)
+    parts = [series.iloc[start:stop] for start, stop in _bounds(len(series), workers)]
+    return pd.concat(list(_executor(backend).map(func, parts)))
+
+
+# 🧩 Column blocks
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track flag
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _run_on_shared(func, name, shape, dtype, start, stop):
+    shm = _attach(name)
+    try:
+        values = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        return func(values[:, start:stop])
+    finally:
+        shm.close()
+
+
+def map_columns(func, values, backend="thread", workers=None):
+    """Apply ``func`` to column blocks of a 2-D array and join the results column-wise.
+
+    ``func`` takes a (rows, k) block and returns an array whose last axis has k
+    entries. NumPy reductions release the GIL, so threads share the array
+    directly; the process backend passes it through shared memory, not pickling.
+    """
+    workers = min(workers or get_workers(), values.shape[1])
+    if not _use_pool(values.shape[0], workers):
+        return func(values)
+    bounds = _bounds(values.shape[1], workers)
+    if backend == "thread":
+        results = _executor("thread").map(lambda span: func(values[:, span[0]:span[1]]), bounds)
+        return np.concatenate(list(results), axis=-1)
+
+    values = np.ascontiguousarray(values)
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+        futures = [_executor("process").submit(_run_on_shared, func, shm.name, values.shape, values.dtype.str, start, stop)
+                   for start, stop in bounds]
+        return np.concatenate([future.result() for future in futures], axis=-1)
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,242 @@
+# pipeline.py - Deferred cleaning plans that are optimized before they run
+import pandas as pd
+from scrubpy.core import (
+    drop_missing_values, fill_missing_values, remove_duplicates, standardize_text, fix_column_names,
+    convert_column_types, remove_outliers, merge_near_duplicates
+)
+
+
+class Step:
+    """One recorded operation.
+
+    ``kind`` is ``"filter"`` (drops rows), ``"map"`` (rewrites columns in place),
+    ``"drop"`` (removes columns) or ``"rename"``. ``reads``/``writes`` are sets of
+    column labels, or None when the step touches every column.
+    """
+
+    def __init__(self, name, kind, reads=None, writes=None, preserves_nulls=False, **params):
+        self.name = name
+        self.kind = kind
+        self.reads = None if reads is None else set(reads)
+        self.writes = None if writes is None else set(writes)
+        self.preserves_nulls = preserves_nulls  # a map that never adds or removes nulls
+        self.params = params
+
+    def key(self):
+        return (self.name, repr(sorted(self.params.items())))
+
+    def __repr__(self):
+        args = ", ".join(f"{name}={value!r}" for name, value in self.params.items())
+        return f"{self.name}({args})"
+
+    def run(self, df):
+        params = self.params
+        if self.name == "drop_missing":
+            if params["subset"] is None:
+                return drop_missing_values(df, confirm=False)
+            return df.dropna(subset=params["subset"]).reset_index(drop=True)
+        if self.name == "fill_missing":
+            columns = params["columns"]
+            if columns is not None:
+                columns = [col for col in columns if col in df.columns]  # some may be dropped already
+            return fill_missing_values(df, params["value"], columns=columns)
+        if self.name == "remove_duplicates":
+            return remove_duplicates(df, subset=params["subset"], keep=params["keep"])
+        if self.name == "standardize_text":
+            return standardize_text(df, params["columns"], **_text_options(self))
+        if self.name == "convert_column_types":
+            return convert_column_types(df, params["column"], params["dtype"])
+        if self.name == "remove_outliers":
+            return remove_outliers(df, params["column"], method=params["method"], threshold=params["threshold"])
+        if self.name == "merge_near_duplicates":
+            return merge_near_duplicates(df, params["column"], threshold=params["threshold"])
+        if self.name == "fix_column_names":
+            return fix_column_names(df)
+        if self.name == "drop_columns":
+            return df.drop(columns=params["columns"])
+        raise ValueError(f"Unknown pipeline step: {self.name}")
+
+
+def _disjoint(a, b):
+    return a is not None and b is not None and not (a & b)
+
+
+def _can_swap(earlier, later):
+    """True if ``later`` can run before ``earlier`` without changing the result."""
+    if later.kind not in ("filter", "drop") or earlier.kind == "rename" or earlier.kind == later.kind == "filter":
+        return False
+    if later.kind == "drop":
+        # fill_missing on every column is still correct on fewer columns
+        return _disjoint(earlier.reads, later.writes) or earlier.name == "fill_missing"
+    if earlier.kind == "drop":
+        return False
+    if later.name == "drop_missing" and earlier.preserves_nulls:
+        return True
+    return _disjoint(earlier.writes, later.reads)
+
+
+# 🧠 Plan Optimizer
+def optimize(steps):
+    """Return an equivalent, cheaper list of steps."""
+    steps = _prune_dead_columns(list(steps))
+    steps = _drop_noops(steps)
+    steps = _push_down(steps)
+    steps = _fuse_text(steps)
+    return steps
+
+
+def _prune_dead_columns(steps):
+    """Skip column rewrites whose result is dropped before anything reads it."""
+    kept, dead = [], set()
+    for step in reversed(steps):
+        if step.kind == "drop":
+            dead |= step.writes
+        elif step.kind == "map" and step.writes is not None and step.writes <= dead:
+            continue
+        elif step.kind == "rename" or step.reads is None:
+            dead = set()
+        else:
+            dead -= step.reads
+        kept.append(step)
+    return kept[::-1]
+
+
+def _drop_noops(steps):
+    """Drop a step that repeats an earlier one with nothing in between that undoes it."""
+    kept = []
+    for step in steps:
+        if any(_repeats(earlier, step, kept[i + 1:]) for i, earlier in enumerate(kept)):
+            continue
+        kept.append(step)
+    return kept
+
+
+def _repeats(earlier, step, between):
+    if step.kind == "filter":
+        if earlier.key() != step.key():
+            return False
+        if step.name == "drop_missing":
+            # Only steps that can introduce nulls make a second dropna useful
+            return all(s.kind in ("filter", "drop") or s.preserves_nulls or s.name == "fill_missing" or
+                       (s.kind == "rename" and step.params["subset"] is None) for s in between)
+        return step.name == "remove_duplicates" and all(s.kind == "filter" for s in between)
+    if step.kind == "map":
+        if earlier.key() != step.key() or step.writes is None:
+            return False
+        if any(s.kind == "rename" for s in between):
+            return False
+        return all(s.kind in ("filter", "drop") or _disjoint(s.writes, step.writes) for s in between)
+    return False
+
+
+def _push_down(steps):
+    """Move row filters and column drops ahead of column rewrites they don't depend on."""
+    steps = list(steps)
+    for i in range(len(steps)):
+        j = i
+        while j > 0 and _can_swap(steps[j - 1], steps[j]):
+            steps[j - 1], steps[j] = steps[j], steps[j - 1]
+            j -= 1
+    return steps
+
+
+def _text_options(step):
+    return {key: value for key, value in step.params.items() if key != "columns"}
+
+
+def _fuse_text(steps):
+    """Merge consecutive standardize_text steps into one multi-column step."""
+    fused = []
+    for step in steps:
+        previous = fused[-1] if fused else None
+        if (previous is not None and previous.name == step.name == "standardize_text"
+                and _text_options(previous) == _text_options(step)):
+            columns = previous.params["columns"] + [c for c in step.params["columns"] if c not in previous.writes]
+            fused[-1] = Step("standardize_text", "map", reads=columns, writes=columns,
+                             preserves_nulls=True, columns=columns, **_text_options(step))
+        else:
+            fused.append(step)
+    return fused
+
+
+# 🧹 Lazy Pipeline
+class CleaningPipeline:
+    """Record cleaning operations on a frame and run them once, optimized, on ``collect()``."""
+
+    def __init__(self, df):
+        self.source = df
+        self.steps = []
+
+    def __len__(self):
+        return len(self.steps)
+
+    def _add(self, step):
+        self.steps.append(step)
+        return self
+
+    @property
+    def columns(self):
+        """Column labels the plan will produce, without running it."""
+        columns = self.source.columns
+        for step in self.steps:
+            if step.name == "fix_column_names":
+                columns = columns.str.lower().str.replace(' ', '_')
+            elif step.name == "drop_columns":
+                columns = columns.drop(step.params["columns"])
+        return columns
+
+    def drop_missing(self, subset=None):
+        return self._add(Step("drop_missing", "filter", reads=subset, subset=subset))
+
+    def fill_missing(self, value, columns=None):
+        return self._add(Step("fill_missing", "map", reads=columns, writes=columns, value=value, columns=columns))
+
+    def remove_duplicates(self, subset=None, keep="first"):
+        return self._add(Step("remove_duplicates", "filter", reads=subset, subset=subset, keep=keep))
+
+    def standardize_text(self, column, **options):
+        columns = list(column) if pd.api.types.is_list_like(column) else [column]
+        return self._add(Step("standardize_text", "map", reads=columns, writes=columns, preserves_nulls=True,
+                              columns=columns, **options))
+
+    def convert_column_types(self, column, dtype):
+        return self._add(Step("convert_column_types", "map", reads=[column], writes=[column],
+                              column=column, dtype=dtype))
+
+    def remove_outliers(self, column, method="zscore", threshold=None):
+        reads = list(column) if pd.api.types.is_list_like(column) else [column]
+        return self._add(Step("remove_outliers", "filter", reads=reads, column=column, method=method,
+                              threshold=threshold))
+
+    def merge_near_duplicates(self, column, threshold=0.8):
+        return self._add(Step("merge_near_duplicates", "map", reads=[column], writes=[column], preserves_nulls=True,
+                              column=column, threshold=threshold))
+
+    def fix_column_names(self):
+        return self._add(Step("fix_column_names", "rename"))
+
+    def drop_columns(self, columns):
+        columns = list(columns)
+        return self._add(Step("drop_columns", "drop", reads=[], writes=columns, columns=columns))
+
+    def undo(self):
+        """Forget the most recently recorded step."""
+        return self.steps.pop() if self.steps else None
+
+    def plan(self):
+        return optimize(self.steps)
+
+    def explain(self):
+        """Human-readable optimized plan."""
+        plan = self.plan()
+        if not plan:
+            return "(no pending steps)"
+        return "\n".join(f"{i}. {step!r}" for i, step in enumerate(plan, 1))
+
+    def collect(self):
+        """Run the optimized plan and return the cleaned frame."""
+        # Steps replace whole columns rather than writing into them, so a shallow copy protects the source
+        df = self.source.copy(deep=False)
+        for step in self.plan():
+            df = step.run(df)
+        return df
@@ -0,0 +1,131 @@
+# plots.py - Headless heatmaps whose cost depends on the pixel budget, not the dataset size
+import os
+import numpy as np
+import pandas as pd
+
+DEFAULT_DIRECTORY = "plots"
+MAX_ROW_BINS = 400        # vertical pixel budget of the missing-value heatmap
+MAX_CORRELATION_COLUMNS = 40
+ANNOTATE_UP_TO = 15       # cells are labelled only on small correlation heatmaps
+
+
+# 🧮 Aggregation (numpy only)
+def missing_blocks(df, max_bins=MAX_ROW_BINS):
+    """Share of missing values per (row block, column), at most ``max_bins`` blocks.
+
+    Rows are split into equal consecutive blocks, so order-related gaps (a feed
+    that stopped, a column added later) stay visible. Works column by column,
+    so memory stays at one boolean column plus the small result.
+    """
+    rows = len(df)
+    bins = max(min(max_bins, rows), 1)
+    starts = np.linspace(0, rows, bins + 1).astype(np.int64)[:-1]
+    sizes = np.diff(np.append(starts, rows)).clip(min=1)
+    blocks = np.zeros((bins, df.shape[1]))
+    if rows:
+        for position in range(df.shape[1]):
+            missing = df.iloc[:, position].isna().to_numpy(dtype=np.uint8)
+            blocks[:, position] = np.add.reduceat(missing, starts, dtype=np.int64) / sizes
+    return pd.DataFrame(blocks, index=starts, columns=df.columns)
+
+
+def _cluster_order(corr):
+    """Greedy nearest-neighbour ordering on 1 - |r|, so correlated columns end up adjacent."""
+    strength = np.nan_to_num(np.abs(corr), nan=0.0)
+    np.fill_diagonal(strength, -1.0)
+    order = [int(np.argmax(strength.max(axis=1)))]
+    remaining = set(range(len(corr))) - set(order)
+    while remaining:
+        candidates = sorted(remaining)
+        order.append(candidates[int(np.argmax(strength[order[-1], candidates]))])
+        remaining.discard(order[-1])
+    return order
+
+
+def select_correlations(corr, threshold=None, top_k=None, max_columns=MAX_CORRELATION_COLUMNS, cluster=True):
+    """Reduce a correlation frame to the columns worth drawing.
+
+    ``threshold`` keeps columns with some |r| >= threshold to another column,
+    ``top_k`` keeps the columns of the k strongest pairs, and at most
+    ``max_columns`` remain (those with the strongest partner). With
+    ``cluster`` the result is reordered so correlated blocks sit together.
+    """
+    values = corr.to_numpy(dtype="float64")
+    strength = np.nan_to_num(np.abs(values), nan=0.0)
+    np.fill_diagonal(strength, 0.0)
+    keep = np.ones(len(corr), dtype=bool)
+    if threshold is not None:
+        keep &= (strength >= threshold).any(axis=1)
+    if top_k is not None:
+        upper = np.triu(strength, k=1)
+        pairs = np.argsort(upper, axis=None)[::-1][:top_k]
+        chosen = np.zeros(len(corr), dtype=bool)
+        chosen[np.concatenate(np.unravel_index(pairs, upper.shape))] = True
+        keep &= chosen
+    positions = np.flatnonzero(keep)
+    if len(positions) > max_columns:
+        best = strength[positions][:, positions].max(axis=1)
+        positions = np.sort(positions[np.argsort(best, kind="stable")[::-1][:max_columns]])
+    if cluster and len(positions) > 2:
+        positions = positions[_cluster_order(values[np.ix_(positions, positions)])]
+    return corr.iloc[positions, positions]
+
+
+# 🖼️ Rendering (matplotlib's Agg canvas: no display, no pyplot state)
+def _figure(width, height):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figure = Figure(figsize=(width, height))
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _save(figure, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    figure.savefig(path, dpi=100)
+    return path
+
+
+def _labels(names, limit=60):
+    # Label every column when they fit, else about ``limit`` evenly spaced ones
+    step = max(len(names) // limit, 1)
+    return np.arange(0, len(names), step), [str(name) for name in names[::step]]
+
+
+def save_missing_heatmap(df, path=os.path.join(DEFAULT_DIRECTORY, "missing_heatmap.png"), max_bins=MAX_ROW_BINS):
+    """Draw the missing share per row block and column to ``path``; returns the path."""
+    blocks = missing_blocks(df, max_bins)
+    figure = _figure(min(4 + 0.25 * blocks.shape[1], 24), 6)
+    ax = figure.add_subplot()
+    image = ax.imshow(blocks.to_numpy(), aspect="auto", interpolation="nearest", cmap="viridis", vmin=0, vmax=1)
+    ticks, names = _labels(list(blocks.columns))
+    ax.set_xticks(ticks, names, rotation=90)
+    rows = np.linspace(0, len(blocks) - 1, min(len(blocks), 6)).astype(int)
+    ax.set_yticks(rows, [f"{blocks.index[i]:,}" for i in rows])
+    ax.set_ylabel("First row of block")
+    ax.set_title(f"Missing Values ({len(df):,} rows in {len(blocks)} blocks)")
+    figure.colorbar(image, ax=ax, label="Share missing")
+    figure.tight_layout()
+    return _save(figure, path)
+
+
+def save_correlation_heatmap(corr, path=os.path.join(DEFAULT_DIRECTORY, "correlation_heatmap.png"),
+                             threshold=None, top_k=None, max_columns=MAX_CORRELATION_COLUMNS, cluster=True):
+    """Draw the selected part of ``corr`` (see select_correlations) to ``path``; returns the path."""
+    view = select_correlations(corr, threshold, top_k, max_columns, cluster)
+    size = min(4 + 0.35 * len(view), 20)
+    figure = _figure(size + 1, size)
+    ax = figure.add_subplot()
+    image = ax.imshow(view.to_numpy(dtype="float64"), cmap="coolwarm", vmin=-1, vmax=1, interpolation="nearest")
+    ticks, names = _labels(list(view.columns))
+    ax.set_xticks(ticks, names, rotation=90)
+    ax.set_yticks(ticks, names)
+    if len(view) <= ANNOTATE_UP_TO:
+        for (i, j), value in np.ndenumerate(view.to_numpy(dtype="float64")):
+            if not np.isnan(value):
+                ax.text(j, i, f"{value:.2f}", ha="center", va="center", fontsize=8)
+    shown = f"{len(view)} of {len(corr)} columns" if len(view) < len(corr) else f"{len(view)} columns"
+    ax.set_title(f"Correlation Matrix ({shown})")
+    figure.colorbar(image, ax=ax)
+    figure.tight_layout()
+    return _save(figure, path)
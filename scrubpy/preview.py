@@ -1,12 +1,23 @@
-from scrubpy.core import drop_missing_values, fill_missing_values, remove_duplicates, standardize_text
+import numpy as np
+import pandas as pd
+from scrubpy.core import (
+    drop_missing_values, fill_missing_values, remove_duplicates, standardize_text, remove_outliers,
+    get_dataset_summary, format_summary
+)
+from scrubpy.outliers import outlier_rows
+from scrubpy.row_hash import index_for
+from scrubpy.instrument import instrumented
 
+PREVIEW_SAMPLE_SIZE = 5_000
+
+@instrumented()
 def preview_changes(df, action, **kwargs):
     """Show a preview of how the dataset will change before applying."""
-    
-    df_preview = df.copy()
+
+    df_preview = df  # the operations return new frames, and reuse df's row-hash index
 
     if action == "drop_missing":
-        df_preview = drop_missing_values(df_preview)
+        df_preview = drop_missing_values(df_preview, confirm=False)  # a preview never prompts
     elif action == "fill_missing":
         fill_value = kwargs.get("fill_value", "N/A")
         df_preview = fill_missing_values(df_preview, fill_value)
@@ -15,5 +26,103 @@ def preview_changes(df, action, **kwargs):
     elif action == "standardize_text":
         col = kwargs.get("column")
         df_preview = standardize_text(df_preview, col)
+    elif action == "remove_outliers":
+        df_preview = remove_outliers(df_preview, kwargs.get("column"), method=kwargs.get("method", "zscore"))
 
     return df_preview
+
+def _stratified_sample(df, null_rows, size=PREVIEW_SAMPLE_SIZE, seed=0):
+    """Sample rows with and without nulls in proportion, so the sample's null mix matches the frame."""
+    if len(df) <= size:
+        return df
+    rng = np.random.default_rng(seed)
+    picks = []
+    for stratum in (np.flatnonzero(null_rows), np.flatnonzero(~null_rows)):
+        take = int(round(size * len(stratum) / len(df)))
+        if take:
+            picks.append(rng.choice(stratum, take, replace=False))
+    return df.iloc[np.sort(np.concatenate(picks))]
+
+def _apply(df, action, **kwargs):
+    if action == "fill_missing":
+        return fill_missing_values(df, kwargs.get("fill_value", "N/A"))
+    if action == "standardize_text":
+        return standardize_text(df, kwargs.get("column"))
+    if action == "drop_missing":
+        return df.dropna()
+    if action == "remove_outliers":
+        return df  # dropping rows barely changes the bytes per row
+    return remove_duplicates(df)
+
+@instrumented()
+def preview_summary(df, action, exact=False, stats=None, **kwargs):
+    """Before/after summary of ``action`` without running it on the whole frame.
+
+    Row, missing and duplicate counts come from null and duplicate masks (or the
+    profiler's cached ``stats``) and are exact unless marked '~'. Memory is
+    scaled from a stratified sample. ``exact=True`` runs the full operation.
+    """
+    if exact:
+        return get_dataset_summary(preview_changes(df, action, **kwargs))
+
+    isnull = df.isnull()
+    null_rows = isnull.to_numpy().any(axis=1)
+    missing_by_col = stats["missing"] if stats is not None else isnull.sum()
+    missing = int(missing_by_col.sum())
+    rows = len(df)
+    memory = stats["memory"] if stats is not None else int(df.memory_usage(deep=True).sum())
+    estimated = {"memory"}
+
+    def duplicated():
+        return index_for(df).duplicated(frame=df)
+
+    if action == "drop_missing":
+        rows_after = rows - int(null_rows.sum())
+        missing_after = 0
+        # Rows that survive dropna have no nulls, so their duplicates survive too
+        duplicates_after = int((duplicated() & ~null_rows).sum()) if missing else None
+    elif action == "fill_missing":
+        rows_after, missing_after = rows, 0
+        duplicates_after = None  # filling can only merge rows that had nulls
+        if missing:
+            estimated.add("duplicates")
+    elif action == "remove_duplicates":
+        dup = duplicated()
+        rows_after = rows - int(dup.sum())
+        missing_after = missing - int(isnull.to_numpy()[dup].sum()) if missing else 0
+        duplicates_after = 0
+    elif action == "standardize_text":
+        col = kwargs.get("column")
+        rows_after = rows
+        # The operation maps each value independently, so running it on the unique values is enough
+        uniques = df[[col]].drop_duplicates()
+        standardized = _apply(uniques, action, column=col)[col]
+        nulls_kept = bool(standardized.isnull().any())
+        missing_after = missing - (0 if nulls_kept else int(missing_by_col[col]))
+        # If no two distinct values collapse into one, the duplicate count can't change
+        collapsed = standardized.nunique(dropna=False) < len(uniques)
+        duplicates_after = None
+        if collapsed:
+            estimated.add("duplicates")
+    elif action == "remove_outliers":
+        col, method = kwargs.get("column"), kwargs.get("method", "zscore")
+        cached = stats is not None and method == "zscore" and col in stats["outlier_mask"]
+        dropped = stats["outlier_mask"][col].to_numpy() if cached else outlier_rows(df, [col], method=method)
+        rows_after = rows - int(dropped.sum())
+        missing_after = missing - int(isnull.to_numpy()[dropped].sum()) if missing else 0
+        # Dropping a first occurrence can unmark a later copy, so recount on the surviving hashes
+        duplicates_after = int(pd.Series(index_for(df).hashes[~dropped]).duplicated().sum())
+    else:
+        raise ValueError(f"Unknown preview action: {action}")
+
+    if duplicates_after is None:
+        duplicates_after = stats["duplicates"] if stats is not None else int(duplicated().sum())
+
+    sample = _stratified_sample(df, null_rows)
+    sample_after = _apply(sample, action, **kwargs)
+    sample_memory = sample.memory_usage(deep=True).sum()
+    bytes_per_row = sample_after.memory_usage(deep=True).sum() / max(len(sample_after), 1)
+    ratio = bytes_per_row / (sample_memory / max(len(sample), 1)) if sample_memory else 1.0
+    memory_after = memory / max(rows, 1) * ratio * rows_after
+
+    return format_summary(rows_after, df.shape[1], missing_after, duplicates_after, memory_after, estimated)
@@ -1,57 +1,402 @@
 # profiling.py - ScrubPy Data Profiling Engine
+import warnings
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from rich.console import Console
 from rich.table import Table
+from scrubpy.sketches import ProfileSketch
+from scrubpy.parallel import map_columns
+from scrubpy.row_hash import duplicate_count, forget
+from scrubpy.outliers import zscore_limits, limits_mask, RunningMoments
+from scrubpy.instrument import instrumented
+from scrubpy.wide import (
+    WIDE_COLUMNS, BLOCK_COLUMNS, DEFAULT_TOP_K, column_blocks, top_correlated_pairs, correlation_frame
+)
 
 console = Console()
 
+STAT_NAMES = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+TEXT_DTYPES = ["object", "category", "string"]  # text columns, including optimized ones
+# After dropping rows, moments are recomputed where the remaining sum of squares is below this
+# share of the old one; subtracting would keep only about eps / ratio of relative precision
+CANCELLATION_RATIO = 1e-4
+
+
+def _numeric_block_stats(values):
+    """Rows: count, mean, std, min, 25%, 50%, 75%, max; one column per input column."""
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+        quantiles = (np.nanpercentile(values, [0, 25, 50, 75, 100], axis=0) if values.size
+                     else np.full((5, values.shape[1]), np.nan))
+    count = (~np.isnan(values)).sum(axis=0)
+    return np.vstack([count, mean, std, quantiles])
+
+
+def _quantiles(values):
+    """Rows: min, 25%, 50%, 75%, max of each column."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanpercentile(values, [0, 25, 50, 75, 100], axis=0)
+
+
+def _numeric_frame(block, columns):
+    return pd.DataFrame(block.T, index=columns, columns=STAT_NAMES)
+
+
+def _outlier_frame(values, block, index, columns):
+    """Same |z| >= 3 masks as remove_outliers (population std), reused by previews and removal."""
+    count, mean, std = block[0], block[1], block[2]
+    with np.errstate(all="ignore"):
+        low, high = zscore_limits(mean, std * np.sqrt((count - 1) / count))
+    return pd.DataFrame(limits_mask(values, low, high, inclusive=True), index=index, columns=columns)
+
+
+def _numeric_stats(df, columns, blocked=False):
+    """Stats block (8 x columns) and z-score outlier frame of ``columns``.
+
+    ``blocked`` converts BLOCK_COLUMNS columns at a time, so wide tables never
+    need a float64 copy of every numeric column at once.
+    """
+    blocks, masks = [], []
+    for labels, values in column_blocks(df, columns, block=BLOCK_COLUMNS if blocked else max(len(columns), 1)):
+        block = map_columns(_numeric_block_stats, values)
+        blocks.append(block)
+        masks.append(_outlier_frame(values, block, df.index, labels))
+    if not blocks:
+        empty = np.empty((8, 0))
+        return empty, _outlier_frame(np.empty((len(df), 0)), empty, df.index, columns)
+    return np.hstack(blocks), masks[0] if len(masks) == 1 else pd.concat(masks, axis=1)
+
+
+def _text_summary(counts):
+    return {"Unique Values": len(counts), "Most Common": counts.head(3).to_dict()}
+
+
+def _float_values(df, columns):
+    return df[columns].to_numpy(dtype="float64", na_value=np.nan)
+
+
+# 🔁 Patching Statistics (see DataProfiler.advance)
+def _renamed(stats, mapping):
+    """Statistics relabelled by ``mapping``; values are untouched by a rename."""
+    stats = dict(stats)
+    stats["missing"] = stats["missing"].rename(mapping)
+    stats["numeric"] = stats["numeric"].rename(index=mapping)
+    stats["outlier_mask"] = stats["outlier_mask"].rename(columns=mapping)
+    stats["outlier_columns"] = [mapping.get(col, col) for col in stats["outlier_columns"]]
+    relabel = lambda labels: labels.map(lambda col: mapping.get(col, col))  # noqa: E731
+    stats["correlation_pairs"] = {key: pairs.assign(left=relabel(pairs["left"]), right=relabel(pairs["right"]))
+                                  for key, pairs in stats.get("correlation_pairs", {}).items()}
+    stats["value_counts"] = {mapping.get(col, col): counts for col, counts in stats["value_counts"].items()}
+    stats["categorical"] = {mapping.get(col, col): info for col, info in stats["categorical"].items()}
+    if stats["correlation"] is not None:
+        stats["correlation"] = {mapping.get(a, a): {mapping.get(b, b): value for b, value in row.items()}
+                                for a, row in stats["correlation"].items()}
+    return stats
+
+
+def _without_rows(stats, old, new, dropped):
+    """Statistics of ``new``: ``old`` without the rows masked by ``dropped``.
+
+    Missing counts and value counts subtract what the dropped rows
+    contributed, at a cost that follows the number of dropped rows. So do the
+    moments, except in columns where the dropped values held nearly all of the
+    variance (e.g. removed outliers): subtracting would cancel away the
+    precision there, so those columns' moments are recomputed from the
+    surviving values. Quartiles have no subtractive update and are recomputed
+    (one partition per column, no sort), as are the outlier masks, whose
+    limits follow the new moments, the duplicate count from the carried
+    row-hash index, and memory, which isn't the sum of its rows (a filtered
+    string column gets its own, differently sized buffers). Those are
+    vectorized passes over the rows, still far cheaper than profiling again.
+    """
+    gone = old[dropped]
+    stats = dict(stats)
+    stats["missing"] = stats["missing"] - gone.isnull().sum()
+    stats["memory"] = int(new.memory_usage(deep=True).sum())
+    stats["duplicates"] = duplicate_count(new)
+
+    numeric = stats["numeric"]
+    columns = list(numeric.index)
+    if columns:
+        moments = RunningMoments(len(columns))
+        moments.count = numeric["count"].to_numpy(dtype="float64")
+        moments.mean = np.nan_to_num(numeric["mean"].to_numpy(dtype="float64"))
+        moments.m2 = np.nan_to_num(numeric["std"].to_numpy(dtype="float64") ** 2 * (moments.count - 1))
+        before = moments.m2.copy()
+        moments.remove(RunningMoments(len(columns)).update(_float_values(gone, columns)))
+        values = _float_values(new, columns)
+        block = np.empty((8, len(columns)))
+        block[0] = moments.count
+        block[1] = np.where(moments.count > 0, moments.mean, np.nan)
+        block[2] = np.where(moments.count > 1, moments.std(ddof=1), np.nan)
+        unstable = moments.m2 < before * CANCELLATION_RATIO
+        if unstable.any():
+            block[:3, unstable] = _numeric_block_stats(values[:, unstable])[:3]
+        block[3:] = map_columns(_quantiles, values) if len(new) else np.nan
+        stats["numeric"] = _numeric_frame(block, numeric.index)
+        stats["outlier_mask"] = _outlier_frame(values, block, new.index, numeric.index)
+        stats["outlier_columns"] = list(numeric.index[stats["outlier_mask"].to_numpy().any(axis=0)])
+    else:
+        stats["outlier_mask"] = stats["outlier_mask"].iloc[~dropped]
+
+    value_counts = {}
+    for col, counts in stats["value_counts"].items():
+        counts = counts.sub(gone[col].value_counts(), fill_value=0).astype("int64")
+        if not isinstance(new[col].dtype, pd.CategoricalDtype):
+            counts = counts[counts > 0]  # value_counts keeps unused categories, nothing else
+        value_counts[col] = counts.sort_values(ascending=False, kind="stable")
+    stats["value_counts"] = value_counts
+    stats["categorical"] = {col: _text_summary(counts) for col, counts in value_counts.items()}
+    stats["correlation"] = None
+    stats["correlation_pairs"] = {}
+    return stats
+
+
+def _with_columns(stats, old, new, columns):
+    """Statistics of ``new``: ``old`` with ``columns`` rewritten or dropped (same rows).
+
+    Only the touched columns (and any new ones) are profiled again.
+    """
+    touched = set(columns) | set(new.columns.difference(old.columns))
+    changed = [col for col in new.columns if col in touched]
+    stats = dict(stats)
+    kept_missing = stats["missing"][[col not in touched for col in stats["missing"].index]]
+    stats["missing"] = pd.concat([kept_missing, new[changed].isnull().sum()]).reindex(new.columns).astype("int64")
+    before = int(old[[col for col in old.columns if col in touched]].memory_usage(deep=True, index=False).sum())
+    stats["memory"] = stats["memory"] - before + int(new[changed].memory_usage(deep=True, index=False).sum())
+    stats["duplicates"] = duplicate_count(new)
+
+    numeric = new.select_dtypes(include="number").columns
+    redo = [col for col in numeric if col in touched or col not in stats["numeric"].index]
+    keep = [col for col in numeric if col not in redo]
+    values = _float_values(new, redo)
+    block = _numeric_block_stats(values) if redo else np.empty((8, 0))
+    fresh_mask = _outlier_frame(values, block, new.index, redo)
+    stats["numeric"] = pd.concat([stats["numeric"].loc[keep], _numeric_frame(block, redo)]).reindex(numeric)
+    stats["outlier_mask"] = pd.concat([stats["outlier_mask"][keep], fresh_mask], axis=1)[list(numeric)]
+    flagged = {col for col in stats["outlier_columns"] if col in keep}
+    flagged |= set(fresh_mask.columns[fresh_mask.to_numpy().any(axis=0)])
+    stats["outlier_columns"] = [col for col in numeric if col in flagged]
+
+    text = new.select_dtypes(include=TEXT_DTYPES).columns
+    stats["value_counts"] = {col: stats["value_counts"][col] if col not in touched and col in stats["value_counts"]
+                             else new[col].value_counts() for col in text}
+    stats["categorical"] = {col: stats["categorical"][col] if col not in touched and col in stats["categorical"]
+                            else _text_summary(stats["value_counts"][col]) for col in text}
+    if touched & (set(old.select_dtypes(include="number").columns) | set(numeric)):
+        stats["correlation"] = None
+        stats["correlation_pairs"] = {}
+    return stats
+
+
+def suggest_wide(df):
+    """True when ``df`` has enough numeric columns (WIDE_COLUMNS) that callers should profile it with ``wide=True``."""
+    return len(df.select_dtypes(include="number").columns) >= WIDE_COLUMNS
+
+
 class DataProfiler:
-    def __init__(self, df):
+    def __init__(self, df, approximate=False, wide=False, sample=None):
         self.df = df
+        self.approximate = approximate  # use mergeable sketches instead of exact scans
+        self.wide = wide  # report statistics as a frame and correlations as top-k pairs (see suggest_wide)
+        self.sample = sample  # rows sampled for correlations in wide mode (None: all)
+        self._stats = None
+        self._stats_key = None
+
+    # 🧮 Shared statistics, computed once per frame
+    def _fingerprint(self):
+        return (id(self.df), self.df.shape, tuple(self.df.columns), tuple(self.df.dtypes.astype(str)))
+
+    def invalidate(self):
+        """Forget cached statistics after the frame was modified in place."""
+        self._stats = None
+        forget(self.df)
+
+    def stats(self):
+        """Per-column statistics shared by every report section, cached until the frame changes."""
+        key = self._fingerprint()
+        if self._stats is None or self._stats_key != key:
+            self._stats = self._compute_stats()
+            self._stats_key = key
+        return self._stats
+
+    def restore(self, stats):
+        """Adopt statistics computed earlier for an identical frame (e.g. from the on-disk cache)."""
+        self._stats = stats
+        self._stats_key = self._fingerprint()
+
+    def is_wide(self):
+        return bool(self.wide)
+
+    def cached_stats(self):
+        """Exact statistics if they are already computed for the current frame, else None."""
+        if self.approximate or self._stats is None or self._stats_key != self._fingerprint():
+            return None
+        return self._stats
+
+    @instrumented()
+    def _compute_stats(self):
+        if self.approximate:
+            return self._compute_sketch_stats()
+        df = self.df
+        stats = {
+            "missing": df.isnull().sum(),
+            "duplicates": duplicate_count(df),
+            "memory": int(df.memory_usage(deep=True).sum()),
+        }
+
+        # Numeric columns: nulls, moments, min/max and quartiles as one matrix pass (per block on wide tables)
+        numeric = df.select_dtypes(include="number").columns
+        blocked = self.is_wide() or suggest_wide(df)
+        block, stats["outlier_mask"] = _numeric_stats(df, numeric, blocked=blocked)
+        stats["numeric"] = _numeric_frame(block, numeric)
+        stats["outlier_columns"] = list(numeric[stats["outlier_mask"].to_numpy().any(axis=0)])
 
+        # Text columns: full value counts give cardinality and top-k, and can be patched later
+        stats["value_counts"] = {col: df[col].value_counts() for col in df.select_dtypes(include=TEXT_DTYPES).columns}
+        stats["categorical"] = {col: _text_summary(counts) for col, counts in stats["value_counts"].items()}
+        stats["correlation"] = None  # filled on first request
+        stats["correlation_pairs"] = {}  # (top_k, threshold, sample) -> pairs frame
+        return stats
+
+    # 🔁 Incremental Updates
+    @instrumented()
+    def advance(self, df, rows=None, columns=None, rename=False):
+        """Move the profiler from ``self.df`` to ``df``, the result of one cleaning step.
+
+        The step is described like an undo delta: ``rows`` masks the rows of the
+        old frame that were dropped, ``columns`` lists columns that were
+        rewritten or dropped, and ``rename`` means only the labels changed.
+        Cached exact statistics are patched from that change instead of being
+        recomputed; without them (or with sketches) ``df`` is profiled from
+        scratch on the next request.
+        """
+        stats, old = self.cached_stats(), self.df
+        self.df, self._stats = df, None
+        if stats is None or "value_counts" not in stats:
+            return self
+        if rename and len(old.columns) == len(df.columns) and len(old) == len(df):
+            self.restore(_renamed(stats, dict(zip(old.columns, df.columns))))
+        elif rows is not None and len(df) == len(old) - int(np.count_nonzero(rows)) \
+                and list(df.columns) == list(old.columns):
+            self.restore(_without_rows(stats, old, df, np.asarray(rows, dtype=bool)))
+        elif columns is not None and len(df) == len(old):
+            self.restore(_with_columns(stats, old, df, list(columns)))
+        return self
+
+    @instrumented()
+    def _compute_sketch_stats(self):
+        """Approximate statistics from a ProfileSketch, each with its error bound."""
+        df = self.df
+        sketch = ProfileSketch().update(df)
+        duplicates, duplicate_error = sketch.duplicate_estimate()
+        stats = {
+            "missing": pd.Series(sketch.missing, dtype="int64").reindex(df.columns),
+            "duplicates": duplicates,
+            "duplicates_error": duplicate_error,
+            "memory": int(df.memory_usage(deep=True).sum()),
+            "sketch": sketch,
+        }
+
+        rows = {}
+        for col, (count, mean, m2) in sketch.moments.items():
+            digest = sketch.digests[col]
+            std = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+            rows[col] = [count, mean if count else np.nan, std, digest.min if count else np.nan,
+                         digest.quantile(0.25), digest.quantile(0.5), digest.quantile(0.75),
+                         digest.max if count else np.nan, digest.rank_error(0.5)]
+        stats["numeric"] = pd.DataFrame.from_dict(rows, orient="index", columns=STAT_NAMES + ["quantile rank error"])
+        # min/max are exact, so "any |z| >= 3" needs no second pass
+        numeric = stats["numeric"]
+        spread = np.maximum(numeric["max"] - numeric["mean"], numeric["mean"] - numeric["min"])
+        stats["outlier_columns"] = list(numeric.index[spread / numeric["std"] >= 3])
+
+        categorical = {}
+        for col, hll in sketch.distinct.items():
+            heavy = sketch.heavy[col]
+            unique = int(round(hll.estimate()))
+            categorical[col] = {
+                "Unique Values": unique,
+                "Most Common": heavy.top(3),
+                "Error Bound": {
+                    "Unique Values": f"±{int(np.ceil(unique * hll.relative_error))} (1 std. error)",
+                    "Most Common": f"counts high by at most {heavy.error_bound} (98% confidence)",
+                },
+            }
+        stats["categorical"] = categorical
+        stats["correlation"] = None
+        return stats
+
+    @instrumented()
     def dataset_overview(self):
         """Return basic dataset info"""
         overview = {
             "Total Rows": self.df.shape[0],
             "Total Columns": self.df.shape[1],
-            "Memory Usage (KB)": round(self.df.memory_usage(deep=True).sum() / 1024, 2)
+            "Memory Usage (KB)": round(self.stats()["memory"] / 1024, 2)
         }
         return overview
 
+    @instrumented()
     def data_types_summary(self):
         """Return column names with their data types"""
         return self.df.dtypes.astype(str).to_dict()
 
+    @instrumented()
     def summary_statistics(self):
         """Summary stats for numeric columns"""
-        return self.df.describe().T.to_dict()
+        numeric = self.stats()["numeric"]
+        if self.is_wide():
+            return numeric  # columns x statistics, array-backed
+        if numeric.empty:
+            return self.df.describe().T.to_dict()  # describe() falls back to object columns
+        return numeric.to_dict()
 
+    @instrumented()
     def missing_values_report(self):
         """Count and percentage of missing values"""
-        total = self.df.isnull().sum()
+        total = self.stats()["missing"]
         percent = (total / len(self.df)) * 100
         return pd.DataFrame({"Missing Values": total, "Percentage": percent}).sort_values("Missing Values", ascending=False)
 
+    @instrumented()
     def duplicate_report(self):
         """Count duplicate rows"""
-        return {"Duplicate Rows": self.df.duplicated().sum()}
+        stats = self.stats()
+        if self.approximate:
+            return {"Duplicate Rows": stats["duplicates"], "Error Bound": f"±{stats['duplicates_error']} (1 std. error)"}
+        return {"Duplicate Rows": stats["duplicates"]}
 
+    @instrumented()
     def categorical_summary(self):
-        """Top categories and cardinality of object columns"""
-        summary = {}
-        for col in self.df.select_dtypes(include='object').columns:
-            value_counts = self.df[col].value_counts().head(3).to_dict()
-            summary[col] = {
-                "Unique Values": self.df[col].nunique(),
-                "Most Common": value_counts
-            }
-        return summary
+        """Top categories and cardinality of text columns"""
+        return self.stats()["categorical"]
 
+    @instrumented()
     def correlation_matrix(self):
-        """Return correlation matrix for numeric columns"""
-        return self.df.corr(numeric_only=True).round(2).to_dict()
+        """Return correlation matrix for numeric columns (in wide mode, only the strongest pairs)"""
+        stats = self.stats()
+        if stats["correlation"] is None and self.is_wide():
+            nested = {}
+            for left, right, value in self.correlation_pairs().itertuples(index=False):
+                nested.setdefault(left, {})[right] = round(float(value), 2)
+            stats["correlation"] = nested
+        elif stats["correlation"] is None:
+            stats["correlation"] = self.df.corr(numeric_only=True).round(2).to_dict()
+        return stats["correlation"]
+
+    @instrumented()
+    def correlation_pairs(self, top_k=DEFAULT_TOP_K, threshold=None):
+        """Strongest column pairs as a frame (left, right, correlation), from blocked float32 products"""
+        stats = self.stats()
+        pairs = stats.setdefault("correlation_pairs", {})
+        key = (top_k, threshold, self.sample)
+        if key not in pairs:
+            pairs[key] = top_correlated_pairs(self.df, top_k=top_k, threshold=threshold, sample=self.sample)
+        return pairs[key]
 
     def display_rich_summary(self):
         """Print dataset overview in a Rich-styled table."""
@@ -68,6 +413,7 @@ class DataProfiler:
 
         console.print(table)
 
+    @instrumented()
     def generate_profile_report(self):
         """Generate full profiling dictionary for integration"""
         return {
@@ -77,32 +423,46 @@ class DataProfiler:
             "Missing Values": self.missing_values_report().to_dict(),
             "Duplicate Info": self.duplicate_report(),
             "Categorical Summary": self.categorical_summary(),
-            "Correlations": self.correlation_matrix(),
+            "Correlations": self.correlation_pairs() if self.is_wide() else self.correlation_matrix(),
         }
 
-    def visualize_missing_heatmap(self):
-        sns.heatmap(self.df.isnull(), cbar=False, cmap='viridis')
-        plt.title("Missing Values Heatmap")
-        plt.show()
-
-    def visualize_correlations(self):
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(self.df.corr(numeric_only=True), annot=True, cmap="coolwarm", fmt=".2f")
-        plt.title("Correlation Matrix")
-        plt.tight_layout()
-        plt.show()
+    # 🖼️ Plots (headless: written to files, matplotlib loads only here)
+    @instrumented()
+    def visualize_missing_heatmap(self, path="plots/missing_heatmap.png", max_bins=400):
+        """Save the share of missing values per row block and column; returns the file path."""
+        from scrubpy.plots import save_missing_heatmap
+        return save_missing_heatmap(self.df, path, max_bins=max_bins)
+
+    @instrumented()
+    def visualize_correlations(self, path="plots/correlation_heatmap.png", threshold=None, top_k=None,
+                               max_columns=40, cluster=True):
+        """Save a clustered correlation heatmap, limited to ``threshold``/``top_k`` pairs on wide tables."""
+        from scrubpy.plots import save_correlation_heatmap
+        if self.is_wide():
+            # Only the columns of the strongest pairs are correlated in full
+            pairs = self.correlation_pairs(top_k=top_k or DEFAULT_TOP_K, threshold=threshold)
+            columns = list(dict.fromkeys(pairs[["left", "right"]].to_numpy().ravel()))[:max_columns]
+            matrix = correlation_frame(self.df, columns, sample=self.sample)
+        else:
+            matrix = pd.DataFrame(self.correlation_matrix())
+        return save_correlation_heatmap(matrix, path, threshold=threshold, top_k=top_k,
+                                        max_columns=max_columns, cluster=cluster)
+
+    @instrumented()
     def suggest_cleaning_actions(self):
         """Suggest common cleaning actions based on profiling."""
         suggestions = []
 
+        stats = self.stats()
+
         # Missing Values
-        missing = self.df.isnull().sum()
+        missing = stats["missing"]
         high_missing_cols = missing[missing > 0]
         if not high_missing_cols.empty:
             suggestions.append("🛠️ Handle missing values (some columns have NaNs).")
 
         # Duplicate Rows
-        if self.df.duplicated().sum() > 0:
+        if stats["duplicates"] > 0:
             suggestions.append("♻️ Remove duplicate rows.")
 
         # Column Name Formatting
@@ -111,15 +471,12 @@ class DataProfiler:
             suggestions.append("🔠 Fix column names (spaces/capitalization issues).")
 
         # Text Columns with inconsistent formatting
-        object_cols = self.df.select_dtypes(include="object")
+        object_cols = self.df.select_dtypes(include=TEXT_DTYPES)
         if not object_cols.empty:
             suggestions.append("🔡 Standardize text columns (e.g., lowercase & trim).")
 
         # Numeric columns with outliers
-        numeric_cols = self.df.select_dtypes(include=["int64", "float64"])
-        for col in numeric_cols:
-            z_scores = (numeric_cols[col] - numeric_cols[col].mean()) / numeric_cols[col].std()
-            if (z_scores.abs() > 3).sum() > 0:
-                suggestions.append(f"📉 Consider removing outliers in '{col}'.")
+        for col in stats["outlier_columns"]:
+            suggestions.append(f"📉 Consider removing outliers in '{col}'.")
 
         return suggestions if suggestions else ["✅ No major issues found. Your dataset looks good!"]
@@ -0,0 +1,273 @@
+# row_hash.py - Persistent 64-bit row-hash index for duplicates, plus MinHash/LSH near-duplicates
+import weakref
+import numpy as np
+import pandas as pd
+
+KEEP_POLICIES = {"first": "first", "last": "last", "none": False, False: False}
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+_BLOCK = 1 << 20  # shingles hashed per block, bounds MinHash memory
+
+
+def hash_column(series):
+    """64-bit hash of every value in ``series`` (equal values, including NaN, hash equally)."""
+    if pd.api.types.is_float_dtype(series.dtype):
+        series = series + 0.0  # -0.0 becomes 0.0: equal for DataFrame.duplicated, different bits for the hash
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def _multiplier(position):
+    # Odd, well-mixed weight per column, so rows with values swapped between columns differ
+    return pd.util.hash_array(np.array([position + 1], dtype=np.uint64))[0] | np.uint64(1)
+
+
+class RowHashIndex:
+    """One 64-bit hash per row: the weighted sum (mod 2**64) of its column hashes.
+
+    Because the row hash is a sum, a rewritten column is patched in by
+    subtracting its old contribution and adding the new one, and dropped rows
+    are just removed, so the index follows the frame without rehashing it.
+    Counts treat equal hashes as equal rows; a false match needs a 64-bit
+    collision (about 1 in 370,000 for ten million distinct rows). Before rows are
+    dropped, ``duplicated(frame=df)`` checks each group against its values.
+    """
+
+    def __init__(self, hashes, multipliers):
+        self.hashes = hashes
+        self.multipliers = multipliers  # column -> weight, in subset order
+
+    @classmethod
+    def build(cls, df, subset=None):
+        columns = list(df.columns if subset is None else subset)
+        hashes = np.zeros(len(df), dtype=np.uint64)
+        multipliers = {}
+        for position, col in enumerate(columns):
+            multipliers[col] = _multiplier(position)
+            hashes += hash_column(df[col]) * multipliers[col]
+        return cls(hashes, multipliers)
+
+    @property
+    def columns(self):
+        return list(self.multipliers)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def duplicated(self, keep="first", frame=None):
+        """Boolean mask of repeated rows; ``keep`` is "first", "last" or "none" (mark every copy).
+
+        With ``frame`` (the indexed frame), rows that share a hash are compared
+        with the first row of their group, so a hash collision never marks a
+        distinct row.
+        """
+        mask = pd.Series(self.hashes).duplicated(keep=KEEP_POLICIES[keep]).to_numpy()
+        if frame is None or not mask.any():
+            return mask
+        candidates = np.flatnonzero(pd.Series(self.hashes).duplicated(keep=False).to_numpy())
+        codes, _ = pd.factorize(self.hashes[candidates])
+        _, first = np.unique(codes, return_index=True)
+        values = frame[self.columns]
+        rows = values.take(candidates).reset_index(drop=True)
+        heads = values.take(candidates[first[codes]]).reset_index(drop=True)
+        same = (rows == heads).fillna(False) | (rows.isna() & heads.isna())
+        if same.to_numpy(dtype=bool).all():
+            return mask
+        # A real collision: settle the groups that share a hash on their values
+        mask = np.zeros(len(self.hashes), dtype=bool)
+        mask[candidates] = rows.duplicated(keep=KEEP_POLICIES[keep]).to_numpy()
+        return mask
+
+    def count(self, keep="first"):
+        return int(self.duplicated(keep).sum())
+
+    def take(self, keep):
+        """Index of the rows selected by ``keep`` (a boolean mask or positions)."""
+        return RowHashIndex(self.hashes[keep], dict(self.multipliers))
+
+    def update(self, old, new, columns):
+        """Index of ``new``, which equals ``old`` except in ``columns``."""
+        hashes = self.hashes.copy()
+        for col in columns:
+            if col in self.multipliers:
+                hashes += (hash_column(new[col]) - hash_column(old[col])) * self.multipliers[col]
+        return RowHashIndex(hashes, dict(self.multipliers))
+
+    def drop(self, old, columns):
+        """Index without ``columns`` (their values are read from ``old``)."""
+        hashes = self.hashes.copy()
+        multipliers = dict(self.multipliers)
+        for col in columns:
+            if col in multipliers:
+                hashes -= hash_column(old[col]) * multipliers.pop(col)
+        return RowHashIndex(hashes, multipliers)
+
+    def rename(self, mapping):
+        multipliers = {mapping.get(col, col): weight for col, weight in self.multipliers.items()}
+        return RowHashIndex(self.hashes, multipliers)
+
+
+# 🗂️ Index Registry (one set of indexes per live frame)
+_indexes = {}  # id(df) -> (weakref to df, {subset key: RowHashIndex}, shallow copy of df, fingerprint)
+
+
+def _fingerprint(df):
+    # With copy-on-write, writing into a frame whose arrays are also held by the
+    # registry's shallow copy gives it new arrays, so any in-place edit changes this
+    return tuple(map(id, df._mgr.arrays))
+
+
+def _entry(df, create=False):
+    """The indexes of ``df``; they are dropped if ``df`` was edited in place since they were built."""
+    key = id(df)
+    entry = _indexes.get(key)
+    if entry is not None and entry[0]() is df:
+        if entry[3] == _fingerprint(df):
+            return entry[1]
+        del _indexes[key]
+    if not create:
+        return None
+    _indexes[key] = (weakref.ref(df, lambda _: _indexes.pop(key, None)), {}, df.copy(deep=False), _fingerprint(df))
+    return _indexes[key][1]
+
+
+def _valid(index, df, subset):
+    if len(index) != len(df):
+        return False
+    if subset is None:
+        return index.columns == list(df.columns)
+    return all(col in df.columns for col in subset)
+
+
+def index_for(df, subset=None):
+    """The row-hash index of ``df`` over ``subset`` (all columns by default), built once and reused."""
+    indexes = _entry(df, create=True)
+    key = None if subset is None else tuple(subset)
+    index = indexes.get(key)
+    if index is None or not _valid(index, df, subset):
+        index = indexes[key] = RowHashIndex.build(df, subset)
+    return index
+
+
+def forget(df):
+    """Drop the indexes of ``df`` (in-place edits are also noticed on the next lookup)."""
+    _indexes.pop(id(df), None)
+
+
+def carry(old, new, rows=None, columns=None, dropped=None, rename=None):
+    """Give ``new`` the indexes of ``old``, patched for one change instead of rebuilt.
+
+    ``rows`` is a mask of rows of ``old`` that are gone from ``new``; ``columns``
+    were rewritten; ``dropped`` columns were removed; ``rename`` maps old names
+    to new. Nothing happens if ``old`` has no index yet.
+    """
+    indexes = _entry(old)
+    if not indexes or new is old:
+        return
+    derived = {}
+    for key, index in indexes.items():
+        if len(index) != len(old):
+            continue
+        if rows is not None:
+            index = index.take(~np.asarray(rows, dtype=bool))
+        if columns is not None:
+            index = index.update(old, new, columns)
+        if dropped is not None:
+            if key is not None and set(key) & set(dropped):
+                continue
+            index = index.drop(old, dropped)
+        if rename is not None:
+            index = index.rename(rename)
+            key = None if key is None else tuple(rename.get(col, col) for col in key)
+        derived[key] = index
+    _entry(new, create=True).update(derived)
+
+
+def duplicate_count(df, subset=None, keep="first"):
+    """Number of duplicate rows in ``df``, from its cached row-hash index."""
+    return index_for(df, subset).count(keep)
+
+
+# 🧬 Near-Duplicates (MinHash + LSH)
+def _normalize(values):
+    return pd.Series(values, dtype=object).astype(str).str.lower().str.split().str.join(" ")
+
+
+def _shingle_hashes(values, ngram):
+    """Hashed character n-grams of each value, grouped by value: (starts, hashes)."""
+    grams, lengths = [], []
+    for value in values:
+        padded = f" {value} "
+        pieces = {padded[i:i + ngram] for i in range(max(len(padded) - ngram + 1, 1))}
+        grams.extend(pieces)
+        lengths.append(len(pieces))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    return starts, pd.util.hash_array(np.array(grams, dtype=object))
+
+
+def _signatures(starts, hashes, permutations, seed):
+    """MinHash signature per value (values x permutations), via multiply-shift hashing."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, permutations, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, permutations, dtype=np.uint64)
+    ends = np.append(starts[1:], len(hashes))
+    signatures = np.empty((len(starts), permutations), dtype=np.uint32)
+    first = 0
+    while first < len(starts):
+        # Whole values per block, about _BLOCK shingles each
+        last = max(int(np.searchsorted(ends, starts[first] + _BLOCK, side="right")), first + 1)
+        lo, hi = starts[first], ends[last - 1]
+        # Permutations x shingles, so each reduceat segment is contiguous in memory
+        permuted = ((a[:, None] * hashes[None, lo:hi] + b[:, None]) >> np.uint64(32)).astype(np.uint32)
+        signatures[first:last] = np.minimum.reduceat(permuted, starts[first:last] - lo, axis=1).T
+        first = last
+    return signatures
+
+
+def _components(size, left, right):
+    """Connected-component label (smallest member) of every node, by min-label propagation."""
+    labels = np.arange(size)
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, low)
+        np.minimum.at(updated, right, low)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def near_duplicate_groups(series, threshold=0.8, ngram=3, permutations=MINHASH_PERMUTATIONS,
+                          bands=LSH_BANDS, seed=0):
+    """Group label per row of a text column; rows whose normalized text is near-identical share a label.
+
+    Text is lowercased with whitespace collapsed, then each distinct value gets a
+    MinHash signature of its character ``ngram``s. LSH banding proposes
+    candidates and only pairs with estimated Jaccard similarity >= ``threshold``
+    are joined, so work grows with the number of distinct values, not rows.
+    Missing values get -1.
+    """
+    codes, uniques = pd.factorize(series)
+    normal_codes, normal = pd.factorize(_normalize(uniques))
+    labels = np.full(len(normal), 0, dtype=np.int64)
+    if len(normal) > 1:
+        signatures = _signatures(*_shingle_hashes(normal, ngram), permutations, seed)
+        rows = permutations // bands
+        left, right = [], []
+        for band in range(bands):
+            keys = pd.util.hash_pandas_object(pd.DataFrame(signatures[:, band * rows:(band + 1) * rows]),
+                                              index=False).to_numpy()
+            # Compare every bucket member with the bucket's first member (linear, not all pairs)
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            heads = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            head_of = order[np.repeat(heads, np.diff(np.r_[heads, len(order)]))]
+            pairs = head_of != order
+            left.append(head_of[pairs])
+            right.append(order[pairs])
+        left, right = np.concatenate(left), np.concatenate(right)
+        similar = (signatures[left] == signatures[right]).mean(axis=1) >= threshold
+        labels = _components(len(normal), left[similar], right[similar])
+    labels = pd.factorize(labels)[0]
+    result = np.where(codes >= 0, labels[normal_codes[codes]], -1)
+    return pd.Series(result, index=series.index, name=series.name)
@@ -0,0 +1,232 @@
+# server.py - Long-running cleaning service: an asyncio HTTP API in front of warm worker processes
+import os
+import json
+import time
+import signal
+import asyncio
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
+from scrubpy.batch import clean_file, expand_inputs, load_recipe, output_paths
+from scrubpy import parallel
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 100
+FINISHED_JOBS_KEPT = 10_000   # finished jobs stay queryable until this many newer ones finish
+THROUGHPUT_WINDOW = 60        # seconds of history behind the recent throughput figures
+MAX_BODY_BYTES = 1 << 20
+
+
+def _warm_worker():
+    """Pool initializer: pay pandas and scrubpy imports once per process, and keep column work on one core."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C stops the server, which then shuts the pool down
+    import pandas  # noqa: F401
+    import scrubpy.core  # noqa: F401
+    parallel.set_workers(1)
+
+
+def _ready():
+    return os.getpid()
+
+
+def _first_job_number(output_dir):
+    """One past the highest job directory already in ``output_dir``, so a restart never reuses one."""
+    try:
+        numbers = [int(name) for name in os.listdir(output_dir) if name.isdigit()]
+    except OSError:
+        numbers = []
+    return max(numbers, default=0) + 1
+
+
+class CleaningServer:
+    """Queue of files to clean with a recipe, drained by ``workers`` warm processes.
+
+    The queue holds at most ``max_queue`` files; a submission that doesn't fit
+    is refused whole with HTTP 429, so upstream drops slow down instead of
+    growing memory without bound. Each job writes its files to
+    ``output_dir/<job id>/``. API (JSON in and out)::
+
+        POST /jobs           {"path": "file, directory or glob", "recipe": "optional recipe file"}
+        GET  /jobs/<id>      status (queued, running, done or failed) and per-file metrics of one job
+        GET  /metrics        queue depth, in-flight files and throughput
+        GET  /health
+    """
+
+    def __init__(self, recipe, output_dir="cleaned", output_format=None, workers=None,
+                 max_queue=DEFAULT_QUEUE_SIZE, chunksize=None):
+        self.recipe = recipe
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.queue = None  # created on the serving loop
+        self.pool = None
+        self.jobs = {}
+        self._done = collections.deque()  # ids of finished jobs, oldest first
+        self._ids = itertools.count(_first_job_number(output_dir))
+        self._finished = collections.deque()  # (finish time, rows out) inside the throughput window
+        self._latencies = collections.deque(maxlen=1_000)
+        self.started = time.time()
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.totals = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0, "rows": 0}
+
+    # 🏭 Workers
+    async def start(self):
+        """Create the queue and the process pool, and wait until every worker process is up."""
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)))
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job, path, recipe, destination, queued = await self.queue.get()
+            if job["status"] == "queued":
+                job["status"] = "running"
+            self.in_flight += 1
+            output_format = self.output_format or recipe.get("output_format", "csv")
+            try:
+                metrics = await loop.run_in_executor(self.pool, clean_file, path, recipe, self.output_dir,
+                                                     output_format, self.chunksize, False, destination)
+            except Exception as e:  # a worker died; clean_file itself never raises
+                metrics = {"file": path, "rows_out": None, "error": f"{type(e).__name__}: {e}"}
+            finally:
+                self.in_flight -= 1
+                self.queue.task_done()
+            self._record(job, metrics, queued)
+
+    def _record(self, job, metrics, queued):
+        now = time.time()
+        job["results"].append(metrics)
+        job["pending"] -= 1
+        if job["pending"] == 0:
+            job["status"] = "failed" if any(result["error"] for result in job["results"]) else "done"
+            job["finished"] = now
+            self._done.append(job["id"])
+            while len(self._done) > FINISHED_JOBS_KEPT:
+                self.jobs.pop(self._done.popleft(), None)
+        self.totals["failed" if metrics["error"] else "completed"] += 1
+        self.totals["rows"] += metrics["rows_out"] or 0
+        self._finished.append((now, metrics["rows_out"] or 0))
+        self._latencies.append(now - queued)
+
+    # 📥 Submissions
+    def _resolve(self, path, recipe):
+        """Files matched by ``path`` and the recipe to clean them with (file system work, off the loop)."""
+        return expand_inputs([path]), load_recipe(recipe) if recipe else self.recipe
+
+    async def submit(self, path, recipe=None):
+        """Queue every file matched by ``path``. Returns (HTTP status, response body)."""
+        files, recipe = await asyncio.get_running_loop().run_in_executor(None, self._resolve, path, recipe)
+        if not files:
+            return 404, {"error": f"no files match {path!r}"}
+        if len(files) > self.queue.maxsize:
+            return 413, {"error": f"{len(files)} files never fit a queue of {self.queue.maxsize}; split the submission"}
+        if self.queue.maxsize - self.queue.qsize() < len(files):
+            self.totals["rejected"] += len(files)
+            return 429, {"error": "queue full, retry later", "queue_depth": self.queue.qsize(),
+                         "capacity": self.queue.maxsize}
+        job_id = str(next(self._ids))
+        output_format = self.output_format or recipe.get("output_format", "csv")
+        destinations = output_paths(files, os.path.join(self.output_dir, job_id), output_format)
+        queued = time.time()
+        job = self.jobs[job_id] = {"id": job_id, "status": "queued", "files": files, "pending": len(files),
+                                   "results": [], "submitted": queued, "finished": None}
+        for file in files:
+            self.queue.put_nowait((job, file, recipe, destinations[file], queued))
+        self.totals["accepted"] += len(files)
+        return 202, {"id": job_id, "files": len(files), "queue_depth": self.queue.qsize()}
+
+    # 📈 Metrics
+    def metrics(self):
+        now = time.time()
+        while self._finished and self._finished[0][0] < now - THROUGHPUT_WINDOW:
+            self._finished.popleft()
+        window = min(THROUGHPUT_WINDOW, max(now - self.started, 1e-9))
+        latencies = sorted(self._latencies)
+        percentile = lambda q: round(latencies[int(q * (len(latencies) - 1))], 4) if latencies else None  # noqa: E731
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "in_flight": self.in_flight,
+            "workers": self.workers,
+            **self.totals,
+            "files_per_second": round(len(self._finished) / window, 4),
+            "rows_per_second": round(sum(rows for _, rows in self._finished) / window, 2),
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+            "uptime": round(now - self.started, 1),
+        }
+
+    # 🌐 HTTP
+    async def route(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/metrics":
+            return 200, self.metrics()
+        if method == "GET" and path.startswith("/jobs/"):
+            job = self.jobs.get(path[len("/jobs/"):])
+            if job is None:
+                return 404, {"error": "unknown job"}
+            return 200, {key: value for key, value in job.items() if key != "pending"}
+        if method == "POST" and path == "/jobs":
+            try:
+                request = json.loads(body or b"{}")
+                return await self.submit(request["path"], request.get("recipe"))
+            except (ValueError, KeyError, TypeError, ImportError) as e:
+                return 400, {"error": f"{type(e).__name__}: {e}"}
+            except OSError as e:
+                return 404, {"error": str(e)}
+        return 404, {"error": f"no route for {method} {path}"}
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP/1.1 request per connection."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while (line := (await reader.readline()).decode("latin-1").strip()):
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if len(request_line) < 2 or length > MAX_BODY_BYTES:
+                status, payload = 400, {"error": "bad request"}
+            else:
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.route(request_line[0].upper(), request_line[1].split("?")[0], body)
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:  # answer anyway rather than drop the connection
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        data = json.dumps(payload, default=str).encode()
+        reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 413: "Content Too Large",
+                  429: "Too Many Requests", 500: "Internal Server Error"}
+        head = [f"HTTP/1.1 {status} {reason[status]}", "Content-Type: application/json",
+                f"Content-Length: {len(data)}", "Connection: close"]
+        if status == 429:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        """Run until cancelled. ``ready`` (a callable) is told the bound (host, port)."""
+        await self.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        try:
+            if ready is not None:
+                ready(server.sockets[0].getsockname()[:2])
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
@@ -0,0 +1,303 @@
+# sketches.py - Mergeable sketches for approximate profiling of very large datasets
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values):
+    """64-bit hash of each value in a Series, Index or array."""
+    values = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values)
+    return pd.util.hash_array(values, categorize=True)
+
+
+def combine_hashes(column_hashes, rows):
+    """One order-sensitive 64-bit hash per row from per-column hash arrays."""
+    combined = np.full(rows, 0x345678, dtype=np.uint64)
+    for hashes in column_hashes:
+        combined = (combined ^ hashes) * np.uint64(1000003)
+    return combined
+
+
+# 🔢 Distinct counts
+class HyperLogLog:
+    """Distinct-count sketch with relative standard error ``1.04 / sqrt(2**p)``."""
+
+    def __init__(self, p=14):
+        if not 11 <= p <= 18:  # p >= 11 keeps the rank bits exact in float64
+            raise ValueError("HyperLogLog precision must be between 11 and 18")
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return self
+        bits = 64 - self.p
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # frexp's exponent is the bit length of rest
+        _, length = np.frexp(rest.astype(np.float64))
+        rank = (bits - length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def add(self, values):
+        return self.add_hashes(hash_values(values))
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int((self.registers == 0).sum())
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)  # linear counting for small cardinalities
+        return float(raw)
+
+
+# 🏆 Heavy hitters
+class CountMinSketch:
+    """Frequency table over 64-bit hashes; estimates are high by at most ``error_bound`` with 98% probability."""
+
+    # Odd multipliers give each row of the table its own hash function
+    SEEDS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93],
+                     dtype=np.uint64)
+
+    def __init__(self, width_bits=14):
+        self.width_bits = width_bits
+        self.table = np.zeros((len(self.SEEDS), 1 << width_bits), dtype=np.int64)
+        self.total = 0
+
+    def _buckets(self, hashes):
+        return (np.asarray(hashes, dtype=np.uint64)[None, :] * self.SEEDS[:, None]) >> np.uint64(64 - self.width_bits)
+
+    def add_hashes(self, hashes):
+        for row, buckets in zip(self.table, self._buckets(hashes)):
+            row += np.bincount(buckets.astype(np.intp), minlength=len(row))
+        self.total += len(hashes)
+        return self
+
+    def query(self, hashes):
+        buckets = self._buckets(hashes).astype(np.intp)
+        return np.take_along_axis(self.table, buckets, axis=1).min(axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    @property
+    def error_bound(self):
+        return int(np.ceil(np.e / self.table.shape[1] * self.total))
+
+
+class HeavyHitters:
+    """Top-k frequent values, tracked by hash with a Count-Min sketch; no exact counting.
+
+    Only the ``k`` hashes with the highest estimates keep their value, so memory
+    is fixed. Reported counts are high by at most ``error_bound``.
+    """
+
+    def __init__(self, k=64, width_bits=14):
+        self.k = k
+        self.sketch = CountMinSketch(width_bits)
+        self.candidates = {}  # hash -> value
+
+    @property
+    def error_bound(self):
+        return self.sketch.error_bound
+
+    def add_hashes(self, hashes, values):
+        """Count ``hashes`` (one per value in ``values``, nulls already removed)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return self
+        self.sketch.add_hashes(hashes)
+        estimates = self.sketch.query(hashes)
+        # A value can only enter the top k if it beats the weakest current candidate
+        floor = self._estimates().min() if len(self.candidates) >= self.k else 0
+        rows = np.flatnonzero(estimates >= floor)
+        new, first = np.unique(hashes[rows], return_index=True)
+        best = np.argsort(-estimates[rows[first]], kind="stable")[:self.k]
+        values = np.asarray(values, dtype=object)[rows[first[best]]]
+        self.candidates.update(zip(new[best].tolist(), values.tolist()))
+        return self._trim()
+
+    def add(self, values):
+        values = pd.Series(values).dropna()
+        return self.add_hashes(hash_values(values), values.to_numpy())
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        for key, value in other.candidates.items():
+            self.candidates.setdefault(key, value)
+        return self._trim()
+
+    def _estimates(self):
+        return self.sketch.query(np.fromiter(self.candidates, dtype=np.uint64, count=len(self.candidates)))
+
+    def _trim(self):
+        if len(self.candidates) > self.k:
+            keys = list(self.candidates)
+            keep = np.argsort(-self._estimates(), kind="stable")[:self.k]
+            self.candidates = {keys[i]: self.candidates[keys[i]] for i in keep}
+        return self
+
+    def top(self, n=3):
+        if not self.candidates:
+            return {}
+        estimates = self._estimates()
+        ranked = sorted(zip(self.candidates.values(), estimates.tolist()), key=lambda item: item[1], reverse=True)
+        return dict(ranked[:n])
+
+
+# 📏 Quantiles
+class TDigest:
+    """Merging t-digest for quantiles, with rank error about ``pi * sqrt(q(1-q)) / compression``."""
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            values = np.sort(values)
+            self.min = min(self.min, values[0])
+            self.max = max(self.max, values[-1])
+            batch = TDigest(self.compression)
+            batch._compress(values, np.ones(len(values)), presorted=True)
+            self._compress(np.concatenate([self.means, batch.means]),
+                           np.concatenate([self.weights, batch.weights]))
+        return self
+
+    def merge(self, other):
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights, presorted=False):
+        if not presorted:
+            order = np.argsort(means, kind="stable")
+            means, weights = means[order], weights[order]
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        # k1 scale function: every centroid spans at most one unit of k
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        bins = np.floor(k - k.min()).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        sums = np.add.reduceat(means * weights, starts)
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = sums / self.weights
+
+    def quantile(self, q):
+        if not len(self.means):
+            return np.nan
+        if len(self.means) == 1:
+            return float(self.means[0])
+        positions = (np.cumsum(self.weights) - self.weights / 2) / self.count
+        return float(np.interp(q, np.r_[0.0, positions, 1.0], np.r_[self.min, self.means, self.max]))
+
+    def rank_error(self, q):
+        return float(np.pi * np.sqrt(q * (1 - q)) / self.compression)
+
+
+# 📋 Whole-frame sketch
+class ProfileSketch:
+    """Per-column sketches plus a row-level HyperLogLog, mergeable across chunks and processes.
+
+    Null counts, min/max and moments are exact; distinct counts, top categories,
+    quantiles and the duplicate count are approximate, with the bounds each sketch reports.
+    """
+
+    def __init__(self, p=14, k=64, compression=200):
+        self.p, self.k, self.compression = p, k, compression
+        self.rows = 0
+        self.row_hll = HyperLogLog(p)
+        self.missing = {}
+        self.moments = {}   # column -> [count, mean, m2]
+        self.digests = {}
+        self.distinct = {}
+        self.heavy = {}
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs):
+        sketch = cls(**kwargs)
+        for chunk in chunks:
+            sketch.update(chunk)
+        return sketch
+
+    def update(self, df):
+        self.rows += len(df)
+        nulls = df.isnull()
+        for col, count in nulls.sum().items():
+            self.missing[col] = self.missing.get(col, 0) + int(count)
+        text = set(df.select_dtypes(include=["object", "category", "string"]).columns)
+        # Each column is hashed once; the hashes feed both the row hash and the column's sketches
+        column_hashes = []
+        for position, col in enumerate(df.columns):
+            series = df.iloc[:, position]
+            hashes = pd.util.hash_array(series.to_numpy(), categorize=False)
+            column_hashes.append(hashes)
+            if col in text:
+                present = ~nulls.iloc[:, position].to_numpy()
+                self.distinct.setdefault(col, HyperLogLog(self.p)).add_hashes(hashes[present])
+                self.heavy.setdefault(col, HeavyHitters(self.k)).add_hashes(hashes[present],
+                                                                            series.to_numpy()[present])
+        self.row_hll.add_hashes(combine_hashes(column_hashes, len(df)))
+        for col in df.select_dtypes(include="number").columns:
+            values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+            values = values[~np.isnan(values)]
+            self._merge_moments(col, [len(values), values.mean() if len(values) else 0.0,
+                                      ((values - values.mean()) ** 2).sum() if len(values) else 0.0])
+            self.digests.setdefault(col, TDigest(self.compression)).add(values)
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.row_hll.merge(other.row_hll)
+        for col, nulls in other.missing.items():
+            self.missing[col] = self.missing.get(col, 0) + nulls
+        for col, moments in other.moments.items():
+            self._merge_moments(col, moments)
+        for attr in ("digests", "distinct", "heavy"):
+            mine = getattr(self, attr)
+            for col, sketch in getattr(other, attr).items():
+                if col in mine:
+                    mine[col].merge(sketch)
+                else:
+                    mine[col] = sketch
+        return self
+
+    def _merge_moments(self, col, moments):
+        n_b, mean_b, m2_b = moments
+        n_a, mean_a, m2_a = self.moments.get(col, [0, 0.0, 0.0])
+        total = n_a + n_b
+        if not total:
+            self.moments[col] = [0, 0.0, 0.0]
+            return
+        delta = mean_b - mean_a
+        self.moments[col] = [total, mean_a + delta * n_b / total,
+                             m2_a + m2_b + delta ** 2 * n_a * n_b / total]
+
+    def duplicate_estimate(self):
+        """Estimated duplicate rows and the absolute error (one standard error)."""
+        distinct = min(self.row_hll.estimate(), self.rows)
+        return max(int(round(self.rows - distinct)), 0), int(np.ceil(distinct * self.row_hll.relative_error))
@@ -0,0 +1,288 @@
+# streaming.py - Chunked, out-of-core cleaning for datasets larger than memory
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from scrubpy.outliers import RunningMoments, zscore_limits, limits_mask, DEFAULT_THRESHOLDS
+from scrubpy.sketches import TDigest
+from scrubpy.core import (
+    load_dataset, fill_missing_values, standardize_text, fix_column_names,
+    convert_column_types
+)
+from scrubpy.formats import detect_format
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Operations that only look at one row at a time and can run on each chunk as-is
+ROW_OPERATIONS = {
+    "drop_missing_values": lambda chunk, subset=None: chunk.dropna(subset=subset),
+    "fill_missing_values": fill_missing_values,
+    "standardize_text": standardize_text,
+    "fix_column_names": fix_column_names,
+    "convert_column_types": convert_column_types,
+    "drop_columns": lambda chunk, columns: chunk.drop(columns=columns),
+}
+
+
+def _row_hashes(chunk, subset=None):
+    """64-bit hash per row, stable across chunks whose numeric dtypes differ."""
+    frame = chunk if subset is None else chunk[subset]
+    # Upstream stages can still turn int into float in some chunks (e.g. dropna); hash both the same
+    # way, and add 0.0 so -0.0 and 0.0 hash alike, as they compare equal
+    numeric = frame.select_dtypes(include=["number", "bool"]).columns
+    if len(numeric):
+        frame = frame.astype({col: "float64" for col in numeric})
+        frame[numeric] = frame[numeric] + 0.0
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+# 🗑️ Remove Duplicates (bounded memory)
+PAIR_BYTES = 16                      # one (hash, row number) pair on disk
+MAX_PARTITION_BYTES = 64 * 2 ** 20   # partition files larger than this are split again before sorting
+
+
+class StreamingDeduplicator:
+    """Drop repeated rows across chunks, keeping the first occurrence.
+
+    Rows count as equal when their 64-bit hashes are: the values themselves are
+    never compared, so for n distinct rows a false match (a distinct row
+    dropped as a repeat) has probability about n**2 / 2**65, roughly 1 in
+    370,000 for ten million rows.
+
+    Row hashes are spilled to ``partitions`` files on disk by hash value. A file
+    that grows past ``max_partition_bytes`` is split again on the next digits of
+    the hash, so only one partition of at most that size is ever sorted in
+    memory, however many rows the file has. The rows to drop are recorded in an
+    on-disk bitmap (one byte per row) that the final pass reads back.
+    """
+
+    needs_pass = True
+
+    def __init__(self, workdir, subset=None, partitions=16, max_partition_bytes=MAX_PARTITION_BYTES):
+        self.subset = subset
+        self.partitions = partitions
+        self.max_partition_bytes = max(max_partition_bytes, PAIR_BYTES)
+        self.workdir = workdir
+        self._paths = [os.path.join(workdir, f"dedupe_{i}.bin") for i in range(partitions)]
+        self._row_count = 0
+        self._drop = None
+        self._cursor = 0
+
+    def _spill(self, pairs, buckets, paths):
+        for i, path in enumerate(paths):
+            selected = buckets == i
+            if selected.any():
+                with open(path, "ab") as handle:
+                    pairs[selected].tofile(handle)
+
+    def observe(self, chunk):
+        """First pass: record (hash, row number) pairs per partition."""
+        hashes = _row_hashes(chunk, self.subset)
+        rows = np.arange(self._row_count, self._row_count + len(chunk), dtype=np.uint64)
+        self._row_count += len(chunk)
+        self._spill(np.stack([hashes, rows], axis=1), hashes % np.uint64(self.partitions), self._paths)
+
+    def _blocks(self, path):
+        """Read a partition file back in pieces of at most ``max_partition_bytes``."""
+        with open(path, "rb") as handle:
+            while True:
+                block = np.fromfile(handle, dtype=np.uint64, count=self.max_partition_bytes // 8 // 2 * 2)
+                if not block.size:
+                    return
+                yield block.reshape(-1, 2)
+
+    def _settle(self, path, depth=1):
+        """Mark the repeated rows of one partition file, splitting it first if it's too big to sort.
+
+        Equal hashes are taken as equal rows (see the class docstring for the odds of a collision).
+        """
+        if os.path.getsize(path) <= self.max_partition_bytes:
+            pairs = np.fromfile(path, dtype=np.uint64).reshape(-1, 2)
+            order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+            hashes, rows = pairs[order, 0], pairs[order, 1]
+            repeated = np.empty(len(hashes), dtype=bool)
+            repeated[:1] = False
+            repeated[1:] = hashes[1:] == hashes[:-1]
+            self._drop[rows[repeated].astype(np.int64)] = True
+        elif self.partitions ** depth >= 2 ** 64:
+            # Every digit is used up, so the file holds one hash: keep only its first row
+            first = min(int(pairs[:, 1].min()) for pairs in self._blocks(path))
+            for pairs in self._blocks(path):
+                rows = pairs[:, 1].astype(np.int64)
+                self._drop[rows[rows != first]] = True
+        else:
+            paths = [f"{path[:-len('.bin')]}_{i}.bin" for i in range(self.partitions)]
+            digit = np.uint64(self.partitions ** depth)
+            for pairs in self._blocks(path):
+                self._spill(pairs, pairs[:, 0] // digit % np.uint64(self.partitions), paths)
+            os.remove(path)
+            for part in paths:
+                if os.path.exists(part):
+                    self._settle(part, depth + 1)
+            return
+        os.remove(path)
+
+    def finalize(self):
+        """Mark every row whose hash was already seen earlier in the stream."""
+        bitmap_path = os.path.join(self.workdir, "dedupe_drop.bin")
+        self._drop = np.memmap(bitmap_path, dtype=np.bool_, mode="w+", shape=(max(self._row_count, 1),))
+        for path in self._paths:
+            if os.path.exists(path):
+                self._settle(path)
+        self._drop.flush()
+
+    def apply(self, chunk):
+        """Final pass: filter the chunk against the bitmap."""
+        drop = np.asarray(self._drop[self._cursor:self._cursor + len(chunk)])
+        self._cursor += len(chunk)
+        return chunk[~drop]
+
+    def reset(self):
+        self._cursor = 0
+
+
+# 📉 Remove Outliers (two-pass Z-score or IQR)
+class StreamingOutlierFilter:
+    """Drop rows with an outlier in any of ``column`` (a label or a list) across chunks.
+
+    The first pass keeps running moments ("zscore", exact) or a t-digest per
+    column ("iqr", quartiles within the digest's rank error), so memory stays
+    constant however large the file is. "mad" needs a second pass over the
+    data and isn't supported here. Missing values are never outliers.
+    """
+
+    needs_pass = True
+
+    def __init__(self, column, threshold=None, method="zscore"):
+        if method not in ("zscore", "iqr"):
+            raise ValueError("Streaming outlier removal supports the 'zscore' and 'iqr' methods")
+        self.columns = list(column) if pd.api.types.is_list_like(column) else [column]
+        self.method = method
+        self.threshold = DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+        self.moments = RunningMoments(len(self.columns))
+        self.digests = [TDigest() for _ in self.columns]
+
+    def _coerce(self, chunk):
+        return np.column_stack([pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+                                for col in self.columns])
+
+    def observe(self, chunk):
+        values = self._coerce(chunk)
+        if self.method == "zscore":
+            self.moments.update(values)
+        else:
+            for digest, column in zip(self.digests, values.T):
+                digest.add(column)
+
+    def finalize(self):
+        if self.method == "zscore":
+            self.low, self.high = zscore_limits(self.moments.mean, self.moments.std(), self.threshold)
+        else:
+            q1 = np.array([digest.quantile(0.25) for digest in self.digests])
+            q3 = np.array([digest.quantile(0.75) for digest in self.digests])
+            self.low, self.high = q1 - self.threshold * (q3 - q1), q3 + self.threshold * (q3 - q1)
+
+    def apply(self, chunk):
+        outliers = limits_mask(self._coerce(chunk), self.low, self.high, inclusive=self.method == "zscore")
+        return chunk[~outliers.any(axis=1)]
+
+
+def _build_stage(name, kwargs, workdir):
+    if name in ROW_OPERATIONS:
+        func = ROW_OPERATIONS[name]
+        return lambda chunk: func(chunk, **kwargs)
+    if name == "remove_duplicates":
+        return StreamingDeduplicator(workdir, **kwargs)
+    if name == "remove_outliers":
+        return StreamingOutlierFilter(**kwargs)
+    raise ValueError(f"Unsupported streaming operation: {name}")
+
+
+def _chunks(filepath, chunksize, dtype=None):
+    chunks = load_dataset(filepath, chunksize=chunksize, dtype=dtype)
+    if chunks is None:
+        raise ValueError(f"Could not read {filepath} for streaming")
+    return chunks
+
+
+def _csv_dtypes(filepath, chunksize):
+    """One dtype per CSV column for the whole file, chosen the way a full read would.
+
+    read_csv infers types chunk by chunk, so a column can be int in one chunk and
+    float or text in the next; equal values would then hash and print differently.
+    Columns that are empty everywhere are left to inference.
+    """
+    kinds, nullable = {}, set()
+    for chunk in _chunks(filepath, chunksize):
+        for col in chunk.columns:
+            values = chunk[col]
+            if values.isna().any():
+                nullable.add(col)
+            if not values.isna().all():
+                kinds.setdefault(col, set()).add(values.dtype.kind)
+    dtypes = {}
+    for col, seen in kinds.items():
+        if seen == {"b"}:
+            dtypes[col] = "boolean" if col in nullable else "bool"
+        elif seen == {"i"} and col not in nullable:
+            dtypes[col] = "int64"
+        elif seen <= {"i", "f"}:
+            dtypes[col] = "float64"
+        else:
+            dtypes[col] = "str"
+    return dtypes
+
+
+def _run_stages(chunk, stages):
+    for stage in stages:
+        chunk = stage.apply(chunk) if hasattr(stage, "apply") else stage(chunk)
+    return chunk
+
+
+# 🌊 Stream Clean
+def stream_clean(filepath, output_file, steps, chunksize=DEFAULT_CHUNKSIZE, workdir=None):
+    """Clean a CSV chunk by chunk and write the result to ``output_file``.
+
+    ``steps`` is a list of ``(operation_name, kwargs)`` pairs using the names of
+    the functions in ``scrubpy.core``. Row-wise operations run on each chunk;
+    ``remove_duplicates`` and ``remove_outliers`` each add one extra read of the
+    input to build their global state. A CSV input is read once more up front to
+    fix one dtype per column. Memory use is bounded by ``chunksize`` and,
+    for ``remove_duplicates``, by its ``max_partition_bytes``.
+    """
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="scrubpy_")
+    try:
+        dtype = _csv_dtypes(filepath, chunksize) if detect_format(filepath) == "csv" else None
+        stages = [_build_stage(name, dict(kwargs or {}), workdir) for name, kwargs in steps]
+
+        # One extra pass per global stage, replaying everything upstream of it
+        for position, stage in enumerate(stages):
+            if not getattr(stage, "needs_pass", False):
+                continue
+            for upstream in stages[:position]:
+                if hasattr(upstream, "reset"):
+                    upstream.reset()
+            for chunk in _chunks(filepath, chunksize, dtype):
+                chunk = _run_stages(chunk, stages[:position])
+                if not chunk.empty:
+                    stage.observe(chunk)
+            stage.finalize()
+
+        for stage in stages:
+            if hasattr(stage, "reset"):
+                stage.reset()
+
+        rows_in = rows_out = 0
+        header = True
+        for chunk in _chunks(filepath, chunksize, dtype):
+            rows_in += len(chunk)
+            chunk = _run_stages(chunk, stages)
+            rows_out += len(chunk)
+            chunk.to_csv(output_file, mode="w" if header else "a", header=header, index=False)
+            header = False
+        return {"rows_in": rows_in, "rows_out": rows_out}
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -1,13 +1,191 @@
+# undo.py - Delta-based undo history shared by the CLI and helpers
+import os
+import itertools
+import numpy as np
 import pandas as pd
+from rich.console import Console
+from scrubpy.instrument import instrumented
+
+console = Console()
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024  # 512 MB of in-memory history
+_spill_ids = itertools.count()
+
+
+class _Delta:
+    """Base for reverse deltas. Subclasses keep their payload in ``frame``."""
+
+    frame = None
+    path = None
+    _nbytes = None
+
+    @property
+    def nbytes(self):
+        if self.frame is None:
+            return 0
+        if self._nbytes is None:
+            self._nbytes = int(self.frame.memory_usage(deep=True).sum())
+        return self._nbytes
+
+    def spill(self, directory):
+        """Move the payload to a Parquet file. Returns False if it can't be written."""
+        if self.frame is None:
+            return False
+        path = os.path.join(directory, f"undo_{os.getpid()}_{next(_spill_ids)}.parquet")
+        try:
+            self.frame.to_parquet(path)
+        except Exception:
+            return False
+        self.path, self.frame = path, None
+        return True
+
+    def _payload(self):
+        if self.frame is None and self.path:
+            frame = pd.read_parquet(self.path)
+            os.remove(self.path)
+            self.path = None
+            return frame
+        return self.frame
+
+    def discard(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Snapshot(_Delta):
+    """Full copy of the frame, for operations with no cheaper reverse."""
+
+    def __init__(self, df):
+        self.frame = df.copy()
+
+    def restore(self, df):
+        return self._payload()
+
+
+class RowsDropped(_Delta):
+    """Rows removed by an operation, with their original positions and index."""
+
+    def __init__(self, df, mask):
+        mask = np.asarray(mask, dtype=bool)
+        self.frame = df[mask]
+        self.positions = np.flatnonzero(mask)
+        self.index = df.index
+
+    def restore(self, df):
+        dropped = self._payload()
+        kept = np.setdiff1d(np.arange(len(self.index)), self.positions, assume_unique=True)
+        combined = pd.concat([df.set_axis(kept), dropped.set_axis(self.positions)])
+        return combined.sort_index(kind="stable").set_axis(self.index)
+
+
+class ColumnsChanged(_Delta):
+    """Old values of the columns an operation rewrites, adds or drops."""
+
+    def __init__(self, df, columns):
+        self.frame = df[list(columns)].copy()
+        self.order = df.columns
+
+    def restore(self, df):
+        old = self._payload()
+        rest = df.drop(columns=[col for col in old.columns if col in df.columns])
+        rest = rest.drop(columns=[col for col in rest.columns if col not in self.order])
+        return pd.concat([rest, old], axis=1)[self.order]
+
+
+class ColumnsRenamed(_Delta):
+    """Old column labels only; values are untouched by a rename."""
+
+    def __init__(self, df):
+        self.names = df.columns
+
+    def restore(self, df):
+        return df.set_axis(self.names, axis=1)
+
+
+class UndoHistory:
+    """Stack of reverse deltas with a memory budget.
+
+    When the deltas held in memory exceed ``memory_budget`` bytes the oldest
+    ones are spilled to ``spill_dir`` as Parquet (if given) or forgotten.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET, spill_dir=None):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self._states = []
+
+    def __len__(self):
+        return len(self._states)
+
+    @property
+    def memory_usage(self):
+        """Bytes of history currently held in memory."""
+        return sum(state.nbytes for state in self._states)
+
+    @instrumented()
+    def save_state(self, df, rows=None, columns=None, rename=False):
+        """Record how to get back to ``df`` before an operation changes it.
+
+        Pass ``rows`` (boolean mask of rows about to be dropped), ``columns``
+        (labels about to be rewritten or dropped) or ``rename=True`` to store a
+        compact delta; otherwise the whole frame is copied.
+        """
+        if rows is not None:
+            state = RowsDropped(df, rows)
+        elif columns is not None:
+            state = ColumnsChanged(df, columns)
+        elif rename:
+            state = ColumnsRenamed(df)
+        else:
+            state = Snapshot(df)
+        self._states.append(state)
+        self._enforce_budget()
+        return state
+
+    @instrumented()
+    def undo(self, df):
+        """Return the previous state of ``df``, or None if history is empty."""
+        if not self._states:
+            return None
+        return self._states.pop().restore(df)
+
+    def clear(self):
+        for state in self._states:
+            state.discard()
+        self._states.clear()
+
+    def _enforce_budget(self):
+        in_memory = [state.nbytes for state in self._states]
+        total = sum(in_memory)
+        for state, size in zip(list(self._states), in_memory):
+            if total <= self.memory_budget:
+                break
+            if size == 0:
+                continue
+            if self.spill_dir:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                if state.spill(self.spill_dir):
+                    total -= size
+                    continue
+            if state is self._states[-1]:
+                break  # always keep the most recent step undoable
+            # Forgetting the oldest state keeps every newer delta valid
+            self._states.remove(state)
+            state.discard()
+            total -= size
+
+
+# Default history used by the CLI and the module-level helpers
+history = UndoHistory()
 
-history = []
 
 def undo_last_action(df):
-    if history:
-        return history.pop()
-    else:
+    previous = history.undo(df)
+    if previous is None:
         console.print("[bold red]❌ No previous actions to undo![/bold red]")
         return df
+    return previous
+
 
-def save_state(df):
-    history.append(df.copy())
+def save_state(df, rows=None, columns=None, rename=False):
+    history.save_state(df, rows=rows, columns=columns, rename=rename)
@@ -2,9 +2,7 @@
 import pandas as pd
 import shutil
 import os
-
-# Store dataset history for undo functionality
-data_history = []
+from scrubpy import undo
 
 def backup_dataset(filepath):
     """Create a backup of the dataset before modifications."""
@@ -12,17 +10,16 @@ def backup_dataset(filepath):
     shutil.copy(filepath, backup_path)
     print(f"[🔄] Backup created: {backup_path}")
 
-def save_state(df):
+def save_state(df, rows=None, columns=None, rename=False):
     """Save the current state of the dataset before modification."""
-    data_history.append(df.copy())
+    undo.save_state(df, rows=rows, columns=columns, rename=rename)
 
-def undo_last_change():
+def undo_last_change(df):
     """Revert to the last saved dataset state."""
-    if data_history:
-        return data_history.pop()
-    else:
+    previous = undo.history.undo(df)
+    if previous is None:
         print("[⚠️] No previous state to revert to.")
-        return None
+    return previous
 
 def confirm_action(action_name, df_before, df_after):
     """Preview the changes before confirming an action."""
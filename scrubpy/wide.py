@@ -0,0 +1,158 @@
+# wide.py - Blocked correlation and column statistics for wide numeric tables
+import warnings
+import numpy as np
+import pandas as pd
+
+WIDE_COLUMNS = 500     # from this many numeric columns statistics are blocked and wide=True is suggested
+BLOCK_COLUMNS = 256    # columns converted and correlated at a time
+DEFAULT_TOP_K = 100
+
+
+def numeric_labels(df, columns=None):
+    """Numeric (non-boolean) column labels of ``df``, or ``columns`` as given."""
+    if columns is not None:
+        return pd.Index(columns)
+    return df.select_dtypes(include="number").columns
+
+
+def sample_rows(df, sample=None, seed=0):
+    """``df`` itself, or ``sample`` of its rows drawn without replacement (kept in order)."""
+    if sample is None or sample >= len(df):
+        return df
+    rows = np.sort(np.random.default_rng(seed).choice(len(df), size=sample, replace=False))
+    return df.take(rows)
+
+
+def column_blocks(df, columns=None, block=BLOCK_COLUMNS, dtype="float64"):
+    """Yield (labels, values) for ``block`` columns at a time, NaN for missing.
+
+    Only one block is converted at a time, so memory stays at rows x block
+    instead of a float copy of the whole table.
+    """
+    columns = numeric_labels(df, columns)
+    for start in range(0, len(columns), block):
+        labels = columns[start:start + block]
+        yield labels, df[labels].to_numpy(dtype=dtype, na_value=np.nan)
+
+
+# 🔗 Correlation
+class _Prepared:
+    """One column block ready for correlation: centered values with NaN as 0, and the observed mask.
+
+    Centering (and scaling) happens in float64 before the cast to ``dtype``, so
+    a column with a large offset and a small spread (timestamps, readings near
+    1e8) keeps its variation in float32.
+    """
+
+    def __init__(self, labels, values, dtype="float32"):
+        self.labels = labels
+        observed = ~np.isnan(values)
+        self.complete = bool(observed.all())
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+            center = np.nan_to_num(np.nanmean(values, axis=0))
+        centered = np.where(observed, values - center, 0)
+        if self.complete:
+            with np.errstate(all="ignore"):
+                centered /= np.sqrt((centered ** 2).sum(axis=0))  # unit columns, so r = x'y
+        self.values = centered.astype(dtype)
+        self.mask = None if self.complete else observed.astype(dtype)
+
+    def observed(self):
+        return self.mask if self.mask is not None else np.ones_like(self.values)
+
+
+def _block_correlation(a, b):
+    """Pearson r of every column of ``a`` with every column of ``b``, over rows observed in both.
+
+    r doesn't depend on each column's scale or center, so unit-scaled
+    complete blocks and centered incomplete blocks can be mixed.
+    """
+    if a.complete and b.complete:
+        return np.clip(a.values.T @ b.values, -1, 1)
+    ma, mb = a.observed(), b.observed()
+    with np.errstate(all="ignore"):
+        n = ma.T @ mb
+        sa, sb = a.values.T @ mb, ma.T @ b.values
+        cov = a.values.T @ b.values - sa * sb / n
+        var_a = (a.values ** 2).T @ mb - sa ** 2 / n
+        var_b = ma.T @ (b.values ** 2) - sb ** 2 / n
+        r = cov / np.sqrt(var_a * var_b)
+    r[(n < 2) | ~(var_a > 0) | ~(var_b > 0)] = np.nan
+    return np.clip(r, -1, 1)
+
+
+def correlation_blocks(df, columns=None, block=BLOCK_COLUMNS, dtype="float32", sample=None, seed=0):
+    """Yield (left labels, right labels, r) for every block pair on and above the diagonal.
+
+    Missing values are handled pairwise, like ``DataFrame.corr``. Columns are
+    centered in float64 first; ``float32`` then halves memory and roughly
+    doubles matrix-product speed at about 1e-6 precision. ``sample``
+    correlates that many random rows instead of all.
+    """
+    frame = sample_rows(df, sample, seed)
+    columns = numeric_labels(frame, columns)
+    # Complete columns first, so most block pairs take the single-product path
+    columns = columns[np.argsort(frame[columns].isna().any().to_numpy(), kind="stable")]
+    prepared = [_Prepared(labels, values, dtype) for labels, values in column_blocks(frame, columns, block)]
+    for i, left in enumerate(prepared):
+        for right in prepared[i:]:
+            yield left.labels, right.labels, _block_correlation(left, right)
+
+
+def _pairs(left, right, r, keep):
+    rows, cols = np.nonzero(keep)
+    return pd.DataFrame({"left": left[rows], "right": right[cols], "correlation": r[rows, cols]})
+
+
+def _upper(left, right, r):
+    """Mask of block cells that are distinct pairs (a block on the diagonal also holds each pair twice)."""
+    if left.equals(right):
+        return np.triu(np.ones(r.shape, dtype=bool), k=1)
+    return np.ones(r.shape, dtype=bool)
+
+
+def iter_correlated_pairs(df, threshold=0.9, **options):
+    """Stream pair frames (left, right, correlation) with |r| >= ``threshold``, one per block pair."""
+    for left, right, r in correlation_blocks(df, **options):
+        keep = _upper(left, right, r) & (np.abs(r) >= threshold)
+        if keep.any():
+            yield _pairs(left, right, r, keep)
+
+
+def top_correlated_pairs(df, top_k=DEFAULT_TOP_K, threshold=None, **options):
+    """The ``top_k`` strongest pairs (by |r|), optionally only those with |r| >= ``threshold``.
+
+    Returns a frame with columns left, right, correlation, strongest first.
+    Only the best ``top_k`` pairs so far are kept between blocks.
+    """
+    found = []
+    for left, right, r in correlation_blocks(df, **options):
+        strength = np.nan_to_num(np.abs(r), nan=-1.0)
+        keep = _upper(left, right, r) & (strength >= (0 if threshold is None else threshold))
+        if top_k is not None and keep.sum() > top_k:
+            cutoff = np.partition(strength[keep], -top_k)[-top_k]
+            keep &= strength >= cutoff
+        found.append(_pairs(left, right, r, keep))
+        if top_k is not None and len(found) > 1:
+            found = [_strongest(pd.concat(found, ignore_index=True), top_k)]
+    if not found:
+        return pd.DataFrame({"left": [], "right": [], "correlation": np.array([], dtype=options.get("dtype", "float32"))})
+    return _strongest(pd.concat(found, ignore_index=True), top_k)
+
+
+def _strongest(pairs, top_k=None):
+    order = np.argsort(-np.nan_to_num(pairs["correlation"].abs().to_numpy(), nan=-1.0), kind="stable")
+    return pairs.iloc[order[:top_k]].reset_index(drop=True)
+
+
+def correlation_frame(df, columns=None, **options):
+    """Full correlation matrix of ``columns`` as a frame, assembled from blocks."""
+    columns = numeric_labels(df, columns)
+    position = pd.Series(np.arange(len(columns)), index=columns)
+    matrix = np.full((len(columns), len(columns)), np.nan, dtype=options.get("dtype", "float32"))
+    for left, right, r in correlation_blocks(df, columns, **options):
+        rows, cols = position[left].to_numpy(), position[right].to_numpy()
+        matrix[np.ix_(rows, cols)] = r
+        matrix[np.ix_(cols, rows)] = r.T
+    return pd.DataFrame(matrix, index=columns, columns=columns)
@@ -5,12 +5,18 @@ setup(
     version="0.1",
     packages=find_packages(),
     install_requires=[
-        "pandas",
+        "pandas>=3",  # row-hash staleness checks rely on copy-on-write
         "numpy",
         "click",
+        "typer",
         "rich",
         "InquirerPy",
     ],
+    extras_require={
+        "parquet": ["pyarrow"],
+        "plots": ["matplotlib"],
+        "yaml": ["pyyaml"],
+    },
     entry_points={
         "console_scripts": [
             "scrubpy = scrubpy.cli:main",
@@ -0,0 +1,48 @@
+import os
+import pandas as pd
+import pytest
+from scrubpy.batch import output_paths, run_batch
+
+RECIPE = {"steps": [{"op": "fix_column_names"}, {"op": "remove_duplicates"}, {"op": "standardize_text",
+                                                                              "column": "city"}]}
+
+
+def _frame():
+    return pd.DataFrame({"City": [" Boston", "boston", "Chicago ", "Chicago "], "N": [1, 2, 3, 3]})
+
+
+def _expected():
+    df = _frame()
+    df.columns = ["city", "n"]
+    df = df.drop_duplicates().reset_index(drop=True)
+    df["city"] = df["city"].str.strip().str.lower()
+    return df
+
+
+def test_output_paths_keep_inputs_apart(tmp_path):
+    files = [str(tmp_path / "2023" / "sales.csv"), str(tmp_path / "2024" / "sales.csv"),
+             str(tmp_path / "2024" / "sales.parquet"), str(tmp_path / "other.csv")]
+    destinations = output_paths(files, "out", "csv")
+    assert destinations[files[3]] == os.path.join("out", "cleaned_other.csv")
+    assert destinations[files[0]] == os.path.join("out", "2023", "cleaned_sales.csv")
+    assert destinations[files[1]] == os.path.join("out", "2024", "cleaned_sales_csv.csv")
+    assert destinations[files[2]] == os.path.join("out", "2024", "cleaned_sales_parquet.csv")
+    assert len(set(destinations.values())) == len(files)
+
+
+def test_output_paths_fail_on_a_clash():
+    with pytest.raises(ValueError):
+        output_paths(["a/x.csv", "a/x.parquet", "a/x_csv.csv"], "out", "csv")
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_run_batch_matches_pandas(tmp_path, chunksize):
+    for year in ("2023", "2024"):
+        os.makedirs(tmp_path / year)
+        _frame().to_csv(tmp_path / year / "sales.csv", index=False)
+    results = run_batch([str(tmp_path / "*" / "*.csv")], RECIPE, output_dir=str(tmp_path / "out"), workers=1,
+                        chunksize=chunksize)
+    assert [result["error"] for result in results] == [None, None]
+    assert len({result["output"] for result in results}) == 2
+    for result in results:
+        pd.testing.assert_frame_equal(pd.read_csv(result["output"]), _expected())
@@ -0,0 +1,55 @@
+import os
+import pandas as pd
+from scrubpy.cache import DatasetCache
+
+
+def _source(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]}).to_csv(path, index=False)
+    return str(path)
+
+
+def _frame_file(cache, key):
+    entry = os.path.join(cache.directory, key)
+    return next(os.path.join(entry, name) for name in os.listdir(entry) if name.startswith("frame."))
+
+
+def test_round_trip_matches_the_source(tmp_path):
+    source = _source(tmp_path)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    df = pd.read_csv(source)
+    assert cache.load_frame(source, optimize=True) is None
+    cache.store_frame(source, df, optimize=True)
+    pd.testing.assert_frame_equal(cache.load_frame(source, optimize=True), df)
+    assert cache.load_frame(source, optimize=False) is None
+    assert not [name for name in os.listdir(os.path.join(cache.directory, cache.key(source, optimize=True)))
+                if name.startswith(".tmp_")]
+
+
+def test_mixed_columns_fall_back_to_pickle(tmp_path):
+    source = _source(tmp_path)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    df = pd.DataFrame({"mixed": [1, "two", 3.0]})
+    key = cache.store_frame(source, df)
+    assert _frame_file(cache, key).endswith("frame.pkl")
+    pd.testing.assert_frame_equal(cache.load_frame(source), df)
+
+
+def test_corrupt_entry_is_a_miss_and_is_removed(tmp_path):
+    source = _source(tmp_path)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    key = cache.store_frame(source, pd.read_csv(source))
+    with open(_frame_file(cache, key), "r+b") as handle:
+        handle.truncate(10)
+    assert cache.load_frame(source) is None
+    assert not os.path.exists(os.path.join(cache.directory, key))
+
+
+def test_changed_file_misses_and_replaces_old_entries(tmp_path):
+    source = _source(tmp_path)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    cache.store_frame(source, pd.read_csv(source))
+    pd.DataFrame({"a": [9]}).to_csv(source, index=False)
+    assert cache.load_frame(source) is None
+    cache.store_frame(source, pd.read_csv(source))
+    assert len(cache.entries()) == 1
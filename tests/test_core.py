@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+from scrubpy import core
+
+TEXT = [" New  York ", "new york", "ＮＥＷ York", "Café", "cafe", None, "Boston\t"]
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "category"])
+def test_standardize_text_defaults_lowercase_and_strip(dtype):
+    df = pd.DataFrame({"city": pd.Series(TEXT, dtype=dtype)})
+    result = core.standardize_text(df, "city")["city"]
+    expected = pd.Series(TEXT, dtype=object).str.lower().str.strip()
+    assert result.isna().tolist() == expected.isna().tolist()
+    assert result.dropna().astype(object).tolist() == expected.dropna().tolist()
+    assert (result.dtype == "category") == (dtype == "category")
+
+
+def test_standardize_text_options():
+    df = pd.DataFrame({"city": TEXT})
+    result = core.standardize_text(df, "city", unicode_form="NFKC", collapse_whitespace=True, strip_accents=True)
+    assert result["city"].tolist()[:5] == ["new york", "new york", "new york", "cafe", "cafe"]
+    assert pd.isna(result["city"].iloc[5])
+
+
+def test_failed_conversion_returns_the_same_frame():
+    df = pd.DataFrame({"x": [1.5, 2.0]})
+    assert core.convert_column_types(df, "x", "Integer") is df  # 1.5 has no integer value
+    converted = core.convert_column_types(pd.DataFrame({"n": ["1", "x"]}), "n", "Integer")
+    assert converted["n"].tolist()[0] == 1 and pd.isna(converted["n"].iloc[1])
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+from scrubpy.core import save_dataset
+from scrubpy.formats import read_frame, write_frame
+
+
+def _frame():
+    return pd.DataFrame({"n": [1, 2, 3, 4], "x": [0.5, None, 2.5, 3.5], "s": ["a", "b", None, "d"]})
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_round_trip_and_filters(tmp_path, fmt):
+    path = tmp_path / f"data.{fmt}"
+    write_frame(_frame(), path, fmt=fmt)
+    pd.testing.assert_frame_equal(read_frame(path), _frame())
+    filtered = read_frame(path, columns=["s"], filters=[("n", ">=", 2), ("n", "!=", 3)])
+    expected = _frame().query("n >= 2 and n != 3")[["s"]]
+    pd.testing.assert_frame_equal(filtered.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_mixed_object_columns_are_saved_as_text(tmp_path, monkeypatch, fmt):
+    monkeypatch.chdir(tmp_path)
+    df = pd.DataFrame({"mixed": [1, "two", None], "numbers": pd.Series([1, 2.5, None], dtype=object)})
+    save_dataset(df, "data.csv", fmt=fmt)
+    saved = read_frame(tmp_path / f"cleaned_data.{fmt}")
+    assert saved["mixed"].tolist()[:2] == ["1", "two"]
+    assert saved["mixed"].isna().tolist() == [False, False, True]
+    assert saved["numbers"].dtype == "float64"
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scrubpy import core
+from scrubpy.pipeline import CleaningPipeline
+
+
+def _frame(rows=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"City Name": rng.choice([" Boston", "boston ", "Chicago", None], rows),
+                       "Value": rng.normal(0, 1, rows), "Extra": rng.choice(["p", "q"], rows)})
+    df.loc[rng.random(rows) < 0.05, "Value"] = np.nan
+    df.loc[[3, 30], "Value"] = [50.0, -40.0]
+    return df
+
+
+def _eager(df, steps):
+    for name, args in steps:
+        if name == "drop_missing":
+            df = core.drop_missing_values(df, confirm=False)
+        elif name == "drop_columns":
+            df = df.drop(columns=args[0])
+        else:
+            df = getattr(core, {"fill_missing": "fill_missing_values"}.get(name, name))(df, *args)
+    return df
+
+
+PLANS = [
+    [("standardize_text", ["City Name"]), ("drop_missing", []), ("remove_duplicates", [])],
+    [("standardize_text", ["City Name"]), ("standardize_text", ["Extra"]), ("drop_columns", [["Extra"]]),
+     ("remove_outliers", ["Value"])],
+    [("fill_missing", ["n/a"]), ("standardize_text", ["City Name"]), ("standardize_text", ["City Name"]),
+     ("fix_column_names", []), ("remove_duplicates", [])],
+    [("convert_column_types", ["Value", "Float"]), ("drop_missing", []), ("fix_column_names", []),
+     ("drop_missing", [])],
+]
+
+
+@pytest.mark.parametrize("steps", PLANS)
+def test_optimized_plan_matches_eager_run(steps):
+    df = _frame()
+    pipeline = CleaningPipeline(df)
+    for name, args in steps:
+        getattr(pipeline, name)(*args)
+    result = pipeline.collect()
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), _eager(df, steps).reset_index(drop=True))
+    pd.testing.assert_frame_equal(df, _frame())  # the source is left alone
+
+
+def test_optimizer_rewrites():
+    pipeline = CleaningPipeline(_frame())
+    pipeline.standardize_text("City Name").standardize_text("City Name").standardize_text("Extra")
+    pipeline.drop_missing(subset=["Value"])
+    pipeline.standardize_text("Value").drop_columns(["Value"])
+    plan = pipeline.plan()
+    # Dead rewrite pruned, repeat dropped, filter and drop pushed down, text steps fused
+    assert [step.name for step in plan] == ["drop_missing", "drop_columns", "standardize_text"]
+    assert plan[2].params["columns"] == ["City Name", "Extra"]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from scrubpy import core
+from scrubpy.outliers import outlier_rows
+from scrubpy.profiling import DataProfiler
+
+
+def _frame(rows=10_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.normal(100, 15, rows), "y": rng.normal(100, 15, rows),
+                         "label": rng.choice(["a", "b", "c"], rows)})
+
+
+def _assert_same_stats(advanced, fresh):
+    pd.testing.assert_frame_equal(advanced["numeric"], fresh["numeric"], rtol=1e-9)
+    pd.testing.assert_frame_equal(advanced["outlier_mask"], fresh["outlier_mask"])
+    assert advanced["outlier_columns"] == fresh["outlier_columns"]
+    assert advanced["duplicates"] == fresh["duplicates"]
+    pd.testing.assert_series_equal(advanced["missing"], fresh["missing"])
+    assert advanced["memory"] == fresh["memory"]
+
+
+def test_advance_after_removing_extreme_outliers_matches_fresh_profile():
+    df = _frame()
+    df.loc[[5, 50, 500, 5_000, 9_000], "x"] = 1e12
+    df.loc[[7, 70], "y"] = -1e12
+    profiler = DataProfiler(df)
+    profiler.stats()
+
+    dropped = outlier_rows(df, ["x", "y"])
+    cleaned = core.remove_outliers(df, ["x", "y"])
+    advanced = profiler.advance(cleaned, rows=dropped).stats()
+
+    _assert_same_stats(advanced, DataProfiler(cleaned).stats())
+    assert advanced["numeric"].loc["x", "std"] > 10
+
+
+def test_advance_after_removing_duplicates_matches_fresh_profile():
+    df = _frame()
+    df = pd.concat([df, df.sample(500, random_state=0)], ignore_index=True)
+    profiler = DataProfiler(df)
+    profiler.stats()
+
+    dropped = df.duplicated().to_numpy()
+    cleaned = core.remove_duplicates(df)
+    advanced = profiler.advance(cleaned, rows=dropped).stats()
+
+    _assert_same_stats(advanced, DataProfiler(cleaned).stats())
+
+
+def test_advance_after_rewriting_a_column_matches_fresh_profile():
+    df = _frame()
+    df.loc[::7, "label"] = None
+    profiler = DataProfiler(df)
+    profiler.stats()
+
+    filled = core.fill_missing_values(df, "unknown", columns=["label"])
+    advanced = profiler.advance(filled, columns=["label"]).stats()
+
+    _assert_same_stats(advanced, DataProfiler(filled).stats())
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scrubpy import core
+from scrubpy.row_hash import index_for, near_duplicate_groups
+
+
+def _frame(rows=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"x": np.round(rng.normal(0, 0.3, rows), 0), "n": rng.integers(0, 4, rows),
+                       "label": rng.choice([" A", "a ", "b", None], rows)})
+    df.loc[rng.random(rows) < 0.05, "x"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("keep", ["first", "last", "none"])
+def test_duplicated_matches_pandas(keep):
+    df = _frame()
+    expected = df.duplicated(keep=False if keep == "none" else keep).to_numpy()
+    np.testing.assert_array_equal(index_for(df).duplicated(keep, frame=df), expected)
+    np.testing.assert_array_equal(index_for(df).duplicated(keep), expected)
+
+
+def test_signed_zeros_are_duplicates():
+    df = pd.DataFrame({"x": [-0.0, 0.0, 0.0], "y": [1, 1, 1]})
+    assert index_for(df).count() == df.duplicated().sum() == 2
+    pd.testing.assert_frame_equal(core.remove_duplicates(df), df.drop_duplicates().reset_index(drop=True))
+
+
+def test_subset_duplicates_match_pandas():
+    df = _frame()
+    np.testing.assert_array_equal(index_for(df, ["n", "label"]).duplicated(frame=df),
+                                  df.duplicated(["n", "label"]).to_numpy())
+
+
+def test_index_carried_through_changes_matches_pandas():
+    df = core.fill_missing_values(_frame(), 0)
+    index_for(df)  # built once, then patched by every operation below
+    df = core.standardize_text(df, "label")
+    df = core.drop_missing_values(df, confirm=False)
+    df = core.fix_column_names(df)
+    assert index_for(df).count() == df.duplicated().sum()
+    pd.testing.assert_frame_equal(core.remove_duplicates(df), df.drop_duplicates().reset_index(drop=True))
+
+
+def test_hash_collision_never_drops_distinct_rows():
+    df = pd.DataFrame({"x": [1, 2, 1, 3]})
+    index = index_for(df)
+    index.hashes[3] = index.hashes[1]  # pretend rows 1 and 3 collide
+    np.testing.assert_array_equal(index.duplicated(frame=df), [False, False, True, False])
+
+
+def test_in_place_edit_drops_stale_index():
+    df = pd.DataFrame({"x": [1, 1, 2]})
+    assert index_for(df).count() == 1
+    df.loc[1, "x"] = 5
+    assert index_for(df).count() == 0
+    assert len(core.remove_duplicates(df)) == 3
+
+
+def test_near_duplicate_groups():
+    series = pd.Series(["New York", "new  york", "Boston", None, "Bostonn", "Chicago"])
+    groups = near_duplicate_groups(series, threshold=0.5)
+    assert groups[0] == groups[1]
+    assert groups[2] == groups[4]
+    assert groups[3] == -1
+    assert len({groups[0], groups[2], groups[5]}) == 3
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "category"])
+def test_merge_near_duplicates(dtype):
+    df = pd.DataFrame({"city": pd.Series(["Boston", "Boston", "Bostonn", None, "Chicago"], dtype=dtype),
+                       "n": [1, 2, 3, 4, 5]})
+    merged = core.merge_near_duplicates(df, "city", threshold=0.5)
+    assert merged["city"].dtype == df["city"].dtype
+    assert merged["city"].tolist()[:3] == ["Boston"] * 3
+    assert merged["city"].isna().tolist() == df["city"].isna().tolist()
+    assert merged["city"].iloc[4] == "Chicago"
+    assert index_for(merged).count() == merged.duplicated().sum()
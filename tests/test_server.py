@@ -0,0 +1,64 @@
+import asyncio
+import json
+import os
+import pandas as pd
+from scrubpy.server import CleaningServer
+
+RECIPE = {"steps": [{"op": "remove_duplicates"}]}
+
+
+def _run(server, scenario):
+    async def main():
+        await server.start()
+        try:
+            return await scenario()
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+
+async def _wait(server, job_id):
+    while True:
+        status, job = await server.route("GET", f"/jobs/{job_id}", b"")
+        if job["status"] in ("done", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+
+
+def test_jobs_write_to_their_own_directory(tmp_path):
+    df = pd.DataFrame({"a": [1, 1, 2], "b": ["x", "x", "y"]})
+    df.to_csv(tmp_path / "data.csv", index=False)
+    server = CleaningServer(RECIPE, output_dir=str(tmp_path / "out"), workers=1)
+
+    async def scenario():
+        body = json.dumps({"path": str(tmp_path / "data.csv")}).encode()
+        jobs = []
+        for _ in range(2):
+            status, accepted = await server.route("POST", "/jobs", body)
+            assert status == 202
+            jobs.append(await _wait(server, accepted["id"]))
+        return jobs
+
+    jobs = _run(server, scenario)
+    outputs = [job["results"][0]["output"] for job in jobs]
+    assert [job["status"] for job in jobs] == ["done", "done"]
+    assert outputs == [os.path.join(str(tmp_path / "out"), job["id"], "cleaned_data.csv") for job in jobs]
+    for output in outputs:
+        pd.testing.assert_frame_equal(pd.read_csv(output), df.drop_duplicates().reset_index(drop=True))
+
+    # A restarted server doesn't reuse the job directories already on disk
+    assert next(CleaningServer(RECIPE, output_dir=str(tmp_path / "out"))._ids) == 3
+
+
+def test_bad_submissions(tmp_path):
+    server = CleaningServer(RECIPE, output_dir=str(tmp_path / "out"), workers=1, max_queue=1)
+    for name in ("a.csv", "b.csv"):
+        pd.DataFrame({"a": [1]}).to_csv(tmp_path / name, index=False)
+
+    async def scenario():
+        missing = await server.route("POST", "/jobs", json.dumps({"path": str(tmp_path / "none.csv")}).encode())
+        malformed = await server.route("POST", "/jobs", b"{not json")
+        too_many = await server.route("POST", "/jobs", json.dumps({"path": str(tmp_path / "*.csv")}).encode())
+        return missing[0], malformed[0], too_many[0]
+
+    assert _run(server, scenario) == (404, 400, 413)
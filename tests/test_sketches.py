@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from scrubpy.sketches import HyperLogLog, HeavyHitters, TDigest, ProfileSketch
+
+
+def _frame(rows=50_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"x": rng.lognormal(0, 1, rows), "id": rng.integers(0, 20_000, rows),
+                       "label": rng.choice([f"v{i}" for i in range(500)], rows, p=_zipf(500))})
+    df.loc[rng.random(rows) < 0.02, "x"] = np.nan
+    return df
+
+
+def _zipf(n):
+    weights = 1 / np.arange(1, n + 1)
+    return weights / weights.sum()
+
+
+def test_hyperloglog_within_its_error_and_mergeable():
+    df = _frame()
+    exact = df["id"].nunique()
+    halves = [HyperLogLog().add(part["id"]) for part in (df.iloc[::2], df.iloc[1::2])]
+    merged = halves[0].merge(halves[1])
+    assert abs(merged.estimate() - exact) <= 3 * merged.relative_error * exact
+    assert merged.estimate() == HyperLogLog().add(df["id"]).estimate()
+
+
+def test_heavy_hitters_find_the_top_values():
+    labels = _frame()["label"]
+    sketch = HeavyHitters(k=32).add(labels)
+    exact = labels.value_counts()
+    top = sketch.top(5)
+    assert list(top) == list(exact.index[:5])
+    for value, count in top.items():
+        assert exact[value] <= count <= exact[value] + sketch.error_bound
+
+
+def test_tdigest_quantiles_within_rank_error():
+    values = _frame()["x"].dropna().to_numpy()
+    digest = TDigest()
+    for part in np.array_split(values, 7):
+        digest.merge(TDigest().add(part))
+    ordered = np.sort(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        rank = np.searchsorted(ordered, digest.quantile(q)) / len(ordered)
+        assert abs(rank - q) <= 3 * digest.rank_error(q) + 1e-3
+
+
+def test_profile_sketch_matches_pandas():
+    df = _frame()
+    df = pd.concat([df, df.sample(1_000, random_state=0)], ignore_index=True)
+    sketch = ProfileSketch.from_chunks(df.iloc[start:start + 10_000] for start in range(0, len(df), 10_000))
+    assert sketch.missing == df.isnull().sum().to_dict()
+    count, mean, m2 = sketch.moments["x"]
+    assert count == df["x"].count()
+    np.testing.assert_allclose([mean, np.sqrt(m2 / (count - 1))], [df["x"].mean(), df["x"].std()], rtol=1e-9)
+    duplicates, error = sketch.duplicate_estimate()
+    assert abs(duplicates - df.duplicated().sum()) <= 3 * error
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scrubpy.outliers import outlier_rows
+from scrubpy.streaming import stream_clean, StreamingDeduplicator
+
+
+def _write(tmp_path, df):
+    path = tmp_path / "input.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def _mixed_frame():
+    # Chunks of three rows: "n" parses as int, then float, then text; "z" holds -0.0 and 0.0
+    return pd.DataFrame({
+        "n": ["1", "2", "3", "1", "", "2.5", "1", "x", "3", "1", "2", "3"],
+        "z": [0.0, -0.0, 1.0, -0.0, 2.0, 0.0, 0.0, 1.0, 1.0, 0.0, -0.0, 1.0],
+        "k": [1, 2, 3, 1, 2, 3, 1, 2, 3, 1, 2, 3],
+    })
+
+
+def test_dedup_across_chunks_matches_pandas(tmp_path):
+    path = _write(tmp_path, _mixed_frame())
+    output = tmp_path / "output.csv"
+    counts = stream_clean(path, output, [("remove_duplicates", {})], chunksize=3)
+    expected = pd.read_csv(path).drop_duplicates()
+    result = pd.read_csv(output)
+    assert counts == {"rows_in": 12, "rows_out": len(expected)}
+    pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+
+
+def test_dedup_subset_with_tiny_partitions_matches_pandas(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 50, 2_000), "b": rng.choice(["p", "q", None], 2_000)})
+    path = _write(tmp_path, df)
+    output = tmp_path / "output.csv"
+    stream_clean(path, output, [("remove_duplicates", {"subset": ["a", "b"]})], chunksize=300)
+    expected = pd.read_csv(path).drop_duplicates(subset=["a", "b"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(pd.read_csv(output), expected)
+
+    # Force partition files to be split again before they're sorted
+    dedup = StreamingDeduplicator(str(tmp_path), subset=["a", "b"], partitions=2, max_partition_bytes=256)
+    chunk = pd.read_csv(path)
+    dedup.observe(chunk)
+    dedup.finalize()
+    pd.testing.assert_frame_equal(dedup.apply(chunk).reset_index(drop=True), expected)
+
+
+@pytest.mark.parametrize("method", ["zscore", "iqr"])
+def test_outliers_match_in_memory(tmp_path, method):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"x": rng.normal(0, 1, 5_000), "y": rng.normal(10, 2, 5_000)})
+    df.loc[[3, 300, 3_000], "x"] = [40.0, -25.0, 60.0]
+    path = _write(tmp_path, df)
+    output = tmp_path / "output.csv"
+    stream_clean(path, output, [("remove_outliers", {"column": ["x", "y"], "method": method})], chunksize=700)
+    expected = df[~outlier_rows(pd.read_csv(path), ["x", "y"], method=method)].reset_index(drop=True)
+    result = pd.read_csv(output)
+    if method == "zscore":
+        pd.testing.assert_frame_equal(result, expected)
+    else:
+        # Quartiles come from a t-digest, so only rows right at the fences may differ
+        assert abs(len(result) - len(expected)) <= 5
+        assert (result["x"].abs() < 20).all()
@@ -0,0 +1,58 @@
+import os
+import numpy as np
+import pandas as pd
+from scrubpy import core
+from scrubpy.undo import UndoHistory
+
+
+def _frame(rows=1_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"x": rng.normal(0, 1, rows), "label": rng.choice([" A", "b ", None], rows),
+                       "n": rng.integers(0, 5, rows)})
+    return pd.concat([df, df.head(50)], ignore_index=True)
+
+
+def test_each_delta_restores_the_frame():
+    original = _frame()
+    history = UndoHistory()
+    df = original
+
+    dropped = df.duplicated().to_numpy()
+    history.save_state(df, rows=dropped)
+    df = core.remove_duplicates(df)
+    history.save_state(df, columns=["label"])
+    df = core.standardize_text(df, "label")
+    history.save_state(df, columns=["n"])
+    df = df.drop(columns=["n"])
+    history.save_state(df, rename=True)
+    df = df.rename(columns=str.upper)
+    history.save_state(df)
+    df = core.fill_missing_values(df, "none")
+
+    states = []
+    while (previous := history.undo(df)) is not None:
+        states.append(previous)
+        df = previous
+    assert len(states) == 5
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_budget_spills_old_deltas_and_keeps_them_undoable(tmp_path):
+    original = _frame()
+    history = UndoHistory(memory_budget=1, spill_dir=str(tmp_path))
+    df = original
+    for column in ("x", "label"):
+        history.save_state(df, columns=[column])
+        df = core.fill_missing_values(df.assign(**{column: None}), 0, columns=[column])
+    assert len(history) == 2 and os.listdir(tmp_path)  # spilled, not forgotten
+    while (previous := history.undo(df)) is not None:
+        df = previous
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_budget_without_spill_dir_forgets_the_oldest():
+    history = UndoHistory(memory_budget=1)
+    df = _frame()
+    for column in ("x", "label", "n"):
+        history.save_state(df, columns=[column])
+    assert len(history) == 1
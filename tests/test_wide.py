@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from scrubpy.profiling import DataProfiler, suggest_wide
+from scrubpy.wide import WIDE_COLUMNS, top_correlated_pairs
+
+
+def _frame(rows=2_000, cols=12, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(0, 1, rows)
+    df = pd.DataFrame({f"c{i}": base * (i % 3) + rng.normal(0, 1, rows) + 1e9 * (i == 0) for i in range(cols)})
+    df = df.mask(rng.random(df.shape) < 0.05)
+    return df
+
+
+def _pairs(df):
+    corr = df.corr()
+    rows = [(a, b, corr.loc[a, b]) for i, a in enumerate(df.columns) for b in df.columns[i + 1:]]
+    return pd.DataFrame(rows, columns=["left", "right", "correlation"])
+
+
+def test_top_pairs_match_pandas():
+    df = _frame()
+    expected = _pairs(df)
+    expected = expected.reindex(expected["correlation"].abs().sort_values(ascending=False).index).head(10)
+    result = top_correlated_pairs(df, top_k=10)
+    assert set(map(frozenset, zip(result["left"], result["right"]))) == \
+        set(map(frozenset, zip(expected["left"], expected["right"])))
+    np.testing.assert_allclose(np.sort(result["correlation"].abs()), np.sort(expected["correlation"].abs()),
+                               atol=1e-4)
+
+
+def test_wide_is_explicit():
+    df = _frame()
+    assert not suggest_wide(df)
+    assert isinstance(DataProfiler(df).summary_statistics(), dict)
+    assert isinstance(DataProfiler(df, wide=True).summary_statistics(), pd.DataFrame)
+
+    wide = pd.DataFrame(np.zeros((3, WIDE_COLUMNS)))
+    assert suggest_wide(wide)
+    assert isinstance(DataProfiler(wide).summary_statistics(), dict)  # no switch behind the caller's back
+
+
+def test_wide_statistics_match_narrow():
+    df = _frame()
+    narrow = pd.DataFrame(DataProfiler(df).summary_statistics())
+    wide = DataProfiler(df, wide=True).summary_statistics()
+    pd.testing.assert_frame_equal(wide.astype(float), narrow.astype(float), rtol=1e-9, check_names=False)
+    described = df.describe().T
+    np.testing.assert_allclose(wide.loc[described.index, ["mean", "std", "min", "max"]].to_numpy(dtype=float),
+                               described[["mean", "std", "min", "max"]].to_numpy(), rtol=1e-9)